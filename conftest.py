@@ -0,0 +1,7 @@
+"""
+Root test configuration.
+
+The visualization package under python/ is also named llamavis, so its tests
+run separately from that directory (``cd python && python -m pytest tests``).
+"""
+collect_ignore = ["python"]
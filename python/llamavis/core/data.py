@@ -490,6 +490,145 @@ class DataProcessor(ABC):
         """
         pass
 
+    @staticmethod
+    def prepare_for_network(data: Any) -> Dict[str, Any]:
+        """
+        Prepare network data for the D3.js and Three.js network visualizations.
+
+        Accepts either ``links`` or ``edges`` for the edge list and drops
+        edges whose endpoints are not known nodes.
+
+        Args:
+            data: Dictionary with 'nodes' and 'links' (or 'edges') keys
+
+        Returns:
+            Dictionary with 'nodes' and 'links' lists
+        """
+        if not isinstance(data, dict) or "nodes" not in data:
+            raise ValueError("Network data must be a dictionary with a 'nodes' key")
+
+        nodes = [dict(node) for node in data["nodes"]]
+        node_ids = {node["id"] for node in nodes}
+
+        links = []
+        for link in data.get("links", data.get("edges", [])):
+            if link["source"] in node_ids and link["target"] in node_ids:
+                links.append(dict(link))
+
+        return {
+            "nodes": nodes,
+            "links": links
+        }
+
+    @staticmethod
+    def prepare_for_hierarchical(data: Any, sort: bool = False) -> Dict[str, Any]:
+        """
+        Prepare nested data for the D3.js tree and treemap visualizations.
+
+        Every node of the copied tree gets a ``_value`` holding its own value
+        plus the values of its descendants, where any node without a value
+        counts as 1, as with ``d3.hierarchy(...).sum(d => d.value || 1)``.
+        The browser then does not have to sum the hierarchy itself.
+
+        Args:
+            data: Root dictionary with 'name' and optional 'value'/'children',
+                or a list of such dictionaries to place under a common root
+            sort: Whether to order children by descending ``_value``
+
+        Returns:
+            Copy of the hierarchy with ``_value`` set on every node
+        """
+        if isinstance(data, list):
+            data = {"name": "root", "children": data}
+        if not isinstance(data, dict):
+            raise ValueError("Hierarchical data must be a dictionary or a list of dictionaries")
+
+        root = dict(data)
+        # Copy top-down, then sum bottom-up by walking the copies in reverse
+        order = [root]
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            children = node.get("children")
+            if children:
+                node["children"] = [dict(child) for child in children]
+                order.extend(node["children"])
+                stack.extend(node["children"])
+
+        for node in reversed(order):
+            children = node.get("children")
+            if children:
+                node["_value"] = (node.get("value") or 1) + sum(c["_value"] for c in children)
+                if sort:
+                    children.sort(key=lambda c: c["_value"], reverse=True)
+            else:
+                node["_value"] = node.get("value") or 1
+
+        return root
+
+    @staticmethod
+    def prepare_for_heatmap(data: Any) -> Dict[str, Any]:
+        """
+        Prepare matrix data for the D3.js heatmap visualization.
+
+        Values are flattened row-major so the browser can index cells as
+        ``values[row * cols + col]`` without building per-cell objects. They
+        stay a NumPy array, which the renderer serializes without copying
+        into Python lists.
+
+        Args:
+            data: Dictionary with 'values' (and optional 'x_labels'/'y_labels'),
+                a pandas DataFrame, or a 2D array-like
+
+        Returns:
+            Dictionary with 'x_labels', 'y_labels', 'rows', 'cols' and flat 'values' array
+        """
+        if isinstance(data, pd.DataFrame):
+            x_labels = [str(c) for c in data.columns]
+            y_labels = [str(i) for i in data.index]
+            values = data.values
+        elif isinstance(data, dict):
+            values = data["values"]
+            x_labels = data.get("x_labels")
+            y_labels = data.get("y_labels")
+        else:
+            values = data
+            x_labels = y_labels = None
+
+        arr = np.asarray(values, dtype=float)
+        if arr.ndim != 2:
+            raise ValueError("Heatmap values must be a 2D matrix")
+        rows, cols = arr.shape
+
+        return {
+            "x_labels": list(x_labels) if x_labels is not None else [str(j) for j in range(cols)],
+            "y_labels": list(y_labels) if y_labels is not None else [str(i) for i in range(rows)],
+            "rows": rows,
+            "cols": cols,
+            "values": arr.ravel()
+        }
+
+    @staticmethod
+    def to_json(data: Any) -> Any:
+        """
+        Prepare data for embedding in the page as JSON.
+
+        NumPy arrays are returned as they are: the renderer serializes them
+        directly (with orjson when it is installed) instead of copying them
+        into Python lists first. DataFrames become lists of row records.
+
+        Args:
+            data: Data to embed (DataFrame, Series, array, or JSON-compatible data)
+
+        Returns:
+            Data the renderer's JSON serializer can encode
+        """
+        if isinstance(data, pd.DataFrame):
+            return data.to_dict(orient="records")
+        if isinstance(data, pd.Series):
+            return data.to_numpy()
+        return data
+
 
 class ChartDataProcessor(DataProcessor):
     """Data processor for chart-based visualizations."""
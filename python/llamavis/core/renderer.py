@@ -7,9 +7,93 @@ from visualizations.
 """
 
 import os
+import html
 import json
+import math
 import webbrowser
-from typing import Dict, List, Optional, Union, Any
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
+
+
+def _numpy_tolist(value: Any) -> Any:
+    """
+    Convert a NumPy array or scalar to Python values.
+    
+    Floats narrower than float64 go through their shortest decimal form,
+    so a float32 ``0.1`` is written as ``0.1`` (as orjson writes it)
+    rather than as its widened value ``0.10000000149011612``.
+    """
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and dtype.kind == "f" and dtype.itemsize < 8:
+        value = value.astype(str).astype(float)
+    return value.tolist()
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values the JSON serializers do not handle natively."""
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return _finite(_numpy_tolist(value))
+    return str(value)
+
+
+def _finite(value: Any) -> Any:
+    """Replace non-finite floats with None, as orjson writes them, recursively."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return _finite(_numpy_tolist(value))
+    return value
+
+
+def _dumps(obj: Any) -> str:
+    """
+    Serialize an object to compact JSON.
+    
+    Uses orjson when it is installed, which also encodes NumPy arrays
+    directly, and falls back to the standard library otherwise. Either
+    way NaN and infinities are written as ``null``, so the output is
+    valid JSON for ``JSON.parse``.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    try:
+        return json.dumps(
+            obj, separators=(",", ":"), allow_nan=False, default=_json_default
+        )
+    except ValueError:
+        # Only data holding NaN or infinities pays for the cleaning copy
+        return json.dumps(
+            _finite(obj), separators=(",", ":"), allow_nan=False, default=_json_default
+        )
+
+
+@lru_cache(maxsize=None)
+def _read_static(filename: str) -> str:
+    """Read a packaged static asset once and keep it for later pages."""
+    with open(os.path.join(STATIC_DIR, filename), encoding="utf-8") as f:
+        return f.read()
 
 
 class Renderer:
@@ -32,6 +116,66 @@ class Renderer:
         "chartjs_datalabels": "https://cdn.jsdelivr.net/npm/chartjs-plugin-datalabels@2.2.0/dist/chartjs-plugin-datalabels.min.js",
     }
     
+    # d3 v7 micro-modules with their major version and d3 dependencies. The
+    # UMD builds all extend window.d3, so a page can load just the modules a
+    # chart uses instead of the full d3 bundle.
+    D3_MODULES = {
+        "d3-array": ("3", []),
+        "d3-axis": ("3", []),
+        "d3-color": ("3", []),
+        "d3-dispatch": ("3", []),
+        "d3-drag": ("3", ["d3-dispatch", "d3-selection"]),
+        "d3-ease": ("3", []),
+        "d3-force": ("3", ["d3-dispatch", "d3-quadtree", "d3-timer"]),
+        "d3-format": ("3", []),
+        "d3-hierarchy": ("3", []),
+        "d3-interpolate": ("3", ["d3-color"]),
+        "d3-path": ("3", []),
+        "d3-quadtree": ("3", []),
+        "d3-scale": ("4", ["d3-array", "d3-format", "d3-interpolate", "d3-time", "d3-time-format"]),
+        "d3-scale-chromatic": ("3", ["d3-color", "d3-interpolate"]),
+        "d3-selection": ("3", []),
+        "d3-shape": ("3", ["d3-path"]),
+        "d3-time": ("3", ["d3-array"]),
+        "d3-time-format": ("4", ["d3-time"]),
+        "d3-timer": ("3", []),
+        "d3-transition": ("3", ["d3-color", "d3-dispatch", "d3-ease", "d3-interpolate", "d3-selection", "d3-timer"]),
+        "d3-zoom": ("3", ["d3-dispatch", "d3-drag", "d3-interpolate", "d3-selection", "d3-transition"]),
+    }
+    
+    # Libraries shipped with the package in the static directory; these are
+    # inlined into the page instead of being loaded from a CDN
+    STATIC_SCRIPTS = {
+        "llamavis": "llamavis.js",
+        "llamavis-three": "llamavis-three.js",
+    }
+    
+    @staticmethod
+    def resolve_libraries(libraries: List[str]) -> List[str]:
+        """
+        Expand d3 micro-modules with their dependencies, in load order.
+        
+        Args:
+            libraries: List of library names
+            
+        Returns:
+            List of library names with each d3 module preceded by the
+            modules it depends on and no duplicates
+        """
+        resolved = []
+        
+        def visit(lib: str) -> None:
+            if lib in resolved:
+                return
+            for dep in Renderer.D3_MODULES.get(lib, ("", []))[1]:
+                visit(dep)
+            resolved.append(lib)
+        
+        for lib in libraries:
+            visit(lib)
+        
+        return resolved
+    
     @staticmethod
     def render_html(
         js_code: str,
@@ -43,6 +187,7 @@ class Renderer:
         width: Union[int, str] = "100%",
         height: Union[int, str] = "500px",
         inline_styles: Dict[str, str] = None,
+        inline_scripts: List[str] = None,
     ) -> str:
         """
         Render a visualization to HTML.
@@ -50,20 +195,72 @@ class Renderer:
         Args:
             js_code: JavaScript code to render the visualization
             css_code: CSS code for styling the visualization
-            libraries: List of libraries to include (keys from CDN_URLS)
+            libraries: List of libraries to include (keys from CDN_URLS or D3_MODULES)
             additional_modules: List of additional modules to include
             title: Title of the HTML page
             container_id: ID of the container element
             width: Width of the visualization container
             height: Height of the visualization container
             inline_styles: Additional inline styles for the container
+            inline_scripts: JavaScript sources to inline after the library tags
             
         Returns:
             HTML string with the visualization
         """
-        libraries = libraries or []
+        return "".join(Renderer.render_html_chunks(
+            js_code=js_code,
+            css_code=css_code,
+            libraries=libraries,
+            additional_modules=additional_modules,
+            title=title,
+            container_id=container_id,
+            width=width,
+            height=height,
+            inline_styles=inline_styles,
+            inline_scripts=inline_scripts,
+        ))
+    
+    @staticmethod
+    def render_html_chunks(
+        js_code: Union[str, Iterable[str]],
+        css_code: str = "",
+        libraries: List[str] = None,
+        additional_modules: List[str] = None,
+        title: str = "LlamaVis Visualization",
+        container_id: str = "visualization",
+        width: Union[int, str] = "100%",
+        height: Union[int, str] = "500px",
+        inline_styles: Dict[str, str] = None,
+        inline_scripts: List[str] = None,
+    ) -> Iterator[str]:
+        """
+        Render a visualization to HTML piece by piece.
+        
+        Yields the same document as ``render_html`` as a sequence of
+        strings (page head, each script tag, the visualization code and the
+        page tail), so it can be streamed to a response or file without
+        building the whole page in memory.
+        
+        Args:
+            js_code: JavaScript code to render the visualization, as one
+                string or an iterable of strings emitted in order
+            css_code: CSS code for styling the visualization
+            libraries: List of libraries to include (keys from CDN_URLS or D3_MODULES)
+            additional_modules: List of additional modules to include
+            title: Title of the HTML page
+            container_id: ID of the container element
+            width: Width of the visualization container
+            height: Height of the visualization container
+            inline_styles: Additional inline styles for the container
+            inline_scripts: JavaScript sources to inline after the library tags
+            
+        Yields:
+            Consecutive pieces of the HTML document
+        """
+        libraries = Renderer.resolve_libraries(libraries or [])
         additional_modules = additional_modules or []
         inline_styles = inline_styles or {}
+        inline_scripts = inline_scripts or []
         
         # Convert width and height to strings with units if they're integers
         if isinstance(width, int):
@@ -82,24 +279,16 @@ class Renderer:
         container_styles.update(inline_styles)
         style_str = "; ".join([f"{k}: {v}" for k, v in container_styles.items()])
         
-        # Generate script tags for libraries
-        lib_tags = []
-        for lib in libraries:
-            if lib in Renderer.CDN_URLS:
-                lib_tags.append(f'<script src="{Renderer.CDN_URLS[lib]}"></script>')
+        # Title and container ID are user-supplied; escape them for HTML
+        page_title = html.escape(str(title))
+        container_attr = html.escape(str(container_id), quote=True)
         
-        # Generate script tags for additional modules
-        for module in additional_modules:
-            if module in Renderer.ADDITIONAL_MODULES:
-                lib_tags.append(f'<script src="{Renderer.ADDITIONAL_MODULES[module]}"></script>')
-        
-        # Build the complete HTML
-        html = f"""<!DOCTYPE html>
+        yield f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>{page_title}</title>
     <style>
         body {{
             font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
@@ -117,21 +306,148 @@ class Renderer:
         }}
         {css_code}
     </style>
-    {"".join(lib_tags)}
+    """
+        
+        # Script tags for libraries
+        for lib in libraries:
+            if lib in Renderer.CDN_URLS:
+                yield f'<script src="{Renderer.CDN_URLS[lib]}"></script>'
+            elif lib in Renderer.D3_MODULES:
+                version = Renderer.D3_MODULES[lib][0]
+                url = f"https://cdn.jsdelivr.net/npm/{lib}@{version}/dist/{lib}.min.js"
+                yield f'<script src="{url}"></script>'
+        
+        # Script tags for additional modules
+        for module in additional_modules:
+            if module in Renderer.ADDITIONAL_MODULES:
+                yield f'<script src="{Renderer.ADDITIONAL_MODULES[module]}"></script>'
+        
+        # Inline scripts come after the libraries they depend on
+        for code in inline_scripts:
+            yield Renderer.generate_script_tag(code)
+        
+        yield f"""
 </head>
 <body>
     <div class="container">
-        <div id="{container_id}" style="{style_str}"></div>
+        <div id="{container_attr}" style="{style_str}"></div>
     </div>
     
     <script>
         document.addEventListener('DOMContentLoaded', function() {{
-            {js_code}
-        }});
+            """
+        
+        if isinstance(js_code, str):
+            yield js_code
+        else:
+            yield from js_code
+        
+        yield """
+        });
     </script>
 </body>
 </html>"""
-        return html
+    
+    @staticmethod
+    def generate_html(
+        data: Any,
+        js_code: str,
+        config: Any = None,
+        libraries: List[str] = None,
+        container_id: str = "visualization",
+        title: str = "LlamaVis Visualization",
+        width: Union[int, str] = "100%",
+        height: Union[int, str] = "500px",
+    ) -> str:
+        """
+        Render a visualization with its data and configuration to HTML.
+        
+        The data and configuration are declared as ``data`` and ``config``
+        ahead of ``js_code``, and packaged libraries listed in STATIC_SCRIPTS
+        are inlined once per page.
+        
+        Args:
+            data: Preprocessed data for the visualization
+            js_code: JavaScript code to render the visualization
+            config: VisualizationConfig (or dictionary) for the visualization
+            libraries: List of libraries to include (keys from CDN_URLS or STATIC_SCRIPTS)
+            container_id: ID of the container element
+            title: Title of the HTML page
+            width: Width of the visualization container
+            height: Height of the visualization container
+            
+        Returns:
+            HTML string with the visualization
+        """
+        return "".join(Renderer.generate_html_chunks(
+            data=data,
+            js_code=js_code,
+            config=config,
+            libraries=libraries,
+            container_id=container_id,
+            title=title,
+            width=width,
+            height=height,
+        ))
+    
+    @staticmethod
+    def generate_html_chunks(
+        data: Any,
+        js_code: str,
+        config: Any = None,
+        libraries: List[str] = None,
+        container_id: str = "visualization",
+        title: str = "LlamaVis Visualization",
+        width: Union[int, str] = "100%",
+        height: Union[int, str] = "500px",
+    ) -> Iterator[str]:
+        """
+        Render a visualization with its data and configuration to HTML piece by piece.
+        
+        Streaming counterpart of ``generate_html`` (see
+        ``render_html_chunks``); the embedded data is yielded as its own
+        piece instead of being concatenated with the rest of the code.
+        
+        Args:
+            data: Preprocessed data for the visualization
+            js_code: JavaScript code to render the visualization
+            config: VisualizationConfig (or dictionary) for the visualization
+            libraries: List of libraries to include (keys from CDN_URLS or STATIC_SCRIPTS)
+            container_id: ID of the container element
+            title: Title of the HTML page
+            width: Width of the visualization container
+            height: Height of the visualization container
+            
+        Returns:
+            Iterator over consecutive pieces of the HTML document
+        """
+        libraries = libraries or []
+        if hasattr(config, "to_dict"):
+            config = config.to_dict()
+        
+        static_scripts = [
+            _read_static(Renderer.STATIC_SCRIPTS[lib])
+            for lib in libraries
+            if lib in Renderer.STATIC_SCRIPTS
+        ]
+        
+        code = [
+            Renderer.embed_data(data, "data"),
+            "\n",
+            Renderer.embed_data(config or {}, "config"),
+            "\n",
+            js_code,
+        ]
+        
+        return Renderer.render_html_chunks(
+            js_code=code,
+            libraries=libraries,
+            title=title,
+            container_id=container_id,
+            width=width,
+            height=height,
+            inline_scripts=static_scripts,
+        )
     
     @staticmethod
     def save_html(
@@ -201,6 +517,10 @@ class Renderer:
         """
         Embed data as a JavaScript variable.
         
+        The JSON is embedded as a string literal passed to ``JSON.parse``,
+        which browsers parse considerably faster than an object literal
+        of the same size.
+        
         Args:
             data: Data to embed (will be converted to JSON)
             var_name: Name of the JavaScript variable
@@ -208,5 +528,7 @@ class Renderer:
         Returns:
             JavaScript code defining the variable
         """
-        json_data = json.dumps(data, default=str)
-        return f"const {var_name} = {json_data};" 
\ No newline at end of file
+        json_data = _dumps(data)
+        # Escape "</" so the payload cannot close the surrounding script tag
+        literal = json.dumps(json_data).replace("</", "<\\/")
+        return f"const {var_name} = JSON.parse({literal});" 
\ No newline at end of file
@@ -7,7 +7,11 @@ library.
 """
 from typing import Dict, List, Optional, Tuple, Union, Any
 import re
+import json
 import math
+import base64
+import struct
+import zlib
 import random
 import colorsys
 from datetime import datetime
@@ -399,6 +403,133 @@ def safe_json_value(value: Any) -> Any:
         return str(value)  # Fallback
 
 
+def js_string(value: Any) -> str:
+    """
+    Encode a value as a JavaScript string literal for inline scripts.
+    
+    The result is JSON-escaped (so quotes and backslashes cannot end the
+    literal early) and has "</" escaped so it cannot close the script tag.
+    
+    Args:
+        value: Value to encode (converted with str())
+        
+    Returns:
+        Quoted JavaScript string literal
+    """
+    return json.dumps(str(value)).replace("</", "<\\/")
+
+
+def _tick_spec(start: float, stop: float, count: float) -> tuple:
+    """
+    Compute d3-array's ``tickSpec`` for ``start <= stop``.
+    
+    Ticks are integer multiples of a step, kept as integers to avoid
+    accumulating floating-point error across ticks: for a step below 1 the
+    ticks are ``i / inc``, otherwise ``i * inc``.
+    
+    Returns:
+        Tuple of (first multiple, last multiple, inc, whether to divide)
+    """
+    step = (stop - start) / count
+    power = math.floor(math.log10(step))
+    error = step / 10 ** power
+    if error >= math.sqrt(50):
+        factor = 10
+    elif error >= math.sqrt(10):
+        factor = 5
+    elif error >= math.sqrt(2):
+        factor = 2
+    else:
+        factor = 1
+    
+    if power < 0:
+        inc = 10 ** -power / factor
+        i1, i2 = round(start * inc), round(stop * inc)
+        if i1 / inc < start:
+            i1 += 1
+        if i2 / inc > stop:
+            i2 -= 1
+        divide = True
+    else:
+        inc = 10 ** power * factor
+        i1, i2 = round(start / inc), round(stop / inc)
+        if i1 * inc < start:
+            i1 += 1
+        if i2 * inc > stop:
+            i2 -= 1
+        divide = False
+    
+    # Too few ticks fit for a small count; d3 retries with twice as many
+    if i2 < i1 and 0.5 <= count < 2:
+        return _tick_spec(start, stop, count * 2)
+    return i1, i2, inc, divide
+
+
+def linear_ticks(start: float, stop: float, count: int = 5) -> List[float]:
+    """
+    Compute "nice" tick values for a linear scale over [start, stop].
+    
+    Follows the d3-array ``ticks`` algorithm, so the values match what
+    ``d3.ticks(start, stop, count)`` (and so
+    ``d3.scaleLinear().domain([start, stop]).ticks(count)``) returns in the
+    browser.
+    
+    Args:
+        start: Start of the domain
+        stop: End of the domain; ticks are descending if it is below start
+        count: Approximate number of ticks
+        
+    Returns:
+        List of tick values, in the direction from start to stop
+    """
+    if not count > 0:
+        return []
+    if start == stop:
+        return [start]
+    
+    reverse = stop < start
+    i1, i2, inc, divide = _tick_spec(stop, start, count) if reverse else _tick_spec(start, stop, count)
+    if not i2 >= i1:
+        return []
+    
+    multiples = range(i2, i1 - 1, -1) if reverse else range(i1, i2 + 1)
+    if divide:
+        return [i / inc for i in multiples]
+    return [i * inc for i in multiples]
+
+
+def png_data_url(rgb: bytes, width: int, height: int) -> str:
+    """
+    Encode 8-bit RGB pixels as a PNG ``data:`` URL.
+    
+    Only the standard library is used, which is enough for small generated
+    images such as color ramps.
+    
+    Args:
+        rgb: Row-major pixel data, three bytes per pixel
+        width: Image width in pixels
+        height: Image height in pixels
+        
+    Returns:
+        ``data:image/png;base64,...`` URL
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+    
+    stride = width * 3
+    scanlines = b"".join(
+        b"\x00" + rgb[row * stride:(row + 1) * stride] for row in range(height)
+    )
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(scanlines, 9))
+        + chunk(b"IEND", b"")
+    )
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
 def generate_unique_id(prefix: str = "llamavis") -> str:
     """
     Generate a unique ID for DOM elements.
@@ -4,7 +4,7 @@ Core visualization base class for LlamaVis.
 This module defines the abstract base class for all visualizations,
 providing common functionality and interfaces.
 """
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, IO, Iterator, List, Optional, Union
 import json
 import uuid
 import webbrowser
@@ -90,6 +90,19 @@ class Visualization(ABC):
         Returns:
             HTML document as a string
         """
+        return "".join(self.iter_html())
+    
+    def iter_html(self) -> Iterator[str]:
+        """
+        Generate HTML for the visualization piece by piece.
+        
+        The pieces join to the same document as ``to_html``; yielding them
+        lets callers stream a page (for example as a web framework's
+        streaming response) without holding a second, concatenated copy.
+        
+        Returns:
+            Iterator over consecutive pieces of the HTML document
+        """
         # Preprocess data
         processed_data = self.preprocess_data()
         
@@ -100,7 +113,7 @@ class Visualization(ABC):
         libraries = self.get_library_includes()
         
         # Generate HTML
-        html = self._renderer.generate_html(
+        return self._renderer.generate_html_chunks(
             data=processed_data,
             js_code=js_code,
             config=self.config,
@@ -110,8 +123,16 @@ class Visualization(ABC):
             width=self.width,
             height=self.height
         )
+    
+    def write_html(self, fp: IO[str]) -> None:
+        """
+        Write the visualization's HTML document to a text file object.
         
-        return html
+        Args:
+            fp: Writable text file object (or anything with ``write``)
+        """
+        for chunk in self.iter_html():
+            fp.write(chunk)
     
     def to_html(self) -> str:
         """
@@ -0,0 +1,38 @@
+"""
+Numba-compiled height scaling for LlamaVis 3D surfaces.
+
+This module requires numba and is imported lazily by ``threejs_vis``; when
+numba is not installed the NumPy implementation in ``threejs_vis`` is used
+instead. Heights are flat row-major float32 buffers.
+"""
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def scale_heights(heights, out, top):
+    """
+    Map heights linearly onto [0, top] in place of ``out``.
+
+    Args:
+        heights: Surface heights (float32, length rows * cols)
+        out: Output buffer for the scaled heights (float32, same length)
+        top: Height the largest value maps to; a flat surface maps to 0
+    """
+    n = heights.shape[0]
+    if n == 0:
+        return
+
+    lo = heights[0]
+    hi = heights[0]
+    for k in range(1, n):
+        h = heights[k]
+        if h < lo:
+            lo = h
+        if h > hi:
+            hi = h
+
+    scale = top / (hi - lo) if hi > lo else 0.0
+
+    # Each cell is independent, so the cells are split across cores
+    for k in prange(n):
+        out[k] = (heights[k] - lo) * scale
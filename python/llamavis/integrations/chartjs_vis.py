@@ -6,12 +6,13 @@ providing a simple and efficient way to create common visualizations.
 """
 from typing import Any, Dict, List, Optional, Union
 import json
+import string
 import uuid
 
 from ..core.visualization import Visualization
 from ..core.config import VisualizationConfig, ChartType
 from ..core.data import DataProcessor
-from ..core.utils import generate_unique_id, safe_json_value, generate_color_scale
+from ..core.utils import generate_unique_id, safe_json_value, js_string, generate_color_scale
 
 
 class ChartJSVisualization(Visualization):
@@ -89,84 +90,43 @@ class ChartJSVisualization(Visualization):
         return DataProcessor.to_json(self.data)
 
 
-class LineChart(ChartJSVisualization):
-    """
-    Line chart visualization using Chart.js.
-    
-    This class implements line chart visualizations for time series
-    or trend data using Chart.js.
-    """
-    
-    def __init__(
-        self,
-        data: Any,
-        config: Optional[VisualizationConfig] = None,
-        width: int = 800,
-        height: int = 400,
-        container_id: Optional[str] = None,
-        title: str = "Line Chart"
-    ):
-        """
-        Initialize a line chart visualization.
-        
-        Args:
-            data: Data for the line chart
-            config: Visualization configuration
-            width: Width of the visualization in pixels
-            height: Height of the visualization in pixels
-            container_id: HTML ID for the container element
-            title: Title of the visualization
-        """
-        # Create default config if none provided
-        if config is None:
-            config = VisualizationConfig(chart_type=ChartType.LINE)
-        else:
-            # Ensure chart type is set to LINE
-            config.update(chart_type=ChartType.LINE)
-        
-        super().__init__(data, config, width, height, container_id, title)
-    
-    def generate_js_code(self) -> str:
-        """
-        Generate JavaScript code for the line chart visualization.
-        
-        Returns:
-            JavaScript code as a string
-        """
-        # Define the Chart.js code for line chart visualization
-        js_code = f"""
+# Page JavaScript for the Chart.js charts, compiled once at import. Only the
+# escaped title and container id and the chart size are substituted per
+# render; data and config reach the script as its `data` and `config`
+# variables. Literal dollar signs (JS template strings) are written as $$.
+_LINE_CHART_TEMPLATE = string.Template("""
         // Create a line chart visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
+        (function() {
+            const container = document.getElementById(${container_id});
             
             // Clear previous content
             container.innerHTML = "";
             
             // Add title if specified
-            if ("{self.title}") {{
+            if (${title}) {
                 const titleElement = document.createElement("h3");
                 titleElement.className = "vis-title";
                 titleElement.style.textAlign = "center";
                 titleElement.style.marginBottom = "20px";
                 titleElement.style.fontFamily = config.font_family;
                 titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
+                titleElement.textContent = ${title};
                 container.appendChild(titleElement);
-            }}
+            }
             
             // Create canvas element
             const canvas = document.createElement("canvas");
-            canvas.width = {self.width};
-            canvas.height = {self.height};
+            canvas.width = ${width};
+            canvas.height = ${height};
             canvas.style.maxWidth = "100%";
             container.appendChild(canvas);
             
             // Create Chart.js dataset colors if not provided
-            const datasets = data.datasets.map((dataset, i) => {{
+            const datasets = data.datasets.map((dataset, i) => {
                 const colorIndex = i % config.color_palette.length;
                 const baseColor = config.color_palette[colorIndex];
                 
-                return {{
+                return {
                     ...dataset,
                     borderColor: dataset.borderColor || baseColor,
                     backgroundColor: dataset.backgroundColor || baseColor + "20", // 20 = 12% opacity
@@ -174,123 +134,121 @@ class LineChart(ChartJSVisualization):
                     pointRadius: dataset.pointRadius || 3,
                     pointHoverRadius: dataset.pointHoverRadius || 5,
                     fill: dataset.fill !== undefined ? dataset.fill : config.fill || false
-                }};
-            }});
+                };
+            });
             
             // Create chart configuration
-            const chartConfig = {{
+            const chartConfig = {
                 type: 'line',
-                data: {{
+                data: {
                     labels: data.labels,
                     datasets: datasets
-                }},
-                options: {{
+                },
+                options: {
                     responsive: config.responsive,
                     maintainAspectRatio: true,
-                    animation: {{
+                    animation: {
                         duration: config.animation ? config.animation_duration : 0
-                    }},
-                    interaction: {{
+                    },
+                    interaction: {
                         mode: 'index',
                         intersect: false
-                    }},
-                    plugins: {{
-                        title: {{
+                    },
+                    plugins: {
+                        title: {
                             display: false
-                        }},
-                        legend: {{
+                        },
+                        legend: {
                             display: config.show_legend,
                             position: 'top',
-                            labels: {{
-                                font: {{
+                            labels: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }},
-                        tooltip: {{
+                                }
+                            }
+                        },
+                        tooltip: {
                             enabled: config.interactive,
                             backgroundColor: 'rgba(0, 0, 0, 0.7)',
-                            titleFont: {{
+                            titleFont: {
                                 family: config.font_family,
                                 size: config.font_size + 2
-                            }},
-                            bodyFont: {{
+                            },
+                            bodyFont: {
                                 family: config.font_family,
                                 size: config.font_size
-                            }},
+                            },
                             padding: 10,
                             cornerRadius: 3,
                             displayColors: true
-                        }}
-                    }},
-                    scales: {{
-                        x: {{
-                            title: {{
+                        }
+                    },
+                    scales: {
+                        x: {
+                            title: {
                                 display: config.axis_labels && config.axis_labels.x,
                                 text: config.axis_labels ? config.axis_labels.x : '',
-                                font: {{
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }},
-                            grid: {{
+                                }
+                            },
+                            grid: {
                                 display: config.show_grid
-                            }},
-                            ticks: {{
-                                font: {{
+                            },
+                            ticks: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }},
-                        y: {{
-                            title: {{
+                                }
+                            }
+                        },
+                        y: {
+                            title: {
                                 display: config.axis_labels && config.axis_labels.y,
                                 text: config.axis_labels ? config.axis_labels.y : '',
-                                font: {{
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }},
-                            grid: {{
+                                }
+                            },
+                            grid: {
                                 display: config.show_grid
-                            }},
+                            },
                             beginAtZero: config.begin_at_zero || false,
-                            ticks: {{
-                                font: {{
+                            ticks: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-            }};
+                                }
+                            }
+                        }
+                    }
+                }
+            };
             
             // Apply smooth curves setting
-            if (config.smooth_curves) {{
-                chartConfig.options.elements = {{
-                    line: {{
+            if (config.smooth_curves) {
+                chartConfig.options.elements = {
+                    line: {
                         tension: 0.4
-                    }}
-                }};
-            }}
+                    }
+                };
+            }
             
             // Create the chart
             new Chart(canvas, chartConfig);
-        }})();
-        """
-        
-        return js_code
+        })();
+        """)
 
 
-class BarChart(ChartJSVisualization):
+class LineChart(ChartJSVisualization):
     """
-    Bar chart visualization using Chart.js.
+    Line chart visualization using Chart.js.
     
-    This class implements bar chart visualizations for categorical
-    data using Chart.js.
+    This class implements line chart visualizations for time series
+    or trend data using Chart.js.
     """
     
     def __init__(
@@ -300,13 +258,13 @@ class BarChart(ChartJSVisualization):
         width: int = 800,
         height: int = 400,
         container_id: Optional[str] = None,
-        title: str = "Bar Chart"
+        title: str = "Line Chart"
     ):
         """
-        Initialize a bar chart visualization.
+        Initialize a line chart visualization.
         
         Args:
-            data: Data for the bar chart
+            data: Data for the line chart
             config: Visualization configuration
             width: Width of the visualization in pixels
             height: Height of the visualization in pixels
@@ -315,54 +273,62 @@ class BarChart(ChartJSVisualization):
         """
         # Create default config if none provided
         if config is None:
-            config = VisualizationConfig(chart_type=ChartType.BAR)
+            config = VisualizationConfig(chart_type=ChartType.LINE)
         else:
-            # Ensure chart type is set to BAR
-            config.update(chart_type=ChartType.BAR)
+            # Ensure chart type is set to LINE
+            config.update(chart_type=ChartType.LINE)
         
         super().__init__(data, config, width, height, container_id, title)
     
     def generate_js_code(self) -> str:
         """
-        Generate JavaScript code for the bar chart visualization.
+        Generate JavaScript code for the line chart visualization.
         
         Returns:
             JavaScript code as a string
         """
-        # Define the Chart.js code for bar chart visualization
-        js_code = f"""
+        return _LINE_CHART_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height
+        )
+
+
+# JavaScript for BarChart (see _LINE_CHART_TEMPLATE)
+_BAR_CHART_TEMPLATE = string.Template("""
         // Create a bar chart visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
+        (function() {
+            const container = document.getElementById(${container_id});
             
             // Clear previous content
             container.innerHTML = "";
             
             // Add title if specified
-            if ("{self.title}") {{
+            if (${title}) {
                 const titleElement = document.createElement("h3");
                 titleElement.className = "vis-title";
                 titleElement.style.textAlign = "center";
                 titleElement.style.marginBottom = "20px";
                 titleElement.style.fontFamily = config.font_family;
                 titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
+                titleElement.textContent = ${title};
                 container.appendChild(titleElement);
-            }}
+            }
             
             // Create canvas element
             const canvas = document.createElement("canvas");
-            canvas.width = {self.width};
-            canvas.height = {self.height};
+            canvas.width = ${width};
+            canvas.height = ${height};
             canvas.style.maxWidth = "100%";
             container.appendChild(canvas);
             
             // Create Chart.js dataset colors if not provided
-            const datasets = data.datasets.map((dataset, i) => {{
+            const datasets = data.datasets.map((dataset, i) => {
                 const colorIndex = i % config.color_palette.length;
                 const baseColor = config.color_palette[colorIndex];
                 
-                return {{
+                return {
                     ...dataset,
                     backgroundColor: dataset.backgroundColor || (
                         Array.isArray(config.color_palette) ? 
@@ -375,134 +341,132 @@ class BarChart(ChartJSVisualization):
                         baseColor
                     ),
                     borderWidth: dataset.borderWidth || 1
-                }};
-            }});
+                };
+            });
             
             // Create chart configuration
-            const chartConfig = {{
+            const chartConfig = {
                 type: 'bar',
-                data: {{
+                data: {
                     labels: data.labels,
                     datasets: datasets
-                }},
-                options: {{
+                },
+                options: {
                     responsive: config.responsive,
                     maintainAspectRatio: true,
-                    animation: {{
+                    animation: {
                         duration: config.animation ? config.animation_duration : 0
-                    }},
-                    plugins: {{
-                        title: {{
+                    },
+                    plugins: {
+                        title: {
                             display: false
-                        }},
-                        legend: {{
+                        },
+                        legend: {
                             display: config.show_legend && datasets.length > 1,
                             position: 'top',
-                            labels: {{
-                                font: {{
+                            labels: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }},
-                        tooltip: {{
+                                }
+                            }
+                        },
+                        tooltip: {
                             enabled: config.interactive,
                             backgroundColor: 'rgba(0, 0, 0, 0.7)',
-                            titleFont: {{
+                            titleFont: {
                                 family: config.font_family,
                                 size: config.font_size + 2
-                            }},
-                            bodyFont: {{
+                            },
+                            bodyFont: {
                                 family: config.font_family,
                                 size: config.font_size
-                            }},
+                            },
                             padding: 10,
                             cornerRadius: 3,
                             displayColors: true
-                        }}
-                    }},
-                    scales: {{
-                        x: {{
-                            title: {{
+                        }
+                    },
+                    scales: {
+                        x: {
+                            title: {
                                 display: config.axis_labels && config.axis_labels.x,
                                 text: config.axis_labels ? config.axis_labels.x : '',
-                                font: {{
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }},
-                            grid: {{
+                                }
+                            },
+                            grid: {
                                 display: config.show_grid
-                            }},
-                            ticks: {{
-                                font: {{
+                            },
+                            ticks: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }},
-                        y: {{
-                            title: {{
+                                }
+                            }
+                        },
+                        y: {
+                            title: {
                                 display: config.axis_labels && config.axis_labels.y,
                                 text: config.axis_labels ? config.axis_labels.y : '',
-                                font: {{
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }},
-                            grid: {{
+                                }
+                            },
+                            grid: {
                                 display: config.show_grid
-                            }},
+                            },
                             beginAtZero: true,
-                            ticks: {{
-                                font: {{
+                            ticks: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-            }};
+                                }
+                            }
+                        }
+                    }
+                }
+            };
             
             // Check if we should use horizontal bars
-            if (config.horizontal) {{
+            if (config.horizontal) {
                 chartConfig.type = 'horizontalBar';
                 // In newer Chart.js versions, horizontal bar is handled differently
                 chartConfig.type = 'bar';
                 chartConfig.options.indexAxis = 'y';
-            }}
+            }
             
             // Create the chart
             new Chart(canvas, chartConfig);
-        }})();
-        """
-        
-        return js_code
+        })();
+        """)
 
 
-class PieChart(ChartJSVisualization):
+class BarChart(ChartJSVisualization):
     """
-    Pie chart visualization using Chart.js.
+    Bar chart visualization using Chart.js.
     
-    This class implements pie chart visualizations for showing parts
-    of a whole using Chart.js.
+    This class implements bar chart visualizations for categorical
+    data using Chart.js.
     """
     
     def __init__(
         self,
         data: Any,
         config: Optional[VisualizationConfig] = None,
-        width: int = 600,
+        width: int = 800,
         height: int = 400,
         container_id: Optional[str] = None,
-        title: str = "Pie Chart"
+        title: str = "Bar Chart"
     ):
         """
-        Initialize a pie chart visualization.
+        Initialize a bar chart visualization.
         
         Args:
-            data: Data for the pie chart
+            data: Data for the bar chart
             config: Visualization configuration
             width: Width of the visualization in pixels
             height: Height of the visualization in pixels
@@ -511,45 +475,53 @@ class PieChart(ChartJSVisualization):
         """
         # Create default config if none provided
         if config is None:
-            config = VisualizationConfig(chart_type=ChartType.PIE)
+            config = VisualizationConfig(chart_type=ChartType.BAR)
         else:
-            # Ensure chart type is set to PIE
-            config.update(chart_type=ChartType.PIE)
+            # Ensure chart type is set to BAR
+            config.update(chart_type=ChartType.BAR)
         
         super().__init__(data, config, width, height, container_id, title)
     
     def generate_js_code(self) -> str:
         """
-        Generate JavaScript code for the pie chart visualization.
+        Generate JavaScript code for the bar chart visualization.
         
         Returns:
             JavaScript code as a string
         """
-        # Define the Chart.js code for pie chart visualization
-        js_code = f"""
+        return _BAR_CHART_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height
+        )
+
+
+# JavaScript for PieChart (see _LINE_CHART_TEMPLATE)
+_PIE_CHART_TEMPLATE = string.Template("""
         // Create a pie chart visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
+        (function() {
+            const container = document.getElementById(${container_id});
             
             // Clear previous content
             container.innerHTML = "";
             
             // Add title if specified
-            if ("{self.title}") {{
+            if (${title}) {
                 const titleElement = document.createElement("h3");
                 titleElement.className = "vis-title";
                 titleElement.style.textAlign = "center";
                 titleElement.style.marginBottom = "20px";
                 titleElement.style.fontFamily = config.font_family;
                 titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
+                titleElement.textContent = ${title};
                 container.appendChild(titleElement);
-            }}
+            }
             
             // Create canvas element
             const canvas = document.createElement("canvas");
-            canvas.width = {self.width};
-            canvas.height = {self.height};
+            canvas.width = ${width};
+            canvas.height = ${height};
             canvas.style.maxWidth = "100%";
             container.appendChild(canvas);
             
@@ -557,70 +529,68 @@ class PieChart(ChartJSVisualization):
             const backgroundColor = data.datasets[0].backgroundColor || config.color_palette;
             
             // Create chart configuration
-            const chartConfig = {{
-                type: '{self.config.chart_type.value}',
-                data: {{
+            const chartConfig = {
+                type: '${chart_type}',
+                data: {
                     labels: data.labels,
-                    datasets: [{{
+                    datasets: [{
                         data: data.datasets[0].data,
                         backgroundColor: backgroundColor,
                         borderColor: config.show_grid ? 'white' : backgroundColor.map(color => color),
                         borderWidth: config.show_grid ? 2 : 0
-                    }}]
-                }},
-                options: {{
+                    }]
+                },
+                options: {
                     responsive: config.responsive,
                     maintainAspectRatio: true,
-                    animation: {{
+                    animation: {
                         duration: config.animation ? config.animation_duration : 0
-                    }},
-                    plugins: {{
-                        title: {{
+                    },
+                    plugins: {
+                        title: {
                             display: false
-                        }},
-                        legend: {{
+                        },
+                        legend: {
                             display: config.show_legend,
                             position: 'right',
-                            labels: {{
-                                font: {{
+                            labels: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }},
-                        tooltip: {{
+                                }
+                            }
+                        },
+                        tooltip: {
                             enabled: config.interactive,
                             backgroundColor: 'rgba(0, 0, 0, 0.7)',
-                            titleFont: {{
+                            titleFont: {
                                 family: config.font_family,
                                 size: config.font_size + 2
-                            }},
-                            bodyFont: {{
+                            },
+                            bodyFont: {
                                 family: config.font_family,
                                 size: config.font_size
-                            }},
+                            },
                             padding: 10,
                             cornerRadius: 3,
                             displayColors: true
-                        }}
-                    }}
-                }}
-            }};
+                        }
+                    }
+                }
+            };
             
             // Create the chart
             new Chart(canvas, chartConfig);
-        }})();
-        """
-        
-        return js_code
+        })();
+        """)
 
 
-class DonutChart(PieChart):
+class PieChart(ChartJSVisualization):
     """
-    Donut chart visualization using Chart.js.
+    Pie chart visualization using Chart.js.
     
-    This class is a specialized version of PieChart that renders
-    a donut (ring) chart.
+    This class implements pie chart visualizations for showing parts
+    of a whole using Chart.js.
     """
     
     def __init__(
@@ -630,13 +600,13 @@ class DonutChart(PieChart):
         width: int = 600,
         height: int = 400,
         container_id: Optional[str] = None,
-        title: str = "Donut Chart"
+        title: str = "Pie Chart"
     ):
         """
-        Initialize a donut chart visualization.
+        Initialize a pie chart visualization.
         
         Args:
-            data: Data for the donut chart
+            data: Data for the pie chart
             config: Visualization configuration
             width: Width of the visualization in pixels
             height: Height of the visualization in pixels
@@ -645,45 +615,54 @@ class DonutChart(PieChart):
         """
         # Create default config if none provided
         if config is None:
-            config = VisualizationConfig(chart_type=ChartType.DONUT)
+            config = VisualizationConfig(chart_type=ChartType.PIE)
         else:
-            # Ensure chart type is set to DONUT
-            config.update(chart_type=ChartType.DONUT)
+            # Ensure chart type is set to PIE
+            config.update(chart_type=ChartType.PIE)
         
         super().__init__(data, config, width, height, container_id, title)
     
     def generate_js_code(self) -> str:
         """
-        Generate JavaScript code for the donut chart visualization.
+        Generate JavaScript code for the pie chart visualization.
         
         Returns:
             JavaScript code as a string
         """
-        # Define the Chart.js code for donut chart visualization
-        js_code = f"""
+        return _PIE_CHART_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height,
+            chart_type=self.config.chart_type.value
+        )
+
+
+# JavaScript for DonutChart (see _LINE_CHART_TEMPLATE)
+_DONUT_CHART_TEMPLATE = string.Template("""
         // Create a donut chart visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
+        (function() {
+            const container = document.getElementById(${container_id});
             
             // Clear previous content
             container.innerHTML = "";
             
             // Add title if specified
-            if ("{self.title}") {{
+            if (${title}) {
                 const titleElement = document.createElement("h3");
                 titleElement.className = "vis-title";
                 titleElement.style.textAlign = "center";
                 titleElement.style.marginBottom = "20px";
                 titleElement.style.fontFamily = config.font_family;
                 titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
+                titleElement.textContent = ${title};
                 container.appendChild(titleElement);
-            }}
+            }
             
             // Create canvas element
             const canvas = document.createElement("canvas");
-            canvas.width = {self.width};
-            canvas.height = {self.height};
+            canvas.width = ${width};
+            canvas.height = ${height};
             canvas.style.maxWidth = "100%";
             container.appendChild(canvas);
             
@@ -691,71 +670,69 @@ class DonutChart(PieChart):
             const backgroundColor = data.datasets[0].backgroundColor || config.color_palette;
             
             // Create chart configuration
-            const chartConfig = {{
+            const chartConfig = {
                 type: 'doughnut',
-                data: {{
+                data: {
                     labels: data.labels,
-                    datasets: [{{
+                    datasets: [{
                         data: data.datasets[0].data,
                         backgroundColor: backgroundColor,
                         borderColor: config.show_grid ? 'white' : backgroundColor.map(color => color),
                         borderWidth: config.show_grid ? 2 : 0
-                    }}]
-                }},
-                options: {{
+                    }]
+                },
+                options: {
                     responsive: config.responsive,
                     maintainAspectRatio: true,
-                    animation: {{
+                    animation: {
                         duration: config.animation ? config.animation_duration : 0
-                    }},
+                    },
                     cutout: config.cutout || '70%',
-                    plugins: {{
-                        title: {{
+                    plugins: {
+                        title: {
                             display: false
-                        }},
-                        legend: {{
+                        },
+                        legend: {
                             display: config.show_legend,
                             position: 'right',
-                            labels: {{
-                                font: {{
+                            labels: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }},
-                        tooltip: {{
+                                }
+                            }
+                        },
+                        tooltip: {
                             enabled: config.interactive,
                             backgroundColor: 'rgba(0, 0, 0, 0.7)',
-                            titleFont: {{
+                            titleFont: {
                                 family: config.font_family,
                                 size: config.font_size + 2
-                            }},
-                            bodyFont: {{
+                            },
+                            bodyFont: {
                                 family: config.font_family,
                                 size: config.font_size
-                            }},
+                            },
                             padding: 10,
                             cornerRadius: 3,
                             displayColors: true
-                        }}
-                    }}
-                }}
-            }};
+                        }
+                    }
+                }
+            };
             
             // Create the chart
             new Chart(canvas, chartConfig);
-        }})();
-        """
-        
-        return js_code
+        })();
+        """)
 
 
-class RadarChart(ChartJSVisualization):
+class DonutChart(PieChart):
     """
-    Radar chart visualization using Chart.js.
+    Donut chart visualization using Chart.js.
     
-    This class implements radar chart visualizations for multivariate
-    data using Chart.js.
+    This class is a specialized version of PieChart that renders
+    a donut (ring) chart.
     """
     
     def __init__(
@@ -765,13 +742,13 @@ class RadarChart(ChartJSVisualization):
         width: int = 600,
         height: int = 400,
         container_id: Optional[str] = None,
-        title: str = "Radar Chart"
+        title: str = "Donut Chart"
     ):
         """
-        Initialize a radar chart visualization.
+        Initialize a donut chart visualization.
         
         Args:
-            data: Data for the radar chart
+            data: Data for the donut chart
             config: Visualization configuration
             width: Width of the visualization in pixels
             height: Height of the visualization in pixels
@@ -780,54 +757,62 @@ class RadarChart(ChartJSVisualization):
         """
         # Create default config if none provided
         if config is None:
-            config = VisualizationConfig(chart_type=ChartType.RADAR)
+            config = VisualizationConfig(chart_type=ChartType.DONUT)
         else:
-            # Ensure chart type is set to RADAR
-            config.update(chart_type=ChartType.RADAR)
+            # Ensure chart type is set to DONUT
+            config.update(chart_type=ChartType.DONUT)
         
         super().__init__(data, config, width, height, container_id, title)
     
     def generate_js_code(self) -> str:
         """
-        Generate JavaScript code for the radar chart visualization.
+        Generate JavaScript code for the donut chart visualization.
         
         Returns:
             JavaScript code as a string
         """
-        # Define the Chart.js code for radar chart visualization
-        js_code = f"""
+        return _DONUT_CHART_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height
+        )
+
+
+# JavaScript for RadarChart (see _LINE_CHART_TEMPLATE)
+_RADAR_CHART_TEMPLATE = string.Template("""
         // Create a radar chart visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
+        (function() {
+            const container = document.getElementById(${container_id});
             
             // Clear previous content
             container.innerHTML = "";
             
             // Add title if specified
-            if ("{self.title}") {{
+            if (${title}) {
                 const titleElement = document.createElement("h3");
                 titleElement.className = "vis-title";
                 titleElement.style.textAlign = "center";
                 titleElement.style.marginBottom = "20px";
                 titleElement.style.fontFamily = config.font_family;
                 titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
+                titleElement.textContent = ${title};
                 container.appendChild(titleElement);
-            }}
+            }
             
             // Create canvas element
             const canvas = document.createElement("canvas");
-            canvas.width = {self.width};
-            canvas.height = {self.height};
+            canvas.width = ${width};
+            canvas.height = ${height};
             canvas.style.maxWidth = "100%";
             container.appendChild(canvas);
             
             // Create Chart.js dataset colors if not provided
-            const datasets = data.datasets.map((dataset, i) => {{
+            const datasets = data.datasets.map((dataset, i) => {
                 const colorIndex = i % config.color_palette.length;
                 const baseColor = config.color_palette[colorIndex];
                 
-                return {{
+                return {
                     ...dataset,
                     borderColor: dataset.borderColor || baseColor,
                     backgroundColor: dataset.backgroundColor || baseColor + "40", // 40 = 25% opacity
@@ -838,76 +823,127 @@ class RadarChart(ChartJSVisualization):
                     pointHoverBorderColor: dataset.pointHoverBorderColor || baseColor,
                     pointRadius: dataset.pointRadius || 3,
                     pointHoverRadius: dataset.pointHoverRadius || 5
-                }};
-            }});
+                };
+            });
             
             // Create chart configuration
-            const chartConfig = {{
+            const chartConfig = {
                 type: 'radar',
-                data: {{
+                data: {
                     labels: data.labels,
                     datasets: datasets
-                }},
-                options: {{
+                },
+                options: {
                     responsive: config.responsive,
                     maintainAspectRatio: true,
-                    animation: {{
+                    animation: {
                         duration: config.animation ? config.animation_duration : 0
-                    }},
-                    plugins: {{
-                        title: {{
+                    },
+                    plugins: {
+                        title: {
                             display: false
-                        }},
-                        legend: {{
+                        },
+                        legend: {
                             display: config.show_legend,
                             position: 'top',
-                            labels: {{
-                                font: {{
+                            labels: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }}
-                        }},
-                        tooltip: {{
+                                }
+                            }
+                        },
+                        tooltip: {
                             enabled: config.interactive,
                             backgroundColor: 'rgba(0, 0, 0, 0.7)',
-                            titleFont: {{
+                            titleFont: {
                                 family: config.font_family,
                                 size: config.font_size + 2
-                            }},
-                            bodyFont: {{
+                            },
+                            bodyFont: {
                                 family: config.font_family,
                                 size: config.font_size
-                            }},
+                            },
                             padding: 10,
                             cornerRadius: 3,
                             displayColors: true
-                        }}
-                    }},
-                    scales: {{
-                        r: {{
-                            angleLines: {{
+                        }
+                    },
+                    scales: {
+                        r: {
+                            angleLines: {
                                 display: config.show_grid
-                            }},
-                            grid: {{
+                            },
+                            grid: {
                                 circular: true,
                                 display: config.show_grid
-                            }},
-                            pointLabels: {{
-                                font: {{
+                            },
+                            pointLabels: {
+                                font: {
                                     family: config.font_family,
                                     size: config.font_size
-                                }}
-                            }},
+                                }
+                            },
                             beginAtZero: true
-                        }}
-                    }}
-                }}
-            }};
+                        }
+                    }
+                }
+            };
             
             // Create the chart
             new Chart(canvas, chartConfig);
-        }})();
+        })();
+        """)
+
+
+class RadarChart(ChartJSVisualization):
+    """
+    Radar chart visualization using Chart.js.
+    
+    This class implements radar chart visualizations for multivariate
+    data using Chart.js.
+    """
+    
+    def __init__(
+        self,
+        data: Any,
+        config: Optional[VisualizationConfig] = None,
+        width: int = 600,
+        height: int = 400,
+        container_id: Optional[str] = None,
+        title: str = "Radar Chart"
+    ):
+        """
+        Initialize a radar chart visualization.
+        
+        Args:
+            data: Data for the radar chart
+            config: Visualization configuration
+            width: Width of the visualization in pixels
+            height: Height of the visualization in pixels
+            container_id: HTML ID for the container element
+            title: Title of the visualization
+        """
+        # Create default config if none provided
+        if config is None:
+            config = VisualizationConfig(chart_type=ChartType.RADAR)
+        else:
+            # Ensure chart type is set to RADAR
+            config.update(chart_type=ChartType.RADAR)
+        
+        super().__init__(data, config, width, height, container_id, title)
+    
+    def generate_js_code(self) -> str:
         """
+        Generate JavaScript code for the radar chart visualization.
         
-        return js_code 
\ No newline at end of file
+        Returns:
+            JavaScript code as a string
+        """
+        return _RADAR_CHART_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height
+        )
+ 
\ No newline at end of file
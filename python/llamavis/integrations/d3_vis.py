@@ -5,13 +5,50 @@ This module implements visualizations using D3.js, providing network graphs,
 hierarchical visualizations, and other advanced chart types.
 """
 from typing import Any, Dict, List, Optional, Union
+import base64
+import functools
+import html
 import json
+import string
 import uuid
 
+import numpy as np
+
 from ..core.visualization import Visualization
 from ..core.config import VisualizationConfig, ChartType
 from ..core.data import DataProcessor
-from ..core.utils import generate_unique_id
+from ..core.utils import generate_unique_id, hex_to_rgb, js_string, linear_ticks, png_data_url
+
+
+def _fa2_step_numpy(xs, ys, vxs, vys, degrees, edges_src, edges_dst, k_r, k_a, k_g, speed):
+    """
+    NumPy implementation of ``_fa2_numba.fa2_step`` used when numba is unavailable.
+    
+    Uses an N x N broadcast for repulsion, so memory grows quadratically
+    with the node count.
+    """
+    dx = xs[:, None] - xs[None, :]
+    dy = ys[:, None] - ys[None, :]
+    dist2 = dx * dx + dy * dy + 1e-9
+    mass = degrees + 1.0
+    f = k_r * mass[:, None] * mass[None, :] / dist2
+    np.fill_diagonal(f, 0.0)
+    
+    g = k_g * mass / (np.sqrt(xs * xs + ys * ys) + 1e-9)
+    vxs[:] = (dx * f).sum(axis=1) - xs * g
+    vys[:] = (dy * f).sum(axis=1) - ys * g
+    
+    ex = k_a * (xs[edges_src] - xs[edges_dst])
+    ey = k_a * (ys[edges_src] - ys[edges_dst])
+    np.subtract.at(vxs, edges_src, ex)
+    np.subtract.at(vys, edges_src, ey)
+    np.add.at(vxs, edges_dst, ex)
+    np.add.at(vys, edges_dst, ey)
+    
+    force = np.sqrt(vxs * vxs + vys * vys)
+    scale = np.divide(np.minimum(force, speed), force, out=np.zeros_like(force), where=force > 0)
+    xs += vxs * scale
+    ys += vys * scale
 
 
 class D3Visualization(Visualization):
@@ -55,31 +92,183 @@ class D3Visualization(Visualization):
         Returns:
             List of library names to include
         """
-        libs = ["d3"]
+        # Only the d3 micro-modules each chart uses are loaded; the renderer
+        # adds their dependencies. The chart code itself ships in the
+        # packaged llamavis bundle.
+        chart_type = self.config.chart_type
+        if chart_type == ChartType.NETWORK:
+            modules = ["d3-selection", "d3-force", "d3-drag", "d3-zoom", "d3-scale", "d3-color"]
+        elif chart_type == ChartType.TREE:
+            modules = ["d3-selection", "d3-hierarchy", "d3-shape", "d3-scale", "d3-zoom"]
+        elif chart_type == ChartType.TREEMAP:
+            modules = ["d3-selection", "d3-hierarchy", "d3-scale"]
+        elif chart_type == ChartType.HEATMAP:
+            modules = ["d3-selection", "d3-scale", "d3-axis", "d3-scale-chromatic", "d3-color"]
+        else:
+            modules = ["d3"]
+        
+        return modules + ["llamavis"]
+    
+    def _render_call(self, function: str, **extra_options: Any) -> str:
+        """
+        Build the JavaScript call into the bundled D3 renderers.
         
-        # Add additional libraries based on chart type
-        if self.config.chart_type in [ChartType.FORCE_DIRECTED, ChartType.NETWORK]:
-            libs.append("d3-force")
+        The ``data`` and ``config`` variables are declared by the renderer
+        when the page is assembled, so only per-instance options are inlined.
         
-        return libs
+        Args:
+            function: Name of the ``LlamaVis`` renderer to call
+            **extra_options: Additional renderer-specific options
+            
+        Returns:
+            JavaScript code as a string
+        """
+        options = {"width": self.width, "height": self.height, "title": self.title}
+        options.update(extra_options)
+        # Escape "</" so a title cannot close the surrounding script tag
+        options_js = json.dumps(options).replace("</", "<\\/")
+        return (
+            f"LlamaVis.{function}({js_string(self.container_id)}, data, config, "
+            f"{options_js});"
+        )
     
     def preprocess_data(self) -> Dict[str, Any]:
         """
         Preprocess the data for D3.js visualization.
         
+        For networks, the ``prelayout_iterations`` additional option runs
+        that many ForceAtlas2 iterations in Python to seed the browser
+        simulation, and ``prelayout_seed`` seeds the random starting
+        positions, making them reproducible.
+        
         Returns:
             Preprocessed data ready for visualization
         """
         # Default preprocessing for most D3 visualizations
-        if self.config.chart_type == ChartType.NETWORK or self.config.chart_type == ChartType.FORCE_DIRECTED:
-            return DataProcessor.prepare_for_network(self.data)
+        if self.config.chart_type == ChartType.NETWORK:
+            network = DataProcessor.prepare_for_network(self.data)
+            
+            # Optionally seed the browser simulation with a server-side layout
+            iterations = self.config.additional_options.get("prelayout_iterations", 0)
+            seed = self.config.additional_options.get("prelayout_seed")
+            if iterations and network["nodes"]:
+                positions = self.compute_prelayout(network["nodes"], network["links"], iterations, seed=seed)
+            else:
+                positions = self.initial_positions(network["nodes"], seed)
+            
+            # Starting positions travel as one interleaved float32 buffer
+            # [x0, y0, x1, y1, ...] that the browser uses as its position store
+            positions = positions + np.array([self.width / 2, self.height / 2], dtype=np.float32)
+            network["positions"] = base64.b64encode(
+                positions.astype("<f4").tobytes()
+            ).decode("ascii")
+            
+            return network
         elif self.config.chart_type == ChartType.TREE or self.config.chart_type == ChartType.TREEMAP:
-            return DataProcessor.prepare_for_hierarchical(self.data)
+            # Treemaps lay out largest tiles first; trees keep the given order
+            return DataProcessor.prepare_for_hierarchical(
+                self.data, sort=self.config.chart_type == ChartType.TREEMAP
+            )
         elif self.config.chart_type == ChartType.HEATMAP:
             return DataProcessor.prepare_for_heatmap(self.data)
         else:
             # Default to returning data as is
             return DataProcessor.to_json(self.data)
+    
+    def initial_positions(
+        self,
+        nodes: List[Dict[str, Any]],
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Get starting positions for network nodes.
+        
+        Nodes that already have 'x' and 'y' keep them; the rest are placed
+        uniformly at random.
+        
+        Args:
+            nodes: List of node dictionaries
+            seed: Random seed for the generated positions
+            
+        Returns:
+            Float32 array of shape (len(nodes), 2) centered on the origin
+        """
+        n = len(nodes)
+        spread = min(self.width, self.height) / 2
+        rng = np.random.default_rng(seed)
+        xs = np.fromiter(
+            (node.get("x", np.nan) for node in nodes), dtype=np.float32, count=n
+        ) - self.width / 2
+        ys = np.fromiter(
+            (node.get("y", np.nan) for node in nodes), dtype=np.float32, count=n
+        ) - self.height / 2
+        missing = np.isnan(xs) | np.isnan(ys)
+        xs[missing] = rng.uniform(-spread, spread, missing.sum())
+        ys[missing] = rng.uniform(-spread, spread, missing.sum())
+        
+        return np.stack([xs, ys], axis=1)
+    
+    def compute_prelayout(
+        self,
+        nodes: List[Dict[str, Any]],
+        links: List[Dict[str, Any]],
+        iterations: int = 100,
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Compute a ForceAtlas2 layout for a network on the Python side.
+        
+        Uses the numba kernel when numba is installed and a NumPy
+        implementation otherwise.
+        
+        Args:
+            nodes: List of node dictionaries (must have 'id')
+            links: List of link dictionaries (must have 'source' and 'target')
+            iterations: Number of layout iterations to run
+            seed: Random seed for the initial positions
+            
+        Returns:
+            Array of shape (len(nodes), 2) with positions centered on the origin,
+            scaled to fit inside the visualization
+        """
+        n = len(nodes)
+        index = {node["id"]: i for i, node in enumerate(nodes)}
+        edges = [(index[link["source"]], index[link["target"]]) for link in links
+                 if link["source"] in index and link["target"] in index]
+        edges_src = np.fromiter((s for s, _ in edges), dtype=np.int32, count=len(edges))
+        edges_dst = np.fromiter((t for _, t in edges), dtype=np.int32, count=len(edges))
+        
+        degrees = np.zeros(n, dtype=np.float32)
+        np.add.at(degrees, edges_src, 1.0)
+        np.add.at(degrees, edges_dst, 1.0)
+        
+        # Start from the given coordinates where present, random otherwise
+        spread = min(self.width, self.height) / 2
+        start = self.initial_positions(nodes, seed)
+        xs = np.ascontiguousarray(start[:, 0])
+        ys = np.ascontiguousarray(start[:, 1])
+        vxs = np.zeros(n, dtype=np.float32)
+        vys = np.zeros(n, dtype=np.float32)
+        
+        # Imported here so numba's start-up cost is only paid when a
+        # pre-layout actually runs
+        try:
+            from ._fa2_numba import fa2_step as step
+        except ImportError:  # numba is optional
+            step = _fa2_step_numpy
+        for i in range(iterations):
+            # Linear cooling of the maximum per-iteration displacement
+            speed = spread * 0.1 * (1.0 - i / iterations) + 1.0
+            step(xs, ys, vxs, vys, degrees, edges_src, edges_dst, 10.0, 0.01, 1.0, speed)
+        
+        # Center and scale the result to fit inside the visualization
+        positions = np.stack([xs, ys], axis=1)
+        positions -= positions.mean(axis=0)
+        extent = np.abs(positions).max()
+        if extent > 0:
+            positions *= 0.9 * spread / extent
+        
+        return positions
 
 
 class NetworkGraph(D3Visualization):
@@ -90,6 +279,9 @@ class NetworkGraph(D3Visualization):
     force-directed layout algorithm.
     """
     
+    # Node count above which the graph is drawn with WebGL instead of SVG
+    WEBGL_THRESHOLD = 10000
+    
     def __init__(
         self,
         data: Any,
@@ -123,160 +315,18 @@ class NetworkGraph(D3Visualization):
         """
         Generate JavaScript code for the network graph visualization.
         
+        Graphs with more nodes than ``webgl_threshold`` (an additional
+        option, 10000 by default) are drawn with WebGL instead of SVG.
+        
         Returns:
             JavaScript code as a string
         """
-        # Define the D3.js code for force-directed network graph
-        js_code = f"""
-        // Create a force-directed network graph
-        (function() {{
-            const width = {self.width};
-            const height = {self.height};
-            const container = d3.select("#{self.container_id}");
-            
-            // Clear previous content
-            container.html("");
-            
-            // Add title if specified
-            if ("{self.title}") {{
-                container.append("h3")
-                    .attr("class", "vis-title")
-                    .style("text-align", "center")
-                    .style("margin-bottom", "20px")
-                    .style("font-family", config.font_family)
-                    .style("font-size", config.title_font_size + "px")
-                    .text("{self.title}");
-            }}
-            
-            // Create SVG element
-            const svg = container.append("svg")
-                .attr("width", width)
-                .attr("height", height)
-                .attr("viewBox", [0, 0, width, height])
-                .attr("style", "max-width: 100%; height: auto;");
-            
-            // Extract nodes and links from data
-            const nodes = data.nodes;
-            const links = data.links;
-            
-            // Define color scale for nodes
-            const colorScale = d3.scaleOrdinal()
-                .domain(nodes.map(d => d.group || "default"))
-                .range(config.color_palette);
-            
-            // Create a simulation with forces
-            const simulation = d3.forceSimulation(nodes)
-                .force("link", d3.forceLink(links).id(d => d.id))
-                .force("charge", d3.forceManyBody().strength(-100))
-                .force("center", d3.forceCenter(width / 2, height / 2))
-                .force("collide", d3.forceCollide().radius(d => d.radius || 10));
-            
-            // Create links
-            const link = svg.append("g")
-                .attr("stroke", "#999")
-                .attr("stroke-opacity", 0.6)
-                .selectAll("line")
-                .data(links)
-                .join("line")
-                .attr("stroke-width", d => Math.sqrt(d.value || 1));
-            
-            // Create nodes
-            const node = svg.append("g")
-                .attr("stroke", "#fff")
-                .attr("stroke-width", 1.5)
-                .selectAll("circle")
-                .data(nodes)
-                .join("circle")
-                .attr("r", d => d.radius || 5)
-                .attr("fill", d => colorScale(d.group || "default"))
-                .call(drag(simulation));
-            
-            // Add tooltip for nodes
-            if (config.interactive) {{
-                node.append("title")
-                    .text(d => d.id);
-            }}
-            
-            // Add labels if configured
-            if (config.show_labels) {{
-                const labels = svg.append("g")
-                    .attr("font-family", config.font_family)
-                    .attr("font-size", config.font_size)
-                    .selectAll("text")
-                    .data(nodes)
-                    .join("text")
-                    .attr("dx", 12)
-                    .attr("dy", ".35em")
-                    .text(d => d.label || d.id);
-                
-                simulation.on("tick", () => {{
-                    link
-                        .attr("x1", d => d.source.x)
-                        .attr("y1", d => d.source.y)
-                        .attr("x2", d => d.target.x)
-                        .attr("y2", d => d.target.y);
-                    
-                    node
-                        .attr("cx", d => d.x)
-                        .attr("cy", d => d.y);
-                    
-                    labels
-                        .attr("x", d => d.x)
-                        .attr("y", d => d.y);
-                }});
-            }} else {{
-                simulation.on("tick", () => {{
-                    link
-                        .attr("x1", d => d.source.x)
-                        .attr("y1", d => d.source.y)
-                        .attr("x2", d => d.target.x)
-                        .attr("y2", d => d.target.y);
-                    
-                    node
-                        .attr("cx", d => d.x)
-                        .attr("cy", d => d.y);
-                }});
-            }}
-            
-            // Implement drag functionality
-            function drag(simulation) {{
-                function dragstarted(event) {{
-                    if (!event.active) simulation.alphaTarget(0.3).restart();
-                    event.subject.fx = event.subject.x;
-                    event.subject.fy = event.subject.y;
-                }}
-                
-                function dragged(event) {{
-                    event.subject.fx = event.x;
-                    event.subject.fy = event.y;
-                }}
-                
-                function dragended(event) {{
-                    if (!event.active) simulation.alphaTarget(0);
-                    event.subject.fx = null;
-                    event.subject.fy = null;
-                }}
-                
-                return d3.drag()
-                    .on("start", dragstarted)
-                    .on("drag", dragged)
-                    .on("end", dragended);
-            }}
-            
-            // Implement zoom functionality if enabled
-            if (config.interactions.includes("zoom")) {{
-                const zoom = d3.zoom()
-                    .scaleExtent([0.1, 10])
-                    .on("zoom", (event) => {{
-                        svg.select("g").attr("transform", event.transform);
-                    }});
-                
-                svg.call(zoom);
-            }}
-        }})();
-        """
-        
-        return js_code
+        return self._render_call(
+            "renderNetwork",
+            webgl_threshold=self.config.additional_options.get(
+                "webgl_threshold", self.WEBGL_THRESHOLD
+            ),
+        )
 
 
 class TreeVis(D3Visualization):
@@ -322,107 +372,7 @@ class TreeVis(D3Visualization):
         Returns:
             JavaScript code as a string
         """
-        # Define the D3.js code for tree visualization
-        js_code = f"""
-        // Create a hierarchical tree visualization
-        (function() {{
-            const width = {self.width};
-            const height = {self.height};
-            const container = d3.select("#{self.container_id}");
-            
-            // Clear previous content
-            container.html("");
-            
-            // Add title if specified
-            if ("{self.title}") {{
-                container.append("h3")
-                    .attr("class", "vis-title")
-                    .style("text-align", "center")
-                    .style("margin-bottom", "20px")
-                    .style("font-family", config.font_family)
-                    .style("font-size", config.title_font_size + "px")
-                    .text("{self.title}");
-            }}
-            
-            // Create SVG element
-            const svg = container.append("svg")
-                .attr("width", width)
-                .attr("height", height)
-                .attr("viewBox", [0, 0, width, height])
-                .attr("style", "max-width: 100%; height: auto;");
-            
-            // Create a group for the tree
-            const g = svg.append("g")
-                .attr("transform", `translate(40, 0)`);
-            
-            // Create a hierarchical data structure
-            const root = d3.hierarchy(data);
-            
-            // Set the size of the tree layout
-            const treeLayout = d3.tree()
-                .size([height - 100, width - 160]);
-            
-            // Compute the tree layout
-            treeLayout(root);
-            
-            // Define color scale for nodes
-            const colorScale = d3.scaleOrdinal()
-                .domain(root.descendants().map(d => d.depth))
-                .range(config.color_palette);
-            
-            // Create links
-            g.selectAll(".link")
-                .data(root.links())
-                .join("path")
-                .attr("class", "link")
-                .attr("d", d3.linkHorizontal()
-                    .x(d => d.y)
-                    .y(d => d.x))
-                .attr("fill", "none")
-                .attr("stroke", "#999")
-                .attr("stroke-opacity", 0.6)
-                .attr("stroke-width", 1.5);
-            
-            // Create nodes
-            const node = g.selectAll(".node")
-                .data(root.descendants())
-                .join("g")
-                .attr("class", "node")
-                .attr("transform", d => `translate(${{d.y}},${{d.x}})`);
-            
-            // Add circles for nodes
-            node.append("circle")
-                .attr("r", 5)
-                .attr("fill", d => colorScale(d.depth))
-                .attr("stroke", "#fff")
-                .attr("stroke-width", 1.5);
-            
-            // Add labels for nodes
-            node.append("text")
-                .attr("dy", "0.31em")
-                .attr("x", d => d.children ? -8 : 8)
-                .attr("text-anchor", d => d.children ? "end" : "start")
-                .text(d => d.data.name)
-                .attr("font-family", config.font_family)
-                .attr("font-size", config.font_size + "px")
-                .clone(true).lower()
-                .attr("stroke", "white")
-                .attr("stroke-width", 3);
-            
-            // Implement zoom functionality if enabled
-            if (config.interactions.includes("zoom")) {{
-                const zoom = d3.zoom()
-                    .scaleExtent([0.1, 3])
-                    .on("zoom", (event) => {{
-                        g.attr("transform", event.transform);
-                    }});
-                
-                svg.call(zoom);
-            }}
-        }})();
-        """
-        
-        return js_code
+        return self._render_call("renderTree")
 
 
 class TreemapVis(D3Visualization):
@@ -469,119 +419,148 @@ class TreemapVis(D3Visualization):
         Returns:
             JavaScript code as a string
         """
-        # Define the D3.js code for treemap visualization
-        js_code = f"""
-        // Create a treemap visualization
-        (function() {{
-            const width = {self.width};
-            const height = {self.height};
-            const container = d3.select("#{self.container_id}");
-            
-            // Clear previous content
-            container.html("");
-            
-            // Add title if specified
-            if ("{self.title}") {{
-                container.append("h3")
-                    .attr("class", "vis-title")
-                    .style("text-align", "center")
-                    .style("margin-bottom", "20px")
-                    .style("font-family", config.font_family)
-                    .style("font-size", config.title_font_size + "px")
-                    .text("{self.title}");
-            }}
-            
-            // Create SVG element
-            const svg = container.append("svg")
-                .attr("width", width)
-                .attr("height", height)
-                .attr("viewBox", [0, 0, width, height])
-                .attr("style", "max-width: 100%; height: auto;");
-            
-            // Create a group for the treemap
-            const g = svg.append("g");
-            
-            // Create a hierarchical data structure
-            const hierarchy = d3.hierarchy(data)
-                .sum(d => d.value || 1)
-                .sort((a, b) => b.value - a.value);
-            
-            // Create a treemap layout
-            const treemap = d3.treemap()
-                .size([width, height - 50])
-                .paddingOuter(3)
-                .paddingTop(19)
-                .paddingInner(1)
-                .round(true);
-            
-            // Compute the treemap layout
-            const root = treemap(hierarchy);
-            
-            // Define color scale
-            const colorScale = d3.scaleOrdinal()
-                .domain(root.children.map(d => d.data.name))
-                .range(config.color_palette);
-            
-            // Create leaf nodes
-            const leaf = g.selectAll("g")
-                .data(root.leaves())
-                .join("g")
-                .attr("transform", d => `translate(${{d.x0}},${{d.y0}})`);
-            
-            // Create rectangles for leaf nodes
-            leaf.append("rect")
-                .attr("width", d => d.x1 - d.x0)
-                .attr("height", d => d.y1 - d.y0)
-                .attr("fill", d => {{
-                    while (d.depth > 1) d = d.parent;
-                    return colorScale(d.data.name);
-                }})
-                .attr("fill-opacity", 0.8)
-                .attr("stroke", "#fff");
-            
-            // Add labels for leaf nodes if there's enough space
-            leaf.append("text")
-                .attr("x", 3)
-                .attr("y", "1.1em")
-                .text(d => d.data.name)
-                .attr("font-family", config.font_family)
-                .attr("font-size", config.font_size + "px")
-                .attr("fill", "white")
-                .each(function(d) {{
-                    const t = d3.select(this);
-                    const rect = d3.select(this.parentNode).select("rect");
-                    const rectWidth = rect.attr("width");
-                    const rectHeight = rect.attr("height");
-                    
-                    // Hide text if it doesn't fit in the rectangle
-                    if (this.getComputedTextLength() > rectWidth || 
-                        parseInt(rectHeight) < config.font_size * 1.5) {{
-                        t.remove();
-                    }}
-                }});
-            
-            // Add titles (categories) for parent nodes
-            g.selectAll(".parent-label")
-                .data(root.descendants().filter(d => d.depth === 1))
-                .join("text")
-                .attr("class", "parent-label")
-                .attr("x", d => d.x0 + 3)
-                .attr("y", d => d.y0 + 14)
-                .attr("font-family", config.font_family)
-                .attr("font-size", (config.font_size + 2) + "px")
-                .attr("font-weight", "bold")
-                .text(d => d.data.name)
-                .attr("fill", "#000");
-            
-            // Add tooltips for all nodes
-            if (config.interactive) {{
-                leaf.append("title")
-                    .text(d => `${{d.ancestors().reverse().map(d => d.data.name).join("/")}}\nValue: ${{d.value}}`);
-            }}
-        }})();
-        """
+        return self._render_call("renderTreemap")
+
+
+# Static heatmap legend markup (see HeatmapVis._render_static_svg), compiled
+# once at import; only the numbers and labels are substituted per render.
+# Transforms are written as matrix() so the browser applies them directly.
+_LEGEND_TEMPLATE = string.Template(
+    '<g class="legend">'
+    '<image class="legend-ramp" x="$legend_x" y="$legend_y" width="$legend_width" '
+    'height="$legend_height" preserveAspectRatio="none"$href/>'
+    '<g transform="matrix(1,0,0,1,$legend_x,$axis_y)" fill="none" '
+    'font-size="10" font-family="sans-serif" text-anchor="middle">'
+    '<path class="domain" stroke="currentColor" d="M0.5,6V0.5H${domain_end}V6"/>'
+    '<path class="tick" stroke="currentColor" d="$tick_marks"/>'
+    '$ticks'
+    '</g>'
+    '<text class="label" x="$title_x" y="$title_y" text-anchor="middle">Value</text>'
+    '$axis_labels'
+    '</g>'
+)
+_LEGEND_TICK_TEMPLATE = string.Template(
+    '<text x="$x" y="9" dy="0.71em" fill="currentColor">$label</text>'
+)
+_AXIS_LABELS_TEMPLATE = string.Template(
+    '<text class="label" x="$x_label_x" y="$x_label_y" text-anchor="middle">$x_label</text>'
+    '<text class="label" transform="matrix(0,-1,1,0,0,0)" x="$y_label_x" y="$y_label_y" '
+    'text-anchor="middle">$y_label</text>'
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _color_ramp(start: str, end: str, levels: int = 256) -> Optional[bytes]:
+    """
+    Compute a linear RGB ramp between two hex colors.
+    
+    Matches ``d3.interpolateRgb(start, end)`` sampled at ``i / (levels - 1)``.
+    
+    Args:
+        start: Hex color at the low end of the ramp
+        end: Hex color at the high end of the ramp
+        levels: Number of colors in the ramp
+        
+    Returns:
+        ``3 * levels`` bytes of RGB triples, or None if a color is not hex
+    """
+    try:
+        low = np.array(hex_to_rgb(start), dtype=np.float64)
+        high = np.array(hex_to_rgb(end), dtype=np.float64)
+    except (AttributeError, ValueError):
+        return None
+    
+    t = np.linspace(0.0, 1.0, levels)[:, None]
+    # Round half up like d3's color formatting, not half to even
+    ramp = np.floor(low + (high - low) * t + 0.5).clip(0, 255).astype(np.uint8)
+    return ramp.tobytes()
+
+
+@functools.lru_cache(maxsize=64)
+def _legend_ramp_url(start: str, end: str) -> Optional[str]:
+    """
+    Render the value levels of the cell color table as a 255 x 1 PNG data URL.
+    
+    Args:
+        start: Hex color at the low end of the ramp
+        end: Hex color at the high end of the ramp
+        
+    Returns:
+        ``data:`` URL of the PNG, or None if a color is not hex
+    """
+    ramp = _color_ramp(start, end, 255)
+    return png_data_url(ramp, 255, 1) if ramp is not None else None
+
+
+@functools.lru_cache(maxsize=128)
+def _build_legend_svg(
+    width: int,
+    height: int,
+    margin: tuple,
+    ticks: tuple,
+    axis_labels: Optional[tuple],
+    ramp: Optional[str],
+) -> str:
+    """
+    Build the static heatmap legend markup from hashable inputs.
+    
+    Every input that affects the markup is part of the cache key, so a
+    changed configuration simply misses the cache; ``cache_clear()`` is
+    only needed to release memory.
+    
+    Args:
+        width: Width of the visualization in pixels
+        height: Height of the visualization in pixels
+        margin: Plot margins as (top, right, bottom, left)
+        ticks: Legend ticks as (fraction of the legend width, label) pairs
+        axis_labels: (x label, y label), or None for no axis labels
+        ramp: Legend ramp image URL, or None to leave it to the browser
         
-        return js_code
+    Returns:
+        SVG markup for a group in the plot area's coordinate system
+    """
+    top, right, bottom, left = margin
+    inner_width = width - left - right
+    inner_height = height - top - bottom
+    legend_width = inner_width * 0.6
+    legend_height = 20
+    legend_x = inner_width / 2 - legend_width / 2
+    legend_y = inner_height + 50
+    
+    # All tick marks are identical apart from their position, so they share
+    # one path instead of one <line> each; only the labels are separate nodes
+    tick_x = [f"{offset * legend_width + 0.5:g}" for offset, _ in ticks]
+    tick_marks = "".join(f"M{x},0V6" for x in tick_x)
+    tick_markup = "".join(
+        _LEGEND_TICK_TEMPLATE.substitute(x=x, label=html.escape(label))
+        for x, (_, label) in zip(tick_x, ticks)
+    )
+    
+    label_markup = ""
+    if axis_labels is not None:
+        label_markup = _AXIS_LABELS_TEMPLATE.substitute(
+            x_label_x=f"{inner_width / 2:g}",
+            x_label_y=f"{inner_height + top + 20:g}",
+            x_label=html.escape(axis_labels[0]),
+            y_label_x=f"{-inner_height / 2:g}",
+            y_label_y=f"{-left + 30:g}",
+            y_label=html.escape(axis_labels[1]),
+        )
+    
+    return _LEGEND_TEMPLATE.substitute(
+        legend_x=f"{legend_x:g}",
+        legend_y=f"{legend_y:g}",
+        legend_width=f"{legend_width:g}",
+        legend_height=legend_height,
+        href=f' href="{ramp}"' if ramp else "",
+        axis_y=f"{legend_y + legend_height:g}",
+        domain_end=f"{legend_width + 0.5:g}",
+        tick_marks=tick_marks,
+        ticks=tick_markup,
+        title_x=f"{legend_x + legend_width / 2:g}",
+        title_y=f"{legend_y - 5:g}",
+        axis_labels=label_markup,
+    )
 
 
 class HeatmapVis(D3Visualization):
@@ -591,6 +570,18 @@ class HeatmapVis(D3Visualization):
     This class implements heatmap visualizations using D3.js.
     """
     
+    # Backends for drawing the cells, selected by the "renderer" option
+    RENDERERS = ("canvas", "webgl")
+    
+    # Approximate number of ticks on the color legend axis
+    LEGEND_TICKS = 5
+    
+    # Cell code reserved for missing (NaN) values; values use 0 to 254
+    MISSING_CODE = 255
+    
+    # Space around the plot area for the axes and legend, in pixels
+    MARGIN = {"top": 50, "right": 50, "bottom": 100, "left": 100}
+    
     def __init__(
         self,
         data: Any,
@@ -620,266 +611,177 @@ class HeatmapVis(D3Visualization):
         
         super().__init__(data, config, width, height, container_id, title)
     
+    def preprocess_data(self) -> Dict[str, Any]:
+        """
+        Preprocess the data for the heatmap visualization.
+        
+        Adds the value range and median so the browser does not have to
+        scan every cell before drawing, and quantizes the values to 8-bit
+        codes into a 256-entry color table, itself included as base64 RGB
+        under 'lut' when it can be computed here. Values span codes 0-254;
+        missing (NaN) cells get ``MISSING_CODE`` and are left transparent,
+        and are ignored by the range and median. The exact values are only kept
+        when tooltips (``config.interactive``) need them, and are then sent
+        as base64-encoded little-endian float32 rather than JSON numbers.
+        
+        The static legend and axis label markup is rendered here as well
+        (see ``_render_static_svg``); the ``legend_ticks`` additional option
+        sets the approximate number of legend ticks (5 by default).
+        
+        Returns:
+            Preprocessed heatmap data with 'min', 'max', 'median',
+            'legend_svg' and base64-encoded uint8 'codes' keys
+        """
+        heatmap = DataProcessor.prepare_for_heatmap(self.data)
+        
+        arr = np.asarray(heatmap["values"], dtype=np.float32)
+        missing = np.isnan(arr)
+        present = arr[~missing]
+        if present.size:
+            heatmap["min"] = float(present.min())
+            heatmap["max"] = float(present.max())
+            heatmap["median"] = float(np.median(present))
+        else:
+            heatmap["min"] = heatmap["max"] = heatmap["median"] = 0.0
+        
+        span = heatmap["max"] - heatmap["min"]
+        codes = np.zeros(arr.shape, dtype=np.uint8)
+        if span > 0:
+            scaled = np.round((present - heatmap["min"]) * ((self.MISSING_CODE - 1) / span))
+            codes[~missing] = scaled.astype(np.uint8)
+        codes[missing] = self.MISSING_CODE
+        heatmap["codes"] = base64.b64encode(codes.tobytes()).decode("ascii")
+        
+        lut = self._color_table()
+        if lut is not None:
+            heatmap["lut"] = base64.b64encode(lut).decode("ascii")
+        
+        # Legend ticks as (fraction of the legend width, label), with labels
+        # following d3.format(".1f") conventions, including its minus sign
+        tick_count = self.config.additional_options.get("legend_ticks", self.LEGEND_TICKS)
+        ticks = [
+            (
+                (t - heatmap["min"]) / span if span > 0 else 0.5,
+                f"{t:.1f}".replace("-", "\u2212") if round(t, 1) != 0 else "0.0",
+            )
+            for t in linear_ticks(heatmap["min"], heatmap["max"], tick_count)
+        ]
+        heatmap["legend_svg"] = self._render_static_svg(ticks)
+        
+        if self.config.interactive:
+            heatmap["values"] = base64.b64encode(arr.astype("<f4").tobytes()).decode("ascii")
+        else:
+            del heatmap["values"]
+        
+        return heatmap
+    
+    def get_library_includes(self) -> List[str]:
+        """
+        Get the JavaScript libraries required for this visualization.
+        
+        d3-scale-chromatic is only loaded when the browser has to build the
+        color table itself (see ``_color_table``).
+        
+        Returns:
+            List of library names to include
+        """
+        libraries = super().get_library_includes()
+        if self._color_table() is not None:
+            libraries.remove("d3-scale-chromatic")
+        return libraries
+    
+    def _color_table(self) -> Optional[bytes]:
+        """
+        Compute the 256-entry cell color table in Python, if possible.
+        
+        The first 255 entries ramp across the value range; the last one is
+        ``MISSING_CODE``, which the browser paints transparent.
+        
+        The palette is fixed when the visualization is generated, so for a
+        list of hex colors the table is evaluated here and the browser
+        skips building a d3 color scale altogether. Other palettes return
+        None and the browser builds the table from d3's color schemes.
+        
+        Returns:
+            768 bytes of RGB triples, or None
+        """
+        palette = self.config.color_palette
+        if isinstance(palette, str) or not palette:
+            return None
+        ramp = _color_ramp(palette[0], palette[-1], self.MISSING_CODE)
+        return ramp + bytes(3) if ramp is not None else None
+    
+    def _legend_ramp(self) -> Optional[str]:
+        """
+        Render the color legend ramp as a PNG data URL.
+        
+        A color palette list is drawn as a linear RGB interpolation from its
+        first to its last color, the same as ``d3.interpolateRgb`` in the
+        browser, sampled at the 255 value levels of the cell color table.
+        Named d3 color schemes and non-hex colors return None and are drawn
+        by the browser instead. Ramps are cached per pair of colors.
+        
+        Returns:
+            ``data:`` URL of a 255 x 1 PNG, or None
+        """
+        palette = self.config.color_palette
+        if isinstance(palette, str) or not palette:
+            return None
+        return _legend_ramp_url(palette[0], palette[-1])
+    
+    def _render_static_svg(self, ticks: List[Any]) -> str:
+        """
+        Render the static parts of the heatmap as SVG markup.
+        
+        The color legend (with the ramp image from ``_legend_ramp``, or an
+        empty one the browser fills in from its color table), the legend
+        axis and title and the axis labels only depend on the size,
+        configuration and value range, so they are built here as one string
+        that the browser inserts in a single step instead of creating each
+        node with script. The markup is memoized on exactly those inputs
+        (see ``_build_legend_svg``), so repeated renders of the same chart
+        return it from memory.
+        
+        Args:
+            ticks: Legend ticks as (fraction of the legend width, label)
+            
+        Returns:
+            SVG markup for a group in the plot area's coordinate system
+        """
+        axis_labels = self.config.axis_labels
+        if axis_labels is not None:
+            axis_labels = (axis_labels.get("x") or "X-Axis", axis_labels.get("y") or "Y-Axis")
+        
+        return _build_legend_svg(
+            self.width,
+            self.height,
+            tuple(self.MARGIN[side] for side in ("top", "right", "bottom", "left")),
+            tuple(map(tuple, ticks)),
+            axis_labels,
+            self._legend_ramp(),
+        )
+    
     def generate_js_code(self) -> str:
         """
         Generate JavaScript code for the heatmap visualization.
         
+        Cells are painted into a 2D canvas by default. Setting the
+        ``renderer`` additional option to ``"webgl"`` draws them as
+        instanced WebGL quads instead, falling back to the 2D canvas when
+        WebGL is not available in the browser. With the ``offscreen``
+        additional option set, the 2D canvas is transferred to a Web Worker
+        that paints the cells off the main thread, where the browser
+        supports OffscreenCanvas.
+        
         Returns:
             JavaScript code as a string
         """
-        # Define the D3.js code for heatmap visualization
-        js_code = f"""
-        // Create a heatmap visualization
-        (function() {{
-            const width = {self.width};
-            const height = {self.height};
-            const container = d3.select("#{self.container_id}");
-            
-            // Clear previous content
-            container.html("");
-            
-            // Add title if specified
-            if ("{self.title}") {{
-                container.append("h3")
-                    .attr("class", "vis-title")
-                    .style("text-align", "center")
-                    .style("margin-bottom", "20px")
-                    .style("font-family", config.font_family)
-                    .style("font-size", config.title_font_size + "px")
-                    .text("{self.title}");
-            }}
-            
-            // Extract data
-            const x_labels = data.x_labels;
-            const y_labels = data.y_labels;
-            const values = data.values;
-            
-            // Define margins
-            const margin = {{top: 50, right: 50, bottom: 100, left: 100}};
-            const innerWidth = width - margin.left - margin.right;
-            const innerHeight = height - margin.top - margin.bottom;
-            
-            // Create SVG element
-            const svg = container.append("svg")
-                .attr("width", width)
-                .attr("height", height)
-                .attr("viewBox", [0, 0, width, height])
-                .attr("style", "max-width: 100%; height: auto;");
-            
-            // Create a group for the heatmap
-            const g = svg.append("g")
-                .attr("transform", `translate(${{margin.left}},${{margin.top}})`);
-            
-            // Calculate cell size
-            const cellWidth = innerWidth / x_labels.length;
-            const cellHeight = innerHeight / y_labels.length;
-            
-            // Find min and max values for color scale
-            let minValue = Infinity;
-            let maxValue = -Infinity;
-            
-            for (const row of values) {{
-                for (const value of row) {{
-                    minValue = Math.min(minValue, value);
-                    maxValue = Math.max(maxValue, value);
-                }}
-            }}
-            
-            // Define color scale
-            let colorScale;
-            if (config.color_palette === "sequential") {{
-                colorScale = d3.scaleSequential()
-                    .domain([minValue, maxValue])
-                    .interpolator(d3.interpolateBlues);
-            }} else if (config.color_palette === "diverging") {{
-                const middle = (minValue + maxValue) / 2;
-                colorScale = d3.scaleDiverging()
-                    .domain([minValue, middle, maxValue])
-                    .interpolator(d3.interpolateRdBu);
-            }} else {{
-                // Default to custom color palette
-                colorScale = d3.scaleSequential()
-                    .domain([minValue, maxValue])
-                    .interpolator(d3.interpolateRgb(
-                        config.color_palette[0] || "#f7fbff", 
-                        config.color_palette[config.color_palette.length - 1] || "#08306b"
-                    ));
-            }}
-            
-            // Create x scale
-            const xScale = d3.scaleBand()
-                .domain(x_labels)
-                .range([0, innerWidth])
-                .padding(0.05);
-            
-            // Create y scale
-            const yScale = d3.scaleBand()
-                .domain(y_labels)
-                .range([0, innerHeight])
-                .padding(0.05);
-            
-            // Create x axis
-            const xAxis = g.append("g")
-                .attr("transform", `translate(0,${{innerHeight}})`)
-                .call(d3.axisBottom(xScale))
-                .call(g => g.select(".domain").remove());
-            
-            // Rotate x axis labels if needed
-            if (x_labels.length > 10) {{
-                xAxis.selectAll("text")
-                    .attr("transform", "rotate(-45)")
-                    .attr("text-anchor", "end")
-                    .attr("dx", "-.8em")
-                    .attr("dy", ".15em");
-            }}
-            
-            // Create y axis
-            g.append("g")
-                .call(d3.axisLeft(yScale))
-                .call(g => g.select(".domain").remove());
-            
-            // Create cells
-            const cells = g.append("g")
-                .selectAll("rect")
-                .data(values.flatMap((row, i) => 
-                    row.map((value, j) => ({{
-                        value,
-                        row: i,
-                        col: j,
-                        x: xScale(x_labels[j]),
-                        y: yScale(y_labels[i]),
-                        width: xScale.bandwidth(),
-                        height: yScale.bandwidth()
-                    }}))
-                ))
-                .join("rect")
-                .attr("x", d => d.x)
-                .attr("y", d => d.y)
-                .attr("width", d => d.width)
-                .attr("height", d => d.height)
-                .attr("fill", d => colorScale(d.value))
-                .attr("stroke", "#fff")
-                .attr("stroke-width", 0.5);
-            
-            // Add tooltips
-            if (config.interactive) {{
-                cells.append("title")
-                    .text(d => `${{y_labels[d.row]}}, ${{x_labels[d.col]}}: ${{d.value}}`);
-                
-                // Or use mouseover for more complex tooltips
-                const tooltip = container.append("div")
-                    .attr("class", "tooltip")
-                    .style("position", "absolute")
-                    .style("visibility", "hidden")
-                    .style("background-color", "white")
-                    .style("border", "1px solid #ddd")
-                    .style("padding", "5px")
-                    .style("border-radius", "5px")
-                    .style("pointer-events", "none");
-                
-                cells
-                    .on("mouseover", (event, d) => {{
-                        tooltip
-                            .style("visibility", "visible")
-                            .html(`<strong>${{y_labels[d.row]}}, ${{x_labels[d.col]}}</strong><br/>Value: ${{d.value.toFixed(2)}}`);
-                    }})
-                    .on("mousemove", (event) => {{
-                        tooltip
-                            .style("top", (event.pageY - 10) + "px")
-                            .style("left", (event.pageX + 10) + "px");
-                    }})
-                    .on("mouseout", () => {{
-                        tooltip.style("visibility", "hidden");
-                    }});
-            }}
-            
-            // Add color legend
-            const legendWidth = innerWidth * 0.6;
-            const legendHeight = 20;
-            
-            const legendX = innerWidth / 2 - legendWidth / 2;
-            const legendY = innerHeight + 50;
-            
-            // Create gradient for legend
-            const defs = svg.append("defs");
-            
-            const gradient = defs.append("linearGradient")
-                .attr("id", "color-gradient")
-                .attr("x1", "0%")
-                .attr("y1", "0%")
-                .attr("x2", "100%")
-                .attr("y2", "0%");
-            
-            if (config.color_palette === "diverging") {{
-                gradient.append("stop")
-                    .attr("offset", "0%")
-                    .attr("stop-color", colorScale(minValue));
-                
-                gradient.append("stop")
-                    .attr("offset", "50%")
-                    .attr("stop-color", colorScale((minValue + maxValue) / 2));
-                
-                gradient.append("stop")
-                    .attr("offset", "100%")
-                    .attr("stop-color", colorScale(maxValue));
-            }} else {{
-                gradient.append("stop")
-                    .attr("offset", "0%")
-                    .attr("stop-color", colorScale(minValue));
-                
-                gradient.append("stop")
-                    .attr("offset", "100%")
-                    .attr("stop-color", colorScale(maxValue));
-            }}
-            
-            // Add rectangle with gradient
-            g.append("rect")
-                .attr("x", legendX)
-                .attr("y", legendY)
-                .attr("width", legendWidth)
-                .attr("height", legendHeight)
-                .style("fill", "url(#color-gradient)");
-            
-            // Add legend axis
-            const legendScale = d3.scaleLinear()
-                .domain([minValue, maxValue])
-                .range([0, legendWidth]);
-            
-            g.append("g")
-                .attr("transform", `translate(${{legendX}},${{legendY + legendHeight}})`)
-                .call(d3.axisBottom(legendScale).ticks(5).tickFormat(d3.format(".1f")));
-            
-            // Add legend title
-            g.append("text")
-                .attr("x", legendX + legendWidth / 2)
-                .attr("y", legendY - 5)
-                .attr("text-anchor", "middle")
-                .attr("font-family", config.font_family)
-                .attr("font-size", config.font_size + "px")
-                .text("Value");
-            
-            // Add axis labels if provided
-            if (config.axis_labels) {{
-                // X-axis label
-                g.append("text")
-                    .attr("x", innerWidth / 2)
-                    .attr("y", innerHeight + margin.top + 20)
-                    .attr("text-anchor", "middle")
-                    .attr("font-family", config.font_family)
-                    .attr("font-size", config.font_size + "px")
-                    .text(config.axis_labels.x || "X-Axis");
-                
-                // Y-axis label
-                g.append("text")
-                    .attr("transform", "rotate(-90)")
-                    .attr("x", -innerHeight / 2)
-                    .attr("y", -margin.left + 30)
-                    .attr("text-anchor", "middle")
-                    .attr("font-family", config.font_family)
-                    .attr("font-size", config.font_size + "px")
-                    .text(config.axis_labels.y || "Y-Axis");
-            }}
-        }})();
-        """
-        
-        return js_code 
\ No newline at end of file
+        renderer = self.config.additional_options.get("renderer", "canvas")
+        if renderer not in self.RENDERERS:
+            raise ValueError(f"Unsupported heatmap renderer: {renderer}")
+        return self._render_call(
+            "renderHeatmap",
+            margin=self.MARGIN,
+            renderer=renderer,
+            offscreen=bool(self.config.additional_options.get("offscreen", False)),
+        ) 
\ No newline at end of file
@@ -4,15 +4,175 @@ Three.js visualization integration for LlamaVis.
 This module implements 3D visualizations using Three.js, providing
 capabilities for 3D scatter plots, surfaces, and network visualizations.
 """
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import base64
+import copy
+import functools
+import hashlib
 import json
+import string
 import uuid
 import math
 
+import numpy as np
+import pandas as pd
+
 from ..core.visualization import Visualization
 from ..core.config import VisualizationConfig, ChartType
 from ..core.data import DataProcessor
-from ..core.utils import generate_unique_id, safe_json_value
+from ..core.utils import generate_unique_id, safe_json_value, js_string
+
+
+def _scale_heights_numpy(heights, out, top):
+    """
+    NumPy implementation of ``_surface_numba.scale_heights`` used when numba is unavailable.
+    """
+    if heights.size == 0:
+        return
+    lo = heights.min()
+    hi = heights.max()
+    scale = top / (hi - lo) if hi > lo else 0.0
+    np.subtract(heights, lo, out=out)
+    out *= scale
+
+
+def _grid_repulsion(pos: np.ndarray, cutoff: float, max_pairs: int = 1 << 20) -> np.ndarray:
+    """
+    Sum ``diff / dist^3`` over every other node closer than ``cutoff``, per node.
+    
+    Nodes are bucketed into a grid of cells as wide as the cutoff, so each
+    node is only compared with the nodes in the 27 cells around its own.
+    Candidate pairs are generated in batches of about ``max_pairs`` to keep
+    memory bounded when many nodes are close together.
+    
+    Args:
+        pos: Node positions, shape (N, 3)
+        cutoff: Distance beyond which nodes do not repel
+        max_pairs: Approximate number of candidate pairs per batch
+        
+    Returns:
+        Float32 array of shape (N, 3)
+    """
+    n = len(pos)
+    force = np.zeros_like(pos)
+    if n < 2:
+        return force
+    
+    # Cell coordinates start at 1 so that every neighbouring cell packs into
+    # a distinct non-negative key
+    cells = np.floor(pos / cutoff).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    span = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * span[1] + cells[:, 1]) * span[2] + cells[:, 2]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    rows = np.arange(n)
+    
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            for oz in (-1, 0, 1):
+                target = keys + (ox * span[1] + oy) * span[2] + oz
+                start = np.searchsorted(sorted_keys, target, "left")
+                counts = np.searchsorted(sorted_keys, target, "right") - start
+                ends = np.cumsum(counts)
+                
+                begin = 0
+                while begin < n:
+                    done = ends[begin - 1] if begin else 0
+                    end = min(max(int(np.searchsorted(ends, done + max_pairs, "right")), begin + 1), n)
+                    batch = counts[begin:end]
+                    total = int(batch.sum())
+                    if total:
+                        i = np.repeat(rows[begin:end], batch)
+                        first = np.repeat(start[begin:end] - (np.cumsum(batch) - batch), batch)
+                        j = order[first + np.arange(total)]
+                        diff = pos[i] - pos[j]
+                        dist2 = np.einsum("ij,ij->i", diff, diff)
+                        near = (dist2 > 0) & (dist2 < cutoff * cutoff)
+                        weight = 1.0 / (dist2[near] * np.sqrt(dist2[near]))
+                        for axis in range(3):
+                            force[:, axis] += np.bincount(i[near], diff[near, axis] * weight, minlength=n)
+                    begin = end
+    
+    return force
+
+
+def _feed_hash(hasher: Any, value: Any) -> None:
+    """
+    Feed a canonical encoding of a value's content into a hashlib hasher.
+    
+    Arrays and pandas objects contribute their full contents, containers
+    are walked element by element, and anything else contributes its
+    ``repr``. Each part is tagged with its type so that, for example, a
+    list and a tuple with the same items hash differently.
+    
+    Args:
+        hasher: hashlib hash object to update
+        value: Value to encode
+    """
+    hasher.update(type(value).__name__.encode("utf-8"))
+    if isinstance(value, np.ndarray):
+        hasher.update(f"{value.shape}{value.dtype}".encode("utf-8"))
+        if value.dtype.hasobject:
+            _feed_hash(hasher, value.tolist())
+        else:
+            hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        _feed_hash(hasher, [str(c) for c in getattr(value, "columns", ())])
+        hasher.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b"%d" % len(value))
+        for k, v in value.items():
+            _feed_hash(hasher, k)
+            _feed_hash(hasher, v)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"%d" % len(value))
+        for item in value:
+            _feed_hash(hasher, item)
+    else:
+        text = repr(value).encode("utf-8")
+        hasher.update(b"%d:" % len(text))
+        hasher.update(text)
+
+
+def _memoized(key: Callable[[Any], Any]) -> Callable:
+    """
+    Cache a method's result on the instance for as long as ``key(self)`` is unchanged.
+    
+    Hits return a shallow copy of the cached result, so callers may add or
+    replace its top-level entries without affecting later calls.
+    
+    Args:
+        key: Function computing the cache key from the instance
+        
+    Returns:
+        Method decorator
+    """
+    def decorator(method: Callable) -> Callable:
+        attr = f"_{method.__name__}_cache"
+        
+        @functools.wraps(method)
+        def wrapper(self):
+            current = key(self)
+            cached = self.__dict__.get(attr)
+            if cached is None or cached[0] != current:
+                cached = (current, method(self))
+                self.__dict__[attr] = cached
+            return copy.copy(cached[1])
+        
+        return wrapper
+    
+    return decorator
+
+
+def _data_key(vis: "ThreeJSVisualization") -> Any:
+    """Cache key for preprocessed data: the data's content and the configuration."""
+    return vis._data_fingerprint(), json.dumps(vis.config.to_dict(), default=str)
+
+
+def _template_key(vis: "ThreeJSVisualization") -> Any:
+    """Cache key for generated JavaScript, which only inlines these attributes."""
+    return vis.title, vis.container_id, vis.width, vis.height
 
 
 class ThreeJSVisualization(Visualization):
@@ -66,8 +226,30 @@ class ThreeJSVisualization(Visualization):
         if self.config.chart_type == ChartType.NETWORK:
             libs.append("three-css2d")
         
+        # Shared scene setup (see static/llamavis-three.js), inlined once per page
+        libs.append("llamavis-three")
+        
         return libs
     
+    def _data_fingerprint(self) -> Any:
+        """
+        Get a fingerprint of the visualization data's current content.
+        
+        Used to reuse preprocessed data across renders of unchanged data
+        (for example when a notebook cell displays the same figure again).
+        The data's full content is hashed (see ``_feed_hash``), including
+        arrays nested in lists and dicts; functions are compared by identity.
+        
+        Returns:
+            Hashable value that changes when the data does
+        """
+        if callable(self.data):
+            return self.data
+        hasher = hashlib.blake2b(digest_size=16)
+        _feed_hash(hasher, self.data)
+        return hasher.hexdigest()
+    
+    @_memoized(_data_key)
     def preprocess_data(self) -> Dict[str, Any]:
         """
         Preprocess the data for Three.js visualization.
@@ -79,10 +261,121 @@ class ThreeJSVisualization(Visualization):
         if self.config.chart_type == ChartType.NETWORK:
             return DataProcessor.prepare_for_network(self.data)
         
-        # For standard 3D scatter or surface plots, just return as JSON
+        # For standard 3D scatter or surface plots, pass the data through;
+        # NumPy arrays are serialized natively when the page is rendered
         return DataProcessor.to_json(self.data)
 
 
+# Page JavaScript for the Three.js charts, compiled once at import. Only the
+# escaped title and container id and the chart size are substituted per
+# render; data and config reach the script as its `data` and `config`
+# variables. Literal dollar signs (JS template strings) are written as $$.
+_SCATTER3D_TEMPLATE = string.Template("""
+        // Create a 3D scatter plot visualization
+        (function() {
+            const { scene, controls, start } = LlamaVis.createThreeScene(${container_id}, config, {
+                width: ${width},
+                height: ${height},
+                title: ${title},
+                camera: [2, 2, 5]
+            });
+            
+            // Create axis helpers
+            if (config.show_axes) {
+                const axesHelper = new THREE.AxesHelper(5);
+                scene.add(axesHelper);
+                
+                // Add axis labels if specified
+                if (config.axis_labels) {
+                    // Create labels (simplified - in a real implementation, these would be
+                    // proper CSS2D labels with proper positioning)
+                    const axisLabels = [
+                        { position: new THREE.Vector3(5.2, 0, 0), text: config.axis_labels.x || "X" },
+                        { position: new THREE.Vector3(0, 5.2, 0), text: config.axis_labels.y || "Y" },
+                        { position: new THREE.Vector3(0, 0, 5.2), text: config.axis_labels.z || "Z" }
+                    ];
+                    
+                    // In a real implementation, this would use CSS2DRenderer for proper labels
+                }
+            }
+            
+            // Create grid if specified
+            if (config.show_grid) {
+                const gridHelper = new THREE.GridHelper(10, 10);
+                gridHelper.rotation.x = Math.PI / 2;
+                scene.add(gridHelper);
+            }
+            
+            // Decode the packed point buffers straight into typed arrays
+            const positions = new Float32Array(LlamaVis.decodeBuffer(data.positions));
+            const sizes = new Float32Array(LlamaVis.decodeBuffer(data.sizes));
+            const groupIds = new Uint16Array(LlamaVis.decodeBuffer(data.group_ids));
+            
+            // One point cloud for all groups: the vertex shader looks each
+            // point's color up in the palette by its group id and sizes it
+            // by its size attribute. The "default" group always takes the
+            // first palette color.
+            const geometry = new THREE.BufferGeometry();
+            geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
+            geometry.setAttribute('size', new THREE.BufferAttribute(sizes, 1));
+            geometry.setAttribute('groupId', new THREE.BufferAttribute(groupIds, 1));
+            
+            // Palette colors are used as given (no sRGB decoding), since the
+            // fragment shader writes them out unconverted
+            const palette = config.color_palette.map(color => new THREE.Color().setStyle(color, THREE.LinearSRGBColorSpace));
+            
+            const material = new THREE.ShaderMaterial({
+                uniforms: {
+                    uPalette: { value: palette },
+                    uDefaultGroup: { value: data.groups.indexOf("default") },
+                    // Sizes arrive scaled by 5: a size 1 point is 0.1 scene units across
+                    uPointSize: { value: 0.02 },
+                    uScale: { value: ${height} / 2 },
+                    uOpacity: { value: 0.8 }
+                },
+                vertexShader: `
+                    attribute float groupId;
+                    attribute float size;
+                    uniform vec3 uPalette[$${palette.length}];
+                    uniform float uDefaultGroup;
+                    uniform float uPointSize;
+                    uniform float uScale;
+                    varying vec3 vColor;
+                    void main() {
+                        int slot = groupId == uDefaultGroup ? 0 : int(mod(groupId, $${palette.length}.0));
+                        vColor = uPalette[slot];
+                        vec4 mvPosition = modelViewMatrix * vec4(position, 1.0);
+                        gl_PointSize = size * uPointSize * uScale / -mvPosition.z;
+                        gl_Position = projectionMatrix * mvPosition;
+                    }
+                `,
+                fragmentShader: `
+                    uniform float uOpacity;
+                    varying vec3 vColor;
+                    void main() {
+                        // Round points: drop fragments outside the inscribed circle
+                        vec2 offset = gl_PointCoord - 0.5;
+                        if (dot(offset, offset) > 0.25) discard;
+                        gl_FragColor = vec4(vColor, uOpacity);
+                    }
+                `,
+                transparent: true
+            });
+            
+            const pointCloud = new THREE.Points(geometry, material);
+            scene.add(pointCloud);
+            
+            // Start animation loop; the scene only changes through the controls
+            start(() => {
+                if (config.animation) {
+                    controls.update();
+                }
+                return false;
+            });
+        })();
+        """)
+
+
 class Scatter3D(ThreeJSVisualization):
     """
     3D scatter plot visualization using Three.js.
@@ -91,6 +384,12 @@ class Scatter3D(ThreeJSVisualization):
     data using Three.js.
     """
     
+    # Point count above which points are aggregated into voxels
+    MAX_POINTS = 500_000
+    
+    # Voxels per axis when aggregating
+    AGGREGATE_BINS = 64
+    
     def __init__(
         self,
         data: Any,
@@ -120,337 +419,211 @@ class Scatter3D(ThreeJSVisualization):
         
         super().__init__(data, config, width, height, container_id, title)
     
-    def generate_js_code(self) -> str:
+    @_memoized(_data_key)
+    def preprocess_data(self) -> Dict[str, Any]:
         """
-        Generate JavaScript code for the 3D scatter plot visualization.
+        Preprocess the points for the 3D scatter plot.
+        
+        Point coordinates travel as base64-encoded little-endian float32
+        buffers rather than JSON objects: 'positions' holds x, y, z per point,
+        'sizes' one value per point and 'group_ids' the uint16 index of each
+        point's group into 'groups'.
+        
+        Positions are already mapped into the scene's [-4, 4] cube and sizes
+        scaled up for visibility, so the browser uploads the buffers as is.
+        
+        Clouds of more than ``max_points`` points (an additional option,
+        500000 by default) are aggregated first (see ``aggregate_points``),
+        which bounds the work in the browser regardless of the point count.
         
         Returns:
-            JavaScript code as a string
-        """
-        # Define the Three.js code for 3D scatter plot visualization
-        js_code = f"""
-        // Create a 3D scatter plot visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
-            
-            // Clear previous content
-            container.innerHTML = "";
-            
-            // Add title if specified
-            if ("{self.title}") {{
-                const titleElement = document.createElement("h3");
-                titleElement.className = "vis-title";
-                titleElement.style.textAlign = "center";
-                titleElement.style.marginBottom = "20px";
-                titleElement.style.fontFamily = config.font_family;
-                titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
-                container.appendChild(titleElement);
-            }}
-            
-            // Create scene, camera, and renderer
-            const scene = new THREE.Scene();
-            scene.background = new THREE.Color(config.background_color);
-            
-            const camera = new THREE.PerspectiveCamera(75, {self.width} / {self.height}, 0.1, 1000);
-            camera.position.z = 5;
-            camera.position.y = 2;
-            camera.position.x = 2;
-            
-            const renderer = new THREE.WebGLRenderer({{ antialias: true }});
-            renderer.setSize({self.width}, {self.height});
-            container.appendChild(renderer.domElement);
-            
-            // Create orbit controls for interaction
-            const controls = new THREE.OrbitControls(camera, renderer.domElement);
-            controls.enableDamping = true;
-            controls.dampingFactor = 0.25;
-            controls.enableZoom = true;
-            
-            // Create axis helpers
-            if (config.show_axes) {{
-                const axesHelper = new THREE.AxesHelper(5);
-                scene.add(axesHelper);
-                
-                // Add axis labels if specified
-                if (config.axis_labels) {{
-                    // Create labels (simplified - in a real implementation, these would be
-                    // proper CSS2D labels with proper positioning)
-                    const axisLabels = [
-                        {{ position: new THREE.Vector3(5.2, 0, 0), text: config.axis_labels.x || "X" }},
-                        {{ position: new THREE.Vector3(0, 5.2, 0), text: config.axis_labels.y || "Y" }},
-                        {{ position: new THREE.Vector3(0, 0, 5.2), text: config.axis_labels.z || "Z" }}
-                    ];
-                    
-                    // In a real implementation, this would use CSS2DRenderer for proper labels
-                }}
-            }}
-            
-            // Create grid if specified
-            if (config.show_grid) {{
-                const gridHelper = new THREE.GridHelper(10, 10);
-                gridHelper.rotation.x = Math.PI / 2;
-                scene.add(gridHelper);
-            }}
-            
-            // Process data points
-            const points = data.map(point => ({{
-                x: point.x || 0,
-                y: point.y || 0,
-                z: point.z || 0,
-                color: point.color,
-                size: point.size || 1,
-                group: point.group,
-                label: point.label
-            }}));
-            
-            // Determine min/max for scaling
-            let xMin = Infinity, xMax = -Infinity;
-            let yMin = Infinity, yMax = -Infinity;
-            let zMin = Infinity, zMax = -Infinity;
-            
-            points.forEach(point => {{
-                xMin = Math.min(xMin, point.x);
-                xMax = Math.max(xMax, point.x);
-                yMin = Math.min(yMin, point.y);
-                yMax = Math.max(yMax, point.y);
-                zMin = Math.min(zMin, point.z);
-                zMax = Math.max(zMax, point.z);
-            }});
-            
-            // Scale function to map data coordinates to scene coordinates
-            const scale = (value, min, max, targetMin = -4, targetMax = 4) => {{
-                if (min === max) return (targetMin + targetMax) / 2;
-                return targetMin + (value - min) * (targetMax - targetMin) / (max - min);
-            }};
-            
-            // Group points by group for color assignment
-            const groups = new Map();
-            points.forEach(point => {{
-                const group = point.group || "default";
-                if (!groups.has(group)) {{
-                    groups.set(group, []);
-                }}
-                groups.get(group).push(point);
-            }});
-            
-            // Create geometries and materials for each group
-            groups.forEach((groupPoints, groupName) => {{
-                const positions = new Float32Array(groupPoints.length * 3);
-                const sizes = new Float32Array(groupPoints.length);
-                
-                groupPoints.forEach((point, i) => {{
-                    positions[i * 3] = scale(point.x, xMin, xMax);
-                    positions[i * 3 + 1] = scale(point.y, yMin, yMax);
-                    positions[i * 3 + 2] = scale(point.z, zMin, zMax);
-                    sizes[i] = point.size * 5; // Scale up for visibility
-                }});
-                
-                const geometry = new THREE.BufferGeometry();
-                geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
-                geometry.setAttribute('size', new THREE.BufferAttribute(sizes, 1));
-                
-                // Determine color for this group
-                let color;
-                if (groupName === "default") {{
-                    color = config.color_palette[0];
-                }} else {{
-                    const groupIndex = [...groups.keys()].indexOf(groupName);
-                    color = config.color_palette[groupIndex % config.color_palette.length];
-                }}
-                
-                // Create material
-                const material = new THREE.PointsMaterial({{
-                    color: color,
-                    size: 0.1,
-                    sizeAttenuation: true,
-                    transparent: true,
-                    opacity: 0.8
-                }});
-                
-                // Create point cloud
-                const pointCloud = new THREE.Points(geometry, material);
-                scene.add(pointCloud);
-            }});
-            
-            // Animation loop
-            function animate() {{
-                requestAnimationFrame(animate);
-                
-                // Update controls
-                if (config.animation) {{
-                    controls.update();
-                }}
-                
-                // Render scene
-                renderer.render(scene, camera);
-            }}
-            
-            // Handle window resize
-            if (config.responsive) {{
-                window.addEventListener('resize', () => {{
-                    const width = container.clientWidth;
-                    camera.aspect = width / {self.height};
-                    camera.updateProjectionMatrix();
-                    renderer.setSize(width, {self.height});
-                }});
-            }}
-            
-            // Start animation loop
-            animate();
-        }})();
+            Preprocessed point buffers and group names
         """
+        df = pd.DataFrame(self.data)
+        n = len(df)
         
-        return js_code
-
-
-class Network3D(ThreeJSVisualization):
-    """
-    3D network graph visualization using Three.js.
-    
-    This class implements 3D network/graph visualizations using Three.js.
-    """
+        def column(name: str, default: Any) -> pd.Series:
+            if name not in df:
+                return pd.Series(default, index=df.index)
+            return df[name].fillna(default)
+        
+        # Groups keep their order of first appearance, which sets their colors
+        codes, groups = pd.factorize(column("group", "default"), sort=False)
+        
+        positions = np.column_stack(
+            [column(axis, 0).to_numpy(dtype=np.float32) for axis in ("x", "y", "z")]
+        ).reshape(n, 3)
+        sizes = column("size", 1).to_numpy(dtype=np.float32)
+        
+        # Map each axis onto [-4, 4]; a constant axis sits at the center
+        if n:
+            mins = positions.min(axis=0)
+            spans = positions.max(axis=0) - mins
+            positions = (positions - mins) / np.where(spans == 0, 1, spans) * 8 - 4
+            positions[:, spans == 0] = 0
+        
+        if n > self.config.additional_options.get("max_points", self.MAX_POINTS):
+            positions, sizes, codes = self.aggregate_points(positions, codes, len(groups))
+        sizes = sizes * 5
+        
+        return {
+            "count": len(codes),
+            "positions": base64.b64encode(positions.astype("<f4").tobytes()).decode("ascii"),
+            "sizes": base64.b64encode(sizes.astype("<f4").tobytes()).decode("ascii"),
+            "group_ids": base64.b64encode(codes.astype("<u2").tobytes()).decode("ascii"),
+            "groups": [str(group) for group in groups]
+        }
     
-    def __init__(
+    def aggregate_points(
         self,
-        data: Any,
-        config: Optional[VisualizationConfig] = None,
-        width: int = 800,
-        height: int = 600,
-        container_id: Optional[str] = None,
-        title: str = "3D Network Graph"
-    ):
+        positions: np.ndarray,
+        codes: np.ndarray,
+        group_count: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Initialize a 3D network graph visualization.
+        Aggregate scaled points into one point per occupied voxel and group.
+        
+        The [-4, 4] cube is split into ``AGGREGATE_BINS`` voxels per axis.
+        Each voxel contributes one point per group present in it, placed at
+        the voxel center and sized by the cube root of its point count
+        relative to the fullest voxel, so dense regions read as larger
+        markers rather than as overdraw.
         
         Args:
-            data: Network data (nodes and links)
-            config: Visualization configuration
-            width: Width of the visualization in pixels
-            height: Height of the visualization in pixels
-            container_id: HTML ID for the container element
-            title: Title of the visualization
+            positions: Float32 array of shape (N, 3) with coordinates in [-4, 4]
+            codes: Group index of each point
+            group_count: Number of distinct groups
+            
+        Returns:
+            Tuple of (positions, sizes, group codes) for the aggregated points
         """
-        # Create default config if none provided
-        if config is None:
-            config = VisualizationConfig(chart_type=ChartType.NETWORK)
-        else:
-            # Ensure chart type is set to NETWORK
-            config.update(chart_type=ChartType.NETWORK)
+        bins = self.AGGREGATE_BINS
+        width = 8 / bins
+        cells = np.clip(((positions + 4) / width).astype(np.int64), 0, bins - 1)
+        voxels = np.ravel_multi_index(cells.T, (bins, bins, bins))
         
-        super().__init__(data, config, width, height, container_id, title)
+        keys, counts = np.unique(voxels * group_count + codes, return_counts=True)
+        voxels, codes = np.divmod(keys, group_count)
+        centers = (np.stack(np.unravel_index(voxels, (bins, bins, bins)), axis=1) + 0.5) * width - 4
+        
+        # Marker diameter (0.1 scene units per unit of size) up to the voxel width
+        sizes = 10 * width * np.cbrt(counts / counts.max())
+        
+        return centers.astype(np.float32), sizes.astype(np.float32), codes
     
+    @_memoized(_template_key)
     def generate_js_code(self) -> str:
         """
-        Generate JavaScript code for the 3D network graph visualization.
+        Generate JavaScript code for the 3D scatter plot visualization.
         
         Returns:
             JavaScript code as a string
         """
-        # Define the Three.js code for 3D network graph visualization
-        js_code = f"""
+        return _SCATTER3D_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height
+        )
+
+
+# JavaScript for Network3D (see _SCATTER3D_TEMPLATE)
+_NETWORK3D_TEMPLATE = string.Template("""
         // Create a 3D network graph visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
-            
-            // Clear previous content
-            container.innerHTML = "";
-            
-            // Add title if specified
-            if ("{self.title}") {{
-                const titleElement = document.createElement("h3");
-                titleElement.className = "vis-title";
-                titleElement.style.textAlign = "center";
-                titleElement.style.marginBottom = "20px";
-                titleElement.style.fontFamily = config.font_family;
-                titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
-                container.appendChild(titleElement);
-            }}
-            
-            // Create scene, camera, and renderer
-            const scene = new THREE.Scene();
-            scene.background = new THREE.Color(config.background_color);
-            
-            const camera = new THREE.PerspectiveCamera(75, {self.width} / {self.height}, 0.1, 1000);
-            camera.position.z = 15;
-            
-            const renderer = new THREE.WebGLRenderer({{ antialias: true }});
-            renderer.setSize({self.width}, {self.height});
-            container.appendChild(renderer.domElement);
-            
-            // Initialize CSS2D renderer for labels if needed
-            let labelRenderer;
-            if (config.show_labels) {{
-                labelRenderer = new THREE.CSS2DRenderer();
-                labelRenderer.setSize({self.width}, {self.height});
-                labelRenderer.domElement.style.position = 'absolute';
-                labelRenderer.domElement.style.top = '0';
-                labelRenderer.domElement.style.pointerEvents = 'none';
-                container.appendChild(labelRenderer.domElement);
-            }}
-            
-            // Create orbit controls for interaction
-            const controls = new THREE.OrbitControls(camera, renderer.domElement);
-            controls.enableDamping = true;
-            controls.dampingFactor = 0.25;
-            controls.enableZoom = true;
+        (function() {
+            const { scene, controls, start } = LlamaVis.createThreeScene(${container_id}, config, {
+                width: ${width},
+                height: ${height},
+                title: ${title},
+                camera: [0, 0, 15],
+                labels: config.show_labels
+            });
             
             // Extract nodes and links from data
             const nodes = data.nodes;
             const links = data.links;
             
-            // Create a map of nodes for easy lookup
-            const nodeMap = new Map();
-            nodes.forEach(node => {{
-                nodeMap.set(node.id, {{
-                    ...node,
-                    position: new THREE.Vector3(
-                        (Math.random() - 0.5) * 10,
-                        (Math.random() - 0.5) * 10,
-                        (Math.random() - 0.5) * 10
-                    )
-                }});
-            }});
-            
-            // Create materials for nodes and links
-            const nodeMaterial = new THREE.MeshLambertMaterial({{
-                color: config.color_palette[0]
-            }});
-            
-            const linkMaterial = new THREE.LineBasicMaterial({{
-                color: 0x999999,
+            // Node positions were laid out when the data was preprocessed,
+            // unless the network was too large (then the simulation below
+            // runs even without animation). They are kept as one flat array
+            // per axis, indexed by the node's position in the node list.
+            let simulate = config.animation || !data.laid_out;
+            const nodeCount = nodes.length;
+            const layout = new Float32Array(LlamaVis.decodeBuffer(data.positions));
+            const px = new Float32Array(nodeCount);
+            const py = new Float32Array(nodeCount);
+            const pz = new Float32Array(nodeCount);
+            for (let i = 0; i < nodeCount; i++) {
+                px[i] = layout[i * 3];
+                py[i] = layout[i * 3 + 1];
+                pz[i] = layout[i * 3 + 2];
+            }
+            
+            // Link endpoints as node indices
+            const nodeIndex = new Map(nodes.map((node, i) => [node.id, i]));
+            const linkSource = Uint32Array.from(links, link => nodeIndex.get(link.source));
+            const linkTarget = Uint32Array.from(links, link => nodeIndex.get(link.target));
+            
+            // Create materials for nodes and links; node colors are set per
+            // instance and multiply the (white) material color
+            const nodeMaterial = new THREE.MeshLambertMaterial();
+            
+            const linkMaterial = new THREE.LineBasicMaterial({
+                vertexColors: true,
                 opacity: 0.6,
                 transparent: true
-            }});
-            
-            // Add nodes to the scene
-            const nodeGroup = new THREE.Group();
-            scene.add(nodeGroup);
-            
-            // Add a small sphere for each node
-            for (const [id, node] of nodeMap.entries()) {{
-                const nodeRadius = node.size || 0.5;
-                const geometry = new THREE.SphereGeometry(nodeRadius, 16, 16);
-                
+            });
+            
+            // Palette index of each group, in order of first appearance
+            const groupIndex = new Map([...new Set(nodes.map(n => n.group))].map((group, i) => [group, i]));
+            
+            // Draw every node as an instance of one unit sphere, scaled to
+            // the node's radius by its instance matrix
+            const nodeMesh = new THREE.InstancedMesh(new THREE.SphereGeometry(1, 16, 16), nodeMaterial, nodeCount);
+            scene.add(nodeMesh);
+            const labelObjects = [];
+            
+            const nodeTransform = new THREE.Object3D();
+            function writeNodeMatrices() {
+                for (let i = 0; i < nodeCount; i++) {
+                    const radius = nodes[i].size || 0.5;
+                    nodeTransform.position.set(px[i], py[i], pz[i]);
+                    nodeTransform.scale.setScalar(radius);
+                    nodeTransform.updateMatrix();
+                    nodeMesh.setMatrixAt(i, nodeTransform.matrix);
+                    
+                    if (labelObjects[i]) {
+                        labelObjects[i].position.set(px[i], py[i] + radius + 0.5, pz[i]);
+                    }
+                }
+                nodeMesh.instanceMatrix.needsUpdate = true;
+            }
+            
+            // Node colors are stored as normalized bytes, a quarter of the
+            // float buffer setColorAt would allocate
+            const paletteBytes = new Uint8Array(config.color_palette.length * 3);
+            const nodeColor = new THREE.Color();
+            config.color_palette.forEach((color, k) => {
+                nodeColor.set(color);
+                paletteBytes[k * 3] = Math.round(nodeColor.r * 255);
+                paletteBytes[k * 3 + 1] = Math.round(nodeColor.g * 255);
+                paletteBytes[k * 3 + 2] = Math.round(nodeColor.b * 255);
+            });
+            const nodeColors = new Uint8Array(nodeCount * 3);
+            nodeMesh.instanceColor = new THREE.InstancedBufferAttribute(nodeColors, 3, true);
+            
+            nodes.forEach((node, i) => {
                 // Determine color for this node
-                let nodeMat = nodeMaterial.clone();
-                if (node.group) {{
-                    const groupIndex = [...new Set(nodes.map(n => n.group))].indexOf(node.group);
-                    nodeMat.color.set(config.color_palette[groupIndex % config.color_palette.length]);
-                }}
-                
-                const mesh = new THREE.Mesh(geometry, nodeMat);
-                mesh.position.copy(node.position);
-                mesh.userData = {{ id, ...node }};
-                nodeGroup.add(mesh);
-                node.mesh = mesh;
+                const slot = node.group ? groupIndex.get(node.group) % config.color_palette.length : 0;
+                nodeColors[i * 3] = paletteBytes[slot * 3];
+                nodeColors[i * 3 + 1] = paletteBytes[slot * 3 + 1];
+                nodeColors[i * 3 + 2] = paletteBytes[slot * 3 + 2];
                 
                 // Add label if configured
-                if (config.show_labels) {{
+                if (config.show_labels) {
                     const labelDiv = document.createElement('div');
                     labelDiv.className = 'node-label';
-                    labelDiv.textContent = node.label || id;
+                    labelDiv.textContent = node.label || node.id;
                     labelDiv.style.color = '#ffffff';
                     labelDiv.style.fontSize = config.font_size + 'px';
                     labelDiv.style.fontFamily = config.font_family;
@@ -458,40 +631,51 @@ class Network3D(ThreeJSVisualization):
                     labelDiv.style.backgroundColor = 'rgba(0, 0, 0, 0.6)';
                     labelDiv.style.borderRadius = '2px';
                     
-                    const label = new THREE.CSS2DObject(labelDiv);
-                    label.position.copy(node.position);
-                    label.position.y += nodeRadius + 0.5;
-                    mesh.add(label);
-                }}
-            }}
-            
-            // Add links to the scene
-            const linkGroup = new THREE.Group();
-            scene.add(linkGroup);
-            
-            for (const link of links) {{
-                const sourceNode = nodeMap.get(link.source);
-                const targetNode = nodeMap.get(link.target);
-                
-                if (sourceNode && targetNode) {{
-                    const lineGeometry = new THREE.BufferGeometry().setFromPoints([
-                        sourceNode.position,
-                        targetNode.position
-                    ]);
-                    
-                    // Create line with appropriate width
-                    const lineWidth = link.value || 1;
-                    const lineMat = linkMaterial.clone();
-                    lineMat.linewidth = lineWidth;
-                    
-                    const line = new THREE.Line(lineGeometry, lineMat);
-                    line.userData = {{ ...link }};
-                    linkGroup.add(line);
-                    
-                    // Store reference to line for updates
-                    link.line = line;
-                }}
-            }}
+                    labelObjects[i] = new THREE.CSS2DObject(labelDiv);
+                    scene.add(labelObjects[i]);
+                }
+            });
+            writeNodeMatrices();
+            
+            // Add all links to the scene as one set of line segments, backed
+            // by a single buffer of [source xyz, target xyz] per link
+            const linePositions = new Float32Array(links.length * 6);
+            
+            // Runs every animated frame, so it writes straight into the
+            // existing buffer without creating arrays or callbacks
+            function writeLinkPositions() {
+                for (let i = 0; i < links.length; i++) {
+                    const source = linkSource[i];
+                    const target = linkTarget[i];
+                    const offset = i * 6;
+                    linePositions[offset] = px[source];
+                    linePositions[offset + 1] = py[source];
+                    linePositions[offset + 2] = pz[source];
+                    linePositions[offset + 3] = px[target];
+                    linePositions[offset + 4] = py[target];
+                    linePositions[offset + 5] = pz[target];
+                }
+            }
+            writeLinkPositions();
+            
+            // Links are grey unless they give their own color; both ends of
+            // a segment share it, stored as normalized bytes
+            const linkColors = new Uint8Array(links.length * 6);
+            const linkColor = new THREE.Color();
+            links.forEach((link, i) => {
+                linkColor.set(link.color || 0x999999);
+                for (let k = 0; k < 6; k += 3) {
+                    linkColors[i * 6 + k] = Math.round(linkColor.r * 255);
+                    linkColors[i * 6 + k + 1] = Math.round(linkColor.g * 255);
+                    linkColors[i * 6 + k + 2] = Math.round(linkColor.b * 255);
+                }
+            });
+            
+            const linkGeometry = new THREE.BufferGeometry();
+            linkGeometry.setAttribute('position', new THREE.BufferAttribute(linePositions, 3));
+            linkGeometry.setAttribute('color', new THREE.BufferAttribute(linkColors, 3, true));
+            const linkLines = new THREE.LineSegments(linkGeometry, linkMaterial);
+            scene.add(linkLines);
             
             // Add lights to the scene
             const ambientLight = new THREE.AmbientLight(0xcccccc, 0.5);
@@ -501,143 +685,173 @@ class Network3D(ThreeJSVisualization):
             directionalLight.position.set(1, 1, 1).normalize();
             scene.add(directionalLight);
             
-            // Simple force simulation for layout
-            if (config.animation) {{
-                // Apply forces to nodes
-                function applyForces() {{
+            // Keep simulating from the precomputed layout while animating
+            if (simulate) {
+                // Repulsion cutoff, which is also the width of the grid cells
+                // used to find nearby nodes; cell coordinates are packed into
+                // one integer key (exact for any layout within ~10^5 units)
+                const CELL_SIZE = 6;
+                const CELL_SPAN = 65536;
+                const cellKey = i => (
+                    (Math.floor(px[i] / CELL_SIZE) * CELL_SPAN + Math.floor(py[i] / CELL_SIZE)) * CELL_SPAN
+                    + Math.floor(pz[i] / CELL_SIZE)
+                );
+                const cells = new Map();
+                
+                // Like the D3 network simulation, stop after a tick budget or
+                // once no node moves further than MIN_MOVEMENT in a tick
+                const MAX_TICKS = 300;
+                const MIN_MOVEMENT = 1e-3;
+                let ticks = 0;
+                const qx = new Float32Array(nodeCount);
+                const qy = new Float32Array(nodeCount);
+                const qz = new Float32Array(nodeCount);
+                
+                // Apply forces to nodes. Works on the flat position arrays
+                // with scalar math only, so a pass allocates nothing per pair.
+                // Returns the largest distance any node moved along an axis.
+                function applyForces() {
                     const repulsionForce = 1;
                     const attractionForce = 0.05;
                     const centeringForce = 0.05;
                     
+                    qx.set(px);
+                    qy.set(py);
+                    qz.set(pz);
+                    
                     // Apply centering force
-                    for (const [id, node] of nodeMap.entries()) {{
-                        const dist = node.position.length();
-                        const force = dist * centeringForce;
-                        const dir = node.position.clone().normalize().multiplyScalar(-force);
-                        node.position.add(dir);
-                    }}
+                    for (let i = 0; i < nodeCount; i++) {
+                        px[i] -= px[i] * centeringForce;
+                        py[i] -= py[i] * centeringForce;
+                        pz[i] -= pz[i] * centeringForce;
+                    }
                     
-                    // Apply node-node repulsion
-                    for (const [id1, node1] of nodeMap.entries()) {{
-                        for (const [id2, node2] of nodeMap.entries()) {{
-                            if (id1 === id2) continue;
-                            
-                            const diff = node1.position.clone().sub(node2.position);
-                            const dist = diff.length();
-                            
-                            if (dist > 0 && dist < 6) {{
-                                const force = repulsionForce / (dist * dist);
-                                const dir = diff.normalize().multiplyScalar(force);
-                                node1.position.add(dir);
-                                node2.position.sub(dir);
-                            }}
-                        }}
-                    }}
+                    // Apply node-node repulsion. Nodes are bucketed into a grid
+                    // of cells as wide as the repulsion cutoff, so each node
+                    // only checks the nodes in the 27 cells around its own.
+                    cells.clear();
+                    for (let i = 0; i < nodeCount; i++) {
+                        const key = cellKey(i);
+                        const cell = cells.get(key);
+                        if (cell) {
+                            cell.push(i);
+                        } else {
+                            cells.set(key, [i]);
+                        }
+                    }
                     
-                    // Apply link attraction
-                    for (const link of links) {{
-                        const sourceNode = nodeMap.get(link.source);
-                        const targetNode = nodeMap.get(link.target);
+                    for (let i = 0; i < nodeCount; i++) {
+                        const home = cellKey(i);
                         
-                        if (sourceNode && targetNode) {{
-                            const diff = sourceNode.position.clone().sub(targetNode.position);
-                            const dist = diff.length();
-                            const force = dist * attractionForce;
-                            const dir = diff.normalize().multiplyScalar(force);
-                            
-                            sourceNode.position.sub(dir);
-                            targetNode.position.add(dir);
-                        }}
-                    }}
-                }}
+                        for (let ox = -1; ox <= 1; ox++) {
+                            for (let oy = -1; oy <= 1; oy++) {
+                                for (let oz = -1; oz <= 1; oz++) {
+                                    const cell = cells.get(home + (ox * CELL_SPAN + oy) * CELL_SPAN + oz);
+                                    if (!cell) continue;
+                                    
+                                    for (let k = 0; k < cell.length; k++) {
+                                        const j = cell[k];
+                                        if (i === j) continue;
+                                        
+                                        const dx = px[i] - px[j];
+                                        const dy = py[i] - py[j];
+                                        const dz = pz[i] - pz[j];
+                                        const dist2 = dx * dx + dy * dy + dz * dz;
+                                        
+                                        if (dist2 > 0 && dist2 < CELL_SIZE * CELL_SIZE) {
+                                            // Force 1/dist^2 along the unit vector diff/dist
+                                            const f = repulsionForce / (dist2 * Math.sqrt(dist2));
+                                            px[i] += dx * f;
+                                            py[i] += dy * f;
+                                            pz[i] += dz * f;
+                                            px[j] -= dx * f;
+                                            py[j] -= dy * f;
+                                            pz[j] -= dz * f;
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                    
+                    // Apply link attraction, proportional to link length
+                    for (let l = 0; l < links.length; l++) {
+                        const s = linkSource[l];
+                        const t = linkTarget[l];
+                        const dx = (px[s] - px[t]) * attractionForce;
+                        const dy = (py[s] - py[t]) * attractionForce;
+                        const dz = (pz[s] - pz[t]) * attractionForce;
+                        px[s] -= dx;
+                        py[s] -= dy;
+                        pz[s] -= dz;
+                        px[t] += dx;
+                        py[t] += dy;
+                        pz[t] += dz;
+                    }
+                    
+                    let movement = 0;
+                    for (let i = 0; i < nodeCount; i++) {
+                        movement = Math.max(
+                            movement,
+                            Math.abs(px[i] - qx[i]),
+                            Math.abs(py[i] - qy[i]),
+                            Math.abs(pz[i] - qz[i])
+                        );
+                    }
+                    return movement;
+                }
                 
                 // Update positions of nodes and links
-                function updatePositions() {{
+                function updatePositions() {
                     // Update node positions
-                    for (const [id, node] of nodeMap.entries()) {{
-                        if (node.mesh) {{
-                            node.mesh.position.copy(node.position);
-                        }}
-                    }}
+                    writeNodeMatrices();
                     
-                    // Update link positions
-                    for (const link of links) {{
-                        if (link.line) {{
-                            const sourceNode = nodeMap.get(link.source);
-                            const targetNode = nodeMap.get(link.target);
-                            
-                            if (sourceNode && targetNode) {{
-                                const positions = new Float32Array([
-                                    sourceNode.position.x, sourceNode.position.y, sourceNode.position.z,
-                                    targetNode.position.x, targetNode.position.y, targetNode.position.z
-                                ]);
-                                
-                                link.line.geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
-                                link.line.geometry.attributes.position.needsUpdate = true;
-                            }}
-                        }}
-                    }}
-                }}
-                
-                // Apply initial forces immediately
-                for (let i = 0; i < 100; i++) {{
-                    applyForces();
-                }}
-                updatePositions();
-            }}
-            
-            // Animation loop
-            function animate() {{
-                requestAnimationFrame(animate);
+                    // Update link positions in place
+                    writeLinkPositions();
+                    linkGeometry.attributes.position.needsUpdate = true;
+                }
                 
-                // Update controls
-                controls.update();
-                
-                // Apply forces if animation is enabled
-                if (config.animation) {{
-                    applyForces();
+                // Run one simulation tick; false once the layout has settled
+                function step() {
+                    const movement = applyForces();
                     updatePositions();
-                }}
-                
-                // Render scene
-                renderer.render(scene, camera);
-                
-                // Render labels if enabled
-                if (config.show_labels && labelRenderer) {{
-                    labelRenderer.render(scene, camera);
-                }}
-            }}
-            
-            // Handle window resize
-            if (config.responsive) {{
-                window.addEventListener('resize', () => {{
-                    const width = container.clientWidth;
-                    camera.aspect = width / {self.height};
-                    camera.updateProjectionMatrix();
-                    renderer.setSize(width, {self.height});
-                    
-                    if (labelRenderer) {{
-                        labelRenderer.setSize(width, {self.height});
-                    }}
-                }});
-            }}
+                    ticks++;
+                    return ticks < MAX_TICKS && movement >= MIN_MOVEMENT;
+                }
+            }
             
             // Start animation loop
-            animate();
-        }})();
-        """
-        
-        return js_code
+            start(() => {
+                // Update controls
+                controls.update();
+                
+                // Apply forces until the layout settles or runs out of ticks
+                if (simulate) {
+                    simulate = step();
+                    return true;
+                }
+                return false;
+            });
+        })();
+        """)
 
 
-class Surface3D(ThreeJSVisualization):
+class Network3D(ThreeJSVisualization):
     """
-    3D surface plot visualization using Three.js.
+    3D network graph visualization using Three.js.
     
-    This class implements 3D surface plot visualizations for 2D data
-    using Three.js.
+    This class implements 3D network/graph visualizations using Three.js.
     """
     
+    # Force layout iterations run in Python before the page is generated
+    LAYOUT_ITERATIONS = 100
+    
+    # Distance beyond which nodes stop repelling each other
+    REPULSION_CUTOFF = 6.0
+    
+    # Larger networks are laid out by the browser simulation instead
+    MAX_LAYOUT_NODES = 1000
+    
     def __init__(
         self,
         data: Any,
@@ -645,13 +859,13 @@ class Surface3D(ThreeJSVisualization):
         width: int = 800,
         height: int = 600,
         container_id: Optional[str] = None,
-        title: str = "3D Surface Plot"
+        title: str = "3D Network Graph"
     ):
         """
-        Initialize a 3D surface plot visualization.
+        Initialize a 3D network graph visualization.
         
         Args:
-            data: Data for the 3D surface plot (must be a 2D array or a function)
+            data: Network data (nodes and links)
             config: Visualization configuration
             width: Width of the visualization in pixels
             height: Height of the visualization in pixels
@@ -660,181 +874,275 @@ class Surface3D(ThreeJSVisualization):
         """
         # Create default config if none provided
         if config is None:
-            config = VisualizationConfig(chart_type=ChartType.SURFACE)
+            config = VisualizationConfig(chart_type=ChartType.NETWORK)
         else:
-            # Ensure chart type is set to SURFACE
-            config.update(chart_type=ChartType.SURFACE)
+            # Ensure chart type is set to NETWORK
+            config.update(chart_type=ChartType.NETWORK)
         
         super().__init__(data, config, width, height, container_id, title)
     
+    @_memoized(_data_key)
+    def preprocess_data(self) -> Dict[str, Any]:
+        """
+        Preprocess the network data and lay it out.
+        
+        The force layout is computed here (see ``compute_layout``) and sent
+        as base64-encoded little-endian float32 x, y, z triples under
+        'positions', in node order. The ``layout_iterations`` additional
+        option sets the number of layout iterations (100 by default) and
+        ``layout_seed`` seeds the random starting positions, making the
+        layout reproducible. Networks with more than ``layout_max_nodes``
+        nodes (1000 by default) only get their starting positions, and
+        'laid_out' is False so the browser simulation lays them out.
+        
+        Returns:
+            Network data with 'nodes', 'links', 'positions' and 'laid_out' keys
+        """
+        network = DataProcessor.prepare_for_network(self.data)
+        options = self.config.additional_options
+        seed = options.get("layout_seed")
+        network["laid_out"] = len(network["nodes"]) <= options.get("layout_max_nodes", self.MAX_LAYOUT_NODES)
+        if network["laid_out"]:
+            positions = self.compute_layout(
+                network["nodes"],
+                network["links"],
+                options.get("layout_iterations", self.LAYOUT_ITERATIONS),
+                seed=seed
+            )
+        else:
+            positions = self.initial_positions(network["nodes"], seed)
+        network["positions"] = base64.b64encode(positions.astype("<f4").tobytes()).decode("ascii")
+        
+        return network
+    
+    def initial_positions(
+        self,
+        nodes: List[Dict[str, Any]],
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Get starting positions for network nodes.
+        
+        Nodes that already have 'x', 'y' and 'z' keep them; the rest are
+        placed uniformly at random in a cube of side 10 around the origin.
+        
+        Args:
+            nodes: List of node dictionaries
+            seed: Random seed for the generated positions
+            
+        Returns:
+            Float32 array of shape (len(nodes), 3)
+        """
+        n = len(nodes)
+        rng = np.random.default_rng(seed)
+        pos = rng.uniform(-5, 5, (n, 3)).astype(np.float32)
+        given = np.array(
+            [[node.get(axis, np.nan) for axis in ("x", "y", "z")] for node in nodes],
+            dtype=np.float32
+        ).reshape(n, 3)
+        known = ~np.isnan(given).any(axis=1)
+        pos[known] = given[known]
+        
+        return pos
+    
+    def compute_layout(
+        self,
+        nodes: List[Dict[str, Any]],
+        links: List[Dict[str, Any]],
+        iterations: int = 100,
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Compute a 3D force-directed layout for a network with NumPy.
+        
+        Applies the same centering, short-range repulsion and link
+        attraction forces as the browser-side simulation. Repulsion only
+        compares nodes in neighbouring grid cells (see ``_grid_repulsion``).
+        
+        Args:
+            nodes: List of node dictionaries (must have 'id')
+            links: List of link dictionaries (must have 'source' and 'target')
+            iterations: Number of layout iterations to run
+            seed: Random seed for the initial positions
+            
+        Returns:
+            Float32 array of shape (len(nodes), 3)
+        """
+        n = len(nodes)
+        index = {node["id"]: i for i, node in enumerate(nodes)}
+        edges = np.array(
+            [(index[link["source"]], index[link["target"]]) for link in links],
+            dtype=np.intp
+        ).reshape(-1, 2)
+        
+        pos = self.initial_positions(nodes, seed)
+        for _ in range(iterations):
+            # Centering pulls every node 5% of the way to the origin
+            pos -= pos * 0.05
+            
+            # Repulsion between nodes closer than the cutoff; each pair
+            # pushes both of its nodes, as in the browser simulation
+            pos += 2 * _grid_repulsion(pos, self.REPULSION_CUTOFF)
+            
+            # Links pull their endpoints together
+            pull = (pos[edges[:, 0]] - pos[edges[:, 1]]) * 0.05
+            np.subtract.at(pos, edges[:, 0], pull)
+            np.add.at(pos, edges[:, 1], pull)
+        
+        return pos
+    
+    @_memoized(_template_key)
     def generate_js_code(self) -> str:
         """
-        Generate JavaScript code for the 3D surface plot visualization.
+        Generate JavaScript code for the 3D network graph visualization.
         
         Returns:
             JavaScript code as a string
         """
-        # Define the Three.js code for 3D surface plot visualization
-        js_code = f"""
+        return _NETWORK3D_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height
+        )
+
+
+# JavaScript for Surface3D (see _SCATTER3D_TEMPLATE)
+_SURFACE3D_TEMPLATE = string.Template("""
         // Create a 3D surface plot visualization
-        (function() {{
-            const container = document.getElementById("{self.container_id}");
-            
-            // Clear previous content
-            container.innerHTML = "";
-            
-            // Add title if specified
-            if ("{self.title}") {{
-                const titleElement = document.createElement("h3");
-                titleElement.className = "vis-title";
-                titleElement.style.textAlign = "center";
-                titleElement.style.marginBottom = "20px";
-                titleElement.style.fontFamily = config.font_family;
-                titleElement.style.fontSize = config.title_font_size + "px";
-                titleElement.textContent = "{self.title}";
-                container.appendChild(titleElement);
-            }}
-            
-            // Create scene, camera, and renderer
-            const scene = new THREE.Scene();
-            scene.background = new THREE.Color(config.background_color);
-            
-            const camera = new THREE.PerspectiveCamera(75, {self.width} / {self.height}, 0.1, 1000);
-            camera.position.z = 10;
-            camera.position.y = 5;
-            camera.position.x = 5;
-            
-            const renderer = new THREE.WebGLRenderer({{ antialias: true }});
-            renderer.setSize({self.width}, {self.height});
-            container.appendChild(renderer.domElement);
-            
-            // Create orbit controls for interaction
-            const controls = new THREE.OrbitControls(camera, renderer.domElement);
-            controls.enableDamping = true;
-            controls.dampingFactor = 0.25;
-            controls.enableZoom = true;
+        (function() {
+            const { scene, controls, start } = LlamaVis.createThreeScene(${container_id}, config, {
+                width: ${width},
+                height: ${height},
+                title: ${title},
+                camera: [5, 5, 10]
+            });
             
             // Create axis helpers
-            if (config.show_axes) {{
+            if (config.show_axes) {
                 const axesHelper = new THREE.AxesHelper(5);
                 scene.add(axesHelper);
-            }}
+            }
             
             // Create grid if specified
-            if (config.show_grid) {{
+            if (config.show_grid) {
                 const gridHelper = new THREE.GridHelper(10, 10);
                 scene.add(gridHelper);
-            }}
-            
-            // Extract data and create surface
-            let surfaceData;
-            if (typeof data === 'function') {{
-                // Function-based data
-                surfaceData = [];
-                const resolution = 50;
-                const xRange = [-5, 5];
-                const zRange = [-5, 5];
+            }
+            
+            // Heights arrive as a flat row-major float32 grid already scaled
+            // onto [0, 5]
+            const width = data.rows;
+            const depth = data.cols;
+            const count = width * depth;
+            const baseHeights = new Float32Array(LlamaVis.decodeBuffer(data.heights));
+            
+            // Build the surface geometry directly: a 10 x 10 grid in the
+            // mesh's x/y plane with the height along z; the triangle list is
+            // shared with other surfaces of the same grid size
+            const positions = new Float32Array(count * 3);
+            const xStep = 10 / Math.max(width - 1, 1);
+            const yStep = 10 / Math.max(depth - 1, 1);
+            
+            for (let i = 0; i < width; i++) {
+                const x = -5 + i * xStep;
+                const row = i * depth;
                 
-                for (let i = 0; i < resolution; i++) {{
-                    const x = xRange[0] + i * (xRange[1] - xRange[0]) / (resolution - 1);
-                    surfaceData[i] = [];
-                    
-                    for (let j = 0; j < resolution; j++) {{
-                        const z = zRange[0] + j * (zRange[1] - zRange[0]) / (resolution - 1);
-                        const y = data(x, z);
-                        surfaceData[i][j] = y;
-                    }}
-                }}
-            }} else if (Array.isArray(data) && Array.isArray(data[0])) {{
-                // 2D array data
-                surfaceData = data;
-            }} else {{
-                // Default to simple function if input data is not usable
-                surfaceData = [];
-                const resolution = 50;
-                const xRange = [-5, 5];
-                const zRange = [-5, 5];
-                
-                for (let i = 0; i < resolution; i++) {{
-                    const x = xRange[0] + i * (xRange[1] - xRange[0]) / (resolution - 1);
-                    surfaceData[i] = [];
-                    
-                    for (let j = 0; j < resolution; j++) {{
-                        const z = zRange[0] + j * (zRange[1] - zRange[0]) / (resolution - 1);
-                        const y = Math.sin(Math.sqrt(x*x + z*z) * 0.5);
-                        surfaceData[i][j] = y;
-                    }}
-                }}
-            }}
-            
-            // Determine surface dimensions
-            const width = surfaceData.length;
-            const depth = surfaceData[0].length;
-            
-            // Find min/max heights for scaling
-            let minHeight = Infinity;
-            let maxHeight = -Infinity;
-            
-            for (let i = 0; i < width; i++) {{
-                for (let j = 0; j < depth; j++) {{
-                    minHeight = Math.min(minHeight, surfaceData[i][j]);
-                    maxHeight = Math.max(maxHeight, surfaceData[i][j]);
-                }}
-            }}
-            
-            // Create surface geometry
-            const geometry = new THREE.PlaneGeometry(10, 10, width - 1, depth - 1);
-            
-            // Update vertices based on data
-            const positions = geometry.attributes.position.array;
-            
-            for (let i = 0; i < width; i++) {{
-                for (let j = 0; j < depth; j++) {{
-                    const index = (i * depth + j) * 3;
-                    positions[index + 1] = (surfaceData[i][j] - minHeight) / (maxHeight - minHeight) * 5;
-                }}
-            }}
-            
-            geometry.attributes.position.needsUpdate = true;
+                for (let j = 0; j < depth; j++) {
+                    const k = row + j;
+                    positions[k * 3] = x;
+                    positions[k * 3 + 1] = 5 - j * yStep;
+                    positions[k * 3 + 2] = baseHeights[k];
+                }
+            }
+            
+            const geometry = new THREE.BufferGeometry();
+            geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
+            geometry.setIndex(new THREE.BufferAttribute(LlamaVis.gridIndex(width, depth), 1));
             geometry.computeVertexNormals();
             
-            // Create color gradient based on height
-            const colors = new Float32Array(width * depth * 3);
-            
-            for (let i = 0; i < width; i++) {{
-                for (let j = 0; j < depth; j++) {{
-                    const index = (i * depth + j) * 3;
-                    
-                    // Normalize height to 0-1 range
-                    const heightRatio = (surfaceData[i][j] - minHeight) / (maxHeight - minHeight);
-                    
-                    // Get color from palette (simple interpolation between two colors)
-                    const colorIndex = Math.min(
-                        Math.floor(heightRatio * config.color_palette.length),
-                        config.color_palette.length - 1
-                    );
-                    
-                    // Parse hex color
-                    const hex = config.color_palette[colorIndex].replace('#', '');
-                    const r = parseInt(hex.substring(0, 2), 16) / 255;
-                    const g = parseInt(hex.substring(2, 4), 16) / 255;
-                    const b = parseInt(hex.substring(4, 6), 16) / 255;
-                    
-                    colors[index] = r;
-                    colors[index + 1] = g;
-                    colors[index + 2] = b;
-                }}
-            }}
-            
-            geometry.setAttribute('color', new THREE.BufferAttribute(colors, 3));
-            
-            // Create material
-            const material = new THREE.MeshPhongMaterial({{
-                vertexColors: true,
-                side: THREE.DoubleSide,
-                flatShading: false,
-                shininess: 30
-            }});
+            // The palette becomes a one-row texture that the fragment shader
+            // samples by normalized height; nearest filtering keeps the bands
+            // of the palette distinct
+            const paletteSize = config.color_palette.length;
+            const paletteData = new Uint8Array(paletteSize * 4);
+            for (let k = 0; k < paletteSize; k++) {
+                const hex = config.color_palette[k].replace('#', '');
+                paletteData[k * 4] = parseInt(hex.substring(0, 2), 16);
+                paletteData[k * 4 + 1] = parseInt(hex.substring(2, 4), 16);
+                paletteData[k * 4 + 2] = parseInt(hex.substring(4, 6), 16);
+                paletteData[k * 4 + 3] = 255;
+            }
+            const paletteTexture = new THREE.DataTexture(paletteData, paletteSize, 1, THREE.RGBAFormat);
+            paletteTexture.magFilter = THREE.NearestFilter;
+            paletteTexture.minFilter = THREE.NearestFilter;
+            paletteTexture.needsUpdate = true;
+            
+            // Height-colored material with an ambient term and one
+            // directional light along (1, 1, 1), lit from either side. The
+            // animated wave sin(i * 0.5 + t) * cos(j * 0.5 + t) is added to
+            // each vertex's height in the vertex shader, with the grid
+            // indices i and j recovered from its x/y position, so the
+            // geometry is uploaded once and a frame only sets uTime.
+            const material = new THREE.ShaderMaterial({
+                uniforms: {
+                    uPalette: { value: paletteTexture },
+                    // Heights arrive scaled onto [0, 5]
+                    uInvHeight: { value: 0.2 },
+                    uGridScale: { value: new THREE.Vector2(1 / xStep, 1 / yStep) },
+                    uTime: { value: 0 },
+                    uWaveAmplitude: { value: config.animation ? 0.1 : 0 },
+                    // Tilt the normals by the wave's slope as it moves
+                    uWaveNormals: { value: config.recompute_normals ? 1 : 0 },
+                    uLightDirection: { value: new THREE.Vector3(1, 1, 1).normalize() },
+                    uAmbient: { value: 0.4 },
+                    uDiffuse: { value: 0.7 }
+                },
+                vertexShader: `
+                    uniform float uInvHeight;
+                    uniform vec2 uGridScale;
+                    uniform float uTime;
+                    uniform float uWaveAmplitude;
+                    uniform float uWaveNormals;
+                    varying float vHeight;
+                    varying vec3 vNormal;
+                    void main() {
+                        vHeight = clamp(position.z * uInvHeight, 0.0, 1.0);
+                        
+                        float a = (position.x + 5.0) * uGridScale.x * 0.5 + uTime;
+                        float b = (5.0 - position.y) * uGridScale.y * 0.5 + uTime;
+                        vec3 displaced = position;
+                        displaced.z += uWaveAmplitude * sin(a) * cos(b);
+                        
+                        // A height-field normal is (-dz/dx, -dz/dy, 1) scaled,
+                        // so the wave's slope adds to the setup normal once
+                        // that is rescaled to a unit z component
+                        vec3 n = normal;
+                        if (uWaveNormals > 0.0 && abs(n.z) > 1e-3) {
+                            float dx = uWaveAmplitude * 0.5 * uGridScale.x * cos(a) * cos(b);
+                            float dy = uWaveAmplitude * 0.5 * uGridScale.y * sin(a) * sin(b);
+                            n = n / n.z - vec3(dx, dy, 0.0);
+                        }
+                        vNormal = normalize(mat3(modelMatrix) * n);
+                        gl_Position = projectionMatrix * modelViewMatrix * vec4(displaced, 1.0);
+                    }
+                `,
+                fragmentShader: `
+                    uniform sampler2D uPalette;
+                    uniform vec3 uLightDirection;
+                    uniform float uAmbient;
+                    uniform float uDiffuse;
+                    varying float vHeight;
+                    varying vec3 vNormal;
+                    void main() {
+                        vec3 color = texture2D(uPalette, vec2(vHeight, 0.5)).rgb;
+                        vec3 n = normalize(gl_FrontFacing ? vNormal : -vNormal);
+                        float light = uAmbient + uDiffuse * max(dot(n, uLightDirection), 0.0);
+                        gl_FragColor = vec4(color * light, 1.0);
+                    }
+                `,
+                side: THREE.DoubleSide
+            });
             
             // Create mesh
             const surface = new THREE.Mesh(geometry, material);
@@ -843,56 +1151,140 @@ class Surface3D(ThreeJSVisualization):
             // Rotate to a more natural orientation
             surface.rotation.x = -Math.PI / 2;
             
-            // Add lights to the scene
-            const ambientLight = new THREE.AmbientLight(0xcccccc, 0.5);
-            scene.add(ambientLight);
-            
-            const directionalLight = new THREE.DirectionalLight(0xffffff, 0.7);
-            directionalLight.position.set(1, 1, 1).normalize();
-            scene.add(directionalLight);
-            
-            // Animation loop
-            function animate() {{
-                requestAnimationFrame(animate);
-                
+            // Start animation loop
+            start(() => {
                 // Update controls
                 controls.update();
                 
                 // Optional: add animation effect
-                if (config.animation) {{
+                if (config.animation) {
                     // Subtle wave animation as an example
-                    const time = Date.now() * 0.001;
-                    
-                    for (let i = 0; i < width; i++) {{
-                        for (let j = 0; j < depth; j++) {{
-                            const index = (i * depth + j) * 3;
-                            const originalHeight = (surfaceData[i][j] - minHeight) / (maxHeight - minHeight) * 5;
-                            const waveEffect = Math.sin(i * 0.5 + time) * Math.cos(j * 0.5 + time) * 0.1;
-                            positions[index + 1] = originalHeight + waveEffect;
-                        }}
-                    }}
-                    
-                    geometry.attributes.position.needsUpdate = true;
-                    geometry.computeVertexNormals();
-                }}
-                
-                // Render scene
-                renderer.render(scene, camera);
-            }}
-            
-            // Handle window resize
-            if (config.responsive) {{
-                window.addEventListener('resize', () => {{
-                    const width = container.clientWidth;
-                    camera.aspect = width / {self.height};
-                    camera.updateProjectionMatrix();
-                    renderer.setSize(width, {self.height});
-                }});
-            }}
-            
-            // Start animation loop
-            animate();
-        }})();
+                    material.uniforms.uTime.value = performance.now() * 0.001;
+                    return true;
+                }
+                return false;
+            });
+        })();
+        """)
+
+
+class Surface3D(ThreeJSVisualization):
+    """
+    3D surface plot visualization using Three.js.
+    
+    This class implements 3D surface plot visualizations for 2D data
+    using Three.js.
+    """
+    
+    # Grid resolution used when the surface is given as a function
+    RESOLUTION = 50
+    
+    # Height of the tallest point once the surface is scaled for display
+    HEIGHT_SCALE = 5.0
+    
+    def __init__(
+        self,
+        data: Any,
+        config: Optional[VisualizationConfig] = None,
+        width: int = 800,
+        height: int = 600,
+        container_id: Optional[str] = None,
+        title: str = "3D Surface Plot"
+    ):
+        """
+        Initialize a 3D surface plot visualization.
+        
+        Args:
+            data: Data for the 3D surface plot (must be a 2D array or a function)
+            config: Visualization configuration
+            width: Width of the visualization in pixels
+            height: Height of the visualization in pixels
+            container_id: HTML ID for the container element
+            title: Title of the visualization
         """
+        # Create default config if none provided
+        if config is None:
+            config = VisualizationConfig(chart_type=ChartType.SURFACE3D)
+        else:
+            # Ensure chart type is set to SURFACE3D
+            config.update(chart_type=ChartType.SURFACE3D)
         
-        return js_code 
\ No newline at end of file
+        super().__init__(data, config, width, height, container_id, title)
+    
+    @_memoized(_data_key)
+    def preprocess_data(self) -> Dict[str, Any]:
+        """
+        Preprocess the surface data into a grid of heights.
+        
+        A function is evaluated over a ``resolution`` x ``resolution`` grid
+        spanning [-5, 5] in x and z (the ``resolution`` additional option,
+        50 by default), called once with the whole grid when it accepts NumPy
+        arrays and point by point otherwise. Data that cannot be used as a
+        surface, including grids smaller than 2 x 2 and resolutions below 2,
+        is replaced by sin(0.5 * sqrt(x^2 + z^2)) over the default grid.
+        Heights are scaled onto [0, ``HEIGHT_SCALE``] with the numba kernel
+        when numba is installed, and travel as a base64-encoded
+        little-endian float32 buffer in row-major order.
+        
+        Returns:
+            Dictionary with 'rows', 'cols' and 'heights' keys
+        """
+        heights = None
+        if callable(self.data):
+            resolution = int(self.config.additional_options.get("resolution", self.RESOLUTION))
+            if resolution >= 2:
+                axis = np.linspace(-5, 5, resolution)
+                x, z = np.meshgrid(axis, axis, indexing="ij")
+                try:
+                    heights = np.broadcast_to(np.asarray(self.data(x, z), dtype=np.float32), x.shape)
+                except (TypeError, ValueError):
+                    heights = np.vectorize(self.data, otypes=[np.float32])(x, z)
+        else:
+            try:
+                heights = np.asarray(self.data, dtype=np.float32)
+            except (TypeError, ValueError):
+                pass
+        
+        # The mesh needs at least 2 x 2 points
+        if heights is None or heights.ndim != 2 or min(heights.shape) < 2:
+            # Default to a simple ripple if the data is not usable
+            axis = np.linspace(-5, 5, self.RESOLUTION, dtype=np.float32)
+            x, z = np.meshgrid(axis, axis, indexing="ij")
+            heights = np.sin(np.hypot(x, z) * 0.5)
+        
+        rows, cols = heights.shape
+        heights = np.ascontiguousarray(heights, dtype=np.float32).ravel()
+        scaled = np.empty_like(heights)
+        # Imported here so numba's start-up cost is only paid when a
+        # surface is actually built
+        try:
+            from ._surface_numba import scale_heights as scale
+        except ImportError:  # numba is optional
+            scale = _scale_heights_numpy
+        scale(heights, scaled, self.HEIGHT_SCALE)
+        
+        return {
+            "rows": rows,
+            "cols": cols,
+            "heights": base64.b64encode(scaled.astype("<f4", copy=False).tobytes()).decode("ascii")
+        }
+    
+    @_memoized(_template_key)
+    def generate_js_code(self) -> str:
+        """
+        Generate JavaScript code for the 3D surface plot visualization.
+        
+        The animated wave is applied in the vertex shader. Vertex normals
+        keep the values computed for the undisturbed surface unless the
+        ``recompute_normals`` additional option is set, in which case the
+        shader tilts them by the wave's slope.
+        
+        Returns:
+            JavaScript code as a string
+        """
+        return _SURFACE3D_TEMPLATE.substitute(
+            container_id=js_string(self.container_id),
+            title=js_string(self.title),
+            width=self.width,
+            height=self.height
+        ) 
\ No newline at end of file
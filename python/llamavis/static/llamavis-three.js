@@ -0,0 +1,172 @@
+/*
+ * LlamaVis Three.js scene setup.
+ *
+ * Page setup shared by the Three.js visualizations: the title, scene,
+ * camera, WebGL renderer, orbit controls, optional CSS2D label renderer,
+ * resize handling and an on-demand render loop. Inlined once per page.
+ */
+(function(global) {
+    "use strict";
+
+    const LlamaVis = global.LlamaVis || {};
+
+    // Decode a base64 string from the Python side into an ArrayBuffer
+    LlamaVis.decodeBuffer = function(b64) {
+        const binary = atob(b64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return bytes.buffer;
+    };
+
+    // Triangle indices for a rows x cols vertex grid stored row-major, two
+    // triangles per cell. Grids of the same shape share one array, so every
+    // surface of that size on the page reuses it.
+    const gridIndexCache = new Map();
+    LlamaVis.gridIndex = function(rows, cols) {
+        const key = rows + "x" + cols;
+        let indices = gridIndexCache.get(key);
+        if (indices) {
+            return indices;
+        }
+
+        const count = rows * cols;
+        const cells = Math.max(rows - 1, 0) * Math.max(cols - 1, 0);
+        indices = new (count < 65536 ? Uint16Array : Uint32Array)(cells * 6);
+        let cursor = 0;
+        for (let i = 0; i < rows - 1; i++) {
+            for (let j = 0; j < cols - 1; j++) {
+                const a = i * cols + j;
+                const b = a + 1;
+                const c = a + cols;
+                const d = c + 1;
+                indices[cursor++] = a;
+                indices[cursor++] = b;
+                indices[cursor++] = c;
+                indices[cursor++] = b;
+                indices[cursor++] = d;
+                indices[cursor++] = c;
+            }
+        }
+        gridIndexCache.set(key, indices);
+        return indices;
+    };
+
+    // Set up a Three.js scene in the container. options holds the width,
+    // height and title, the initial camera position and whether node
+    // labels are drawn (labels). Returns the scene objects and start(frame),
+    // which runs frame() every animation frame while the page is visible and
+    // redraws only when it returns true, the camera moved or the canvas was
+    // resized.
+    LlamaVis.createThreeScene = function(containerId, config, options) {
+        const width = options.width;
+        const height = options.height;
+        const container = document.getElementById(containerId);
+
+        // Clear previous content
+        container.innerHTML = "";
+
+        // Add title if specified
+        if (options.title) {
+            const titleElement = document.createElement("h3");
+            titleElement.className = "vis-title";
+            titleElement.style.textAlign = "center";
+            titleElement.style.marginBottom = "20px";
+            titleElement.style.fontFamily = config.font_family;
+            titleElement.style.fontSize = config.title_font_size + "px";
+            titleElement.textContent = options.title;
+            container.appendChild(titleElement);
+        }
+
+        // Create scene, camera, and renderer
+        const scene = new THREE.Scene();
+        scene.background = new THREE.Color(config.background_color);
+
+        const camera = new THREE.PerspectiveCamera(75, width / height, 0.1, 1000);
+        camera.position.set(...options.camera);
+
+        const renderer = new THREE.WebGLRenderer({ antialias: true });
+        renderer.setSize(width, height);
+        container.appendChild(renderer.domElement);
+
+        // Initialize CSS2D renderer for labels if needed
+        let labelRenderer = null;
+        if (options.labels) {
+            labelRenderer = new THREE.CSS2DRenderer();
+            labelRenderer.setSize(width, height);
+            labelRenderer.domElement.style.position = "absolute";
+            labelRenderer.domElement.style.top = "0";
+            labelRenderer.domElement.style.pointerEvents = "none";
+            container.appendChild(labelRenderer.domElement);
+        }
+
+        // Create orbit controls for interaction
+        const controls = new THREE.OrbitControls(camera, renderer.domElement);
+        controls.enableDamping = true;
+        controls.dampingFactor = 0.25;
+        controls.enableZoom = true;
+
+        // The scene only needs drawing again when something changed
+        let needsRender = true;
+        controls.addEventListener("change", () => {
+            needsRender = true;
+        });
+
+        // Handle window resize, at most once per frame: resize events fire
+        // many times during a drag
+        if (config.responsive) {
+            let resizePending = false;
+            window.addEventListener("resize", () => {
+                if (resizePending) {
+                    return;
+                }
+                resizePending = true;
+                requestAnimationFrame(() => {
+                    resizePending = false;
+                    const newWidth = container.clientWidth;
+                    camera.aspect = newWidth / height;
+                    camera.updateProjectionMatrix();
+                    renderer.setSize(newWidth, height);
+                    if (labelRenderer) {
+                        labelRenderer.setSize(newWidth, height);
+                    }
+                    needsRender = true;
+                });
+            });
+        }
+
+        function start(frame) {
+            function tick() {
+                if (frame()) {
+                    needsRender = true;
+                }
+                if (!needsRender) {
+                    return;
+                }
+                needsRender = false;
+                renderer.render(scene, camera);
+                if (labelRenderer) {
+                    labelRenderer.render(scene, camera);
+                }
+            }
+
+            // Stop the loop entirely while the page is hidden
+            document.addEventListener("visibilitychange", () => {
+                if (document.hidden) {
+                    renderer.setAnimationLoop(null);
+                } else {
+                    needsRender = true;
+                    renderer.setAnimationLoop(tick);
+                }
+            });
+            if (!document.hidden) {
+                renderer.setAnimationLoop(tick);
+            }
+        }
+
+        return { container, scene, camera, renderer, controls, labelRenderer, start };
+    };
+
+    global.LlamaVis = LlamaVis;
+})(window);
@@ -0,0 +1,1333 @@
+/*
+ * LlamaVis D3 renderers.
+ *
+ * Shared chart implementations used by the D3 visualizations. Each renderer
+ * takes the container element ID, the preprocessed data, the serialized
+ * VisualizationConfig and an options object with width, height and title.
+ */
+(function(global) {
+    "use strict";
+
+    const LlamaVis = global.LlamaVis || {};
+
+    // d3 modules loaded by the network simulation worker, dependencies first
+    const D3_FORCE_URLS = ["d3-dispatch", "d3-quadtree", "d3-timer", "d3-force"]
+        .map(m => `https://cdn.jsdelivr.net/npm/${m}@3/dist/${m}.min.js`);
+
+    // Decode a base64 string from the Python side into raw bytes
+    function decodeBase64(b64) {
+        const binary = atob(b64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return bytes;
+    }
+
+    // Build the force simulation used for network graphs. Barnes-Hut charge
+    // with a coarser theta and a bounded range keeps each tick close to
+    // O(n log n); faster alpha and velocity decay let large graphs settle in
+    // fewer ticks, and a tick budget stops the simulation outright once it
+    // has run long enough. This function is also serialized into the worker
+    // source, so it may only reference the global d3.
+    function buildForceSimulation(nodes, links, width, height) {
+        const maxTicks = 300;
+        let ticks = 0;
+
+        const simulation = d3.forceSimulation(nodes)
+            .force("link", d3.forceLink(links).id(d => d.id))
+            .force("charge", d3.forceManyBody()
+                .strength(-100)
+                .theta(1.0)
+                .distanceMax(Math.min(width, height) / 3))
+            .force("center", d3.forceCenter(width / 2, height / 2))
+            .force("collide", d3.forceCollide()
+                .radius(d => d.radius || 10)
+                .strength(0.7)
+                .iterations(1))
+            .alphaDecay(0.05)
+            .velocityDecay(0.4);
+
+        // Stop once converged or out of budget, unless held warm by a drag
+        simulation.on("tick.budget", () => {
+            ticks++;
+            if (simulation.alphaTarget() === 0 &&
+                (ticks >= maxTicks || simulation.alpha() < simulation.alphaMin())) {
+                simulation.stop();
+            }
+        });
+
+        // Reheat on demand (e.g. while dragging) with a fresh tick budget
+        simulation.reheat = (target) => {
+            ticks = 0;
+            simulation.alphaTarget(target).restart();
+        };
+
+        return simulation;
+    }
+
+    // Worker entry point: owns the simulation and posts node positions back
+    // as a transferable Float32Array of interleaved x, y on every tick
+    function networkWorker() {
+        let simulation = null;
+        let nodes = [];
+
+        self.onmessage = function(event) {
+            const msg = event.data;
+            if (msg.type === "update") {
+                nodes = msg.nodes;
+                if (simulation) {
+                    // Swap in the new graph but keep the running simulation
+                    simulation.nodes(nodes);
+                    simulation.force("link").links(msg.links);
+                    simulation.alpha(1);
+                    simulation.reheat(0);
+                    return;
+                }
+                importScripts(...msg.d3Urls);
+                simulation = buildForceSimulation(nodes, msg.links, msg.width, msg.height)
+                    .on("tick", () => {
+                        const positions = new Float32Array(nodes.length * 2);
+                        for (let i = 0; i < nodes.length; i++) {
+                            positions[2 * i] = nodes[i].x;
+                            positions[2 * i + 1] = nodes[i].y;
+                        }
+                        self.postMessage(positions, [positions.buffer]);
+                    });
+            } else if (msg.type === "fix") {
+                nodes[msg.index].fx = msg.fx;
+                nodes[msg.index].fy = msg.fy;
+            } else if (msg.type === "reheat" && simulation) {
+                simulation.reheat(msg.value);
+            } else if (msg.type === "stop" && simulation) {
+                simulation.stop();
+            } else if (msg.type === "restart" && simulation) {
+                simulation.restart();
+            }
+        };
+    }
+
+    // Create a network simulation handle. Each update(nodes, links, pos,
+    // ticked) hands it the graph of the latest render; the simulation then
+    // writes node positions into the interleaved pos buffer and calls
+    // ticked() after each step. It runs in a Web Worker when possible and on
+    // the main thread otherwise (no Worker support, or the worker fails to
+    // load d3-force). Later updates reuse the running simulation.
+    function createNetworkSimulation(width, height) {
+        const state = {nodes: [], links: [], pos: new Float32Array(0), ticked: () => {}};
+
+        const onMainThread = () => {
+            let simulation = null;
+            return {
+                update(nodes, links) {
+                    if (simulation) {
+                        simulation.nodes(nodes);
+                        simulation.force("link").links(links);
+                        simulation.alpha(1);
+                        simulation.reheat(0);
+                        return;
+                    }
+                    simulation = buildForceSimulation(nodes, links, width, height)
+                        .on("tick", () => {
+                            for (let i = 0; i < state.nodes.length; i++) {
+                                state.pos[2 * i] = state.nodes[i].x;
+                                state.pos[2 * i + 1] = state.nodes[i].y;
+                            }
+                            state.ticked();
+                        });
+                },
+                reheat(value) {
+                    simulation.reheat(value);
+                },
+                stop() {
+                    simulation.stop();
+                },
+                restart() {
+                    simulation.restart();
+                },
+                fix(i, fx, fy) {
+                    state.nodes[i].fx = fx;
+                    state.nodes[i].fy = fy;
+                }
+            };
+        };
+
+        const inWorker = (worker) => ({
+            update(nodes, links) {
+                // The worker only needs positions and link endpoints, by index
+                const nodeIndex = new Map(nodes.map((d, i) => [d, i]));
+                worker.postMessage({
+                    type: "update",
+                    d3Urls: D3_FORCE_URLS,
+                    width: width,
+                    height: height,
+                    nodes: nodes.map((d, i) => ({id: i, x: d.x, y: d.y, radius: d.radius})),
+                    links: links.map(l => ({source: nodeIndex.get(l.source), target: nodeIndex.get(l.target)}))
+                });
+            },
+            reheat(value) {
+                worker.postMessage({type: "reheat", value: value});
+            },
+            stop() {
+                worker.postMessage({type: "stop"});
+            },
+            restart() {
+                worker.postMessage({type: "restart"});
+            },
+            fix(i, fx, fy) {
+                worker.postMessage({type: "fix", index: i, fx: fx, fy: fy});
+            }
+        });
+
+        let backend = null;
+        if (typeof Worker !== "undefined" && typeof Blob !== "undefined") {
+            try {
+                const source = buildForceSimulation.toString() + "\n(" + networkWorker.toString() + ")();";
+                const url = URL.createObjectURL(new Blob([source], {type: "application/javascript"}));
+                const worker = new Worker(url);
+                URL.revokeObjectURL(url);
+
+                worker.onmessage = (event) => {
+                    // Ignore ticks computed for a graph that has since been replaced
+                    if (event.data.length === state.pos.length) {
+                        state.pos.set(event.data);
+                        state.ticked();
+                    }
+                };
+                worker.onerror = (event) => {
+                    event.preventDefault();
+                    worker.terminate();
+                    backend = onMainThread();
+                    backend.update(state.nodes, state.links);
+                };
+                backend = inWorker(worker);
+            } catch (e) {
+                backend = null;
+            }
+        }
+        if (!backend) {
+            backend = onMainThread();
+        }
+
+        return {
+            update(nodes, links, pos, ticked) {
+                Object.assign(state, {nodes: nodes, links: links, pos: pos, ticked: ticked});
+                backend.update(nodes, links);
+            },
+            reheat: (value) => backend.reheat(value),
+            stop: () => backend.stop(),
+            restart: () => backend.restart(),
+            fix: (i, fx, fy) => backend.fix(i, fx, fy)
+        };
+    }
+
+    // Shaders for the WebGL network renderer. Positions are in the same CSS
+    // pixel space as the SVG renderer; u_transform carries the zoom (k, x, y).
+    const NETWORK_LINE_VS = `
+        attribute vec2 a_position;
+        uniform vec2 u_resolution;
+        uniform vec3 u_transform;
+        void main() {
+            vec2 p = (a_position * u_transform.x + u_transform.yz) / u_resolution * 2.0 - 1.0;
+            gl_Position = vec4(p.x, -p.y, 0.0, 1.0);
+        }`;
+    const NETWORK_LINE_FS = `
+        precision mediump float;
+        void main() {
+            gl_FragColor = vec4(vec3(0.6) * 0.6, 0.6);
+        }`;
+    const NETWORK_POINT_VS = `
+        attribute vec2 a_position;
+        attribute vec3 a_color;
+        attribute float a_radius;
+        uniform vec2 u_resolution;
+        uniform vec3 u_transform;
+        uniform float u_pixelRatio;
+        varying vec3 v_color;
+        void main() {
+            vec2 p = (a_position * u_transform.x + u_transform.yz) / u_resolution * 2.0 - 1.0;
+            gl_Position = vec4(p.x, -p.y, 0.0, 1.0);
+            gl_PointSize = 2.0 * a_radius * u_transform.x * u_pixelRatio;
+            v_color = a_color;
+        }`;
+    const NETWORK_POINT_FS = `
+        precision mediump float;
+        varying vec3 v_color;
+        void main() {
+            float alpha = 1.0 - smoothstep(0.45, 0.5, length(gl_PointCoord - 0.5));
+            if (alpha <= 0.0) discard;
+            gl_FragColor = vec4(v_color * alpha, alpha);
+        }`;
+
+    // Compile and link a WebGL program, returning it together with the
+    // locations of all its active attributes and uniforms keyed by name
+    function compileProgram(gl, vertexSource, fragmentSource) {
+        const program = gl.createProgram();
+        [[gl.VERTEX_SHADER, vertexSource], [gl.FRAGMENT_SHADER, fragmentSource]].forEach(([type, source]) => {
+            const shader = gl.createShader(type);
+            gl.shaderSource(shader, source);
+            gl.compileShader(shader);
+            gl.attachShader(program, shader);
+        });
+        gl.linkProgram(program);
+        if (!gl.getProgramParameter(program, gl.LINK_STATUS)) {
+            throw new Error(gl.getProgramInfoLog(program));
+        }
+        const locations = {program: program};
+        for (let i = 0; i < gl.getProgramParameter(program, gl.ACTIVE_ATTRIBUTES); i++) {
+            const name = gl.getActiveAttrib(program, i).name;
+            locations[name] = gl.getAttribLocation(program, name);
+        }
+        for (let i = 0; i < gl.getProgramParameter(program, gl.ACTIVE_UNIFORMS); i++) {
+            const name = gl.getActiveUniform(program, i).name;
+            locations[name] = gl.getUniformLocation(program, name);
+        }
+        return locations;
+    }
+
+    // Create (or reuse) a WebGL renderer for network graphs on a canvas:
+    // links are drawn as GL_LINES and nodes as antialiased point sprites.
+    // Returns null when WebGL is not available.
+    function createNetworkGL(canvas, width, height) {
+        if (canvas.__llamavis_gl__) return canvas.__llamavis_gl__;
+
+        const gl = canvas.getContext("webgl", {antialias: true, premultipliedAlpha: true});
+        if (!gl) return null;
+
+        const ratio = window.devicePixelRatio || 1;
+        canvas.width = width * ratio;
+        canvas.height = height * ratio;
+        canvas.style.width = width + "px";
+        canvas.style.height = height + "px";
+
+        const lines = compileProgram(gl, NETWORK_LINE_VS, NETWORK_LINE_FS);
+        const points = compileProgram(gl, NETWORK_POINT_VS, NETWORK_POINT_FS);
+        const buffers = {
+            line: gl.createBuffer(),
+            position: gl.createBuffer(),
+            color: gl.createBuffer(),
+            radius: gl.createBuffer()
+        };
+        let lineVertices = new Float32Array(0);
+
+        function attribute(location, buffer, size, data) {
+            gl.bindBuffer(gl.ARRAY_BUFFER, buffer);
+            if (data) gl.bufferData(gl.ARRAY_BUFFER, data, gl.DYNAMIC_DRAW);
+            gl.enableVertexAttribArray(location);
+            gl.vertexAttribPointer(location, size, gl.FLOAT, false, 0, 0);
+        }
+
+        function useProgram(program, transform) {
+            gl.useProgram(program.program);
+            gl.uniform2f(program.u_resolution, width, height);
+            gl.uniform3f(program.u_transform, transform.k, transform.x, transform.y);
+            if (program.u_pixelRatio) gl.uniform1f(program.u_pixelRatio, ratio);
+        }
+
+        gl.enable(gl.BLEND);
+        gl.blendFunc(gl.ONE, gl.ONE_MINUS_SRC_ALPHA);
+
+        const renderer = {
+            // Upload per-node colors (r, g, b in 0..1) and radii; call once
+            // per render rather than per frame
+            setNodes(colors, radii) {
+                gl.bindBuffer(gl.ARRAY_BUFFER, buffers.color);
+                gl.bufferData(gl.ARRAY_BUFFER, colors, gl.STATIC_DRAW);
+                gl.bindBuffer(gl.ARRAY_BUFFER, buffers.radius);
+                gl.bufferData(gl.ARRAY_BUFFER, radii, gl.STATIC_DRAW);
+            },
+
+            // Draw links and nodes from the interleaved position buffer
+            draw(pos, linkSource, linkTarget, transform) {
+                gl.viewport(0, 0, canvas.width, canvas.height);
+                gl.clearColor(0, 0, 0, 0);
+                gl.clear(gl.COLOR_BUFFER_BIT);
+
+                const linkCount = linkSource.length;
+                if (lineVertices.length < linkCount * 4) {
+                    lineVertices = new Float32Array(linkCount * 4);
+                }
+                for (let e = 0; e < linkCount; e++) {
+                    const s = 2 * linkSource[e];
+                    const t = 2 * linkTarget[e];
+                    lineVertices[4 * e] = pos[s];
+                    lineVertices[4 * e + 1] = pos[s + 1];
+                    lineVertices[4 * e + 2] = pos[t];
+                    lineVertices[4 * e + 3] = pos[t + 1];
+                }
+
+                useProgram(lines, transform);
+                attribute(lines.a_position, buffers.line, 2, lineVertices.subarray(0, linkCount * 4));
+                gl.drawArrays(gl.LINES, 0, linkCount * 2);
+                gl.disableVertexAttribArray(lines.a_position);
+
+                useProgram(points, transform);
+                attribute(points.a_position, buffers.position, 2, pos);
+                attribute(points.a_color, buffers.color, 3, null);
+                attribute(points.a_radius, buffers.radius, 1, null);
+                gl.drawArrays(gl.POINTS, 0, pos.length / 2);
+                gl.disableVertexAttribArray(points.a_position);
+                gl.disableVertexAttribArray(points.a_color);
+                gl.disableVertexAttribArray(points.a_radius);
+            }
+        };
+
+        canvas.__llamavis_gl__ = renderer;
+        return renderer;
+    }
+
+    // Paint heatmap cells into a 2D canvas (an HTMLCanvasElement or an
+    // OffscreenCanvas), one pixel per cell, from 8-bit codes and a 256-entry
+    // color table. When the grid and color table match the previous state,
+    // only the pixels whose code changed are rewritten and the bounding box
+    // of those cells is put back. Returns the state for the next call. This
+    // function is also serialized into the heatmap worker.
+    //
+    // Normally CSS scales the cols x rows canvas up to the plot area. When
+    // the browser cannot scale it without smoothing, scaleTo gives the
+    // canvas backing size instead: cells are painted into a cols x rows
+    // buffer that is blitted up with a single unsmoothed drawImage.
+    function paintHeatmapCells(canvas, previous, codes, lut, cols, rows, scaleTo) {
+        // Resizing a backing store clears it, so only touch it when the
+        // size actually changes
+        function resize(target, width, height) {
+            if (target.width !== width) target.width = width;
+            if (target.height !== height) target.height = height;
+        }
+
+        let surface = canvas;
+        if (scaleTo) {
+            resize(canvas, scaleTo[0], scaleTo[1]);
+            surface = (previous && previous.surface !== canvas && previous.surface)
+                || (typeof OffscreenCanvas !== "undefined"
+                    ? new OffscreenCanvas(cols, rows)
+                    : document.createElement("canvas"));
+        }
+        resize(surface, cols, rows);
+        const ctx = surface.getContext("2d");
+
+        let state;
+        if (previous && previous.surface === surface
+                && previous.image.width === cols && previous.image.height === rows
+                && previous.lut.every((c, i) => c === lut[i])) {
+            const pixels = new Uint32Array(previous.image.data.buffer);
+            let minRow = rows, maxRow = -1, minCol = cols, maxCol = -1;
+            for (let i = 0; i < codes.length; i++) {
+                if (previous.codes[i] !== codes[i]) {
+                    previous.codes[i] = codes[i];
+                    pixels[i] = lut[codes[i]];
+                    const row = (i / cols) | 0;
+                    const col = i - row * cols;
+                    if (row < minRow) minRow = row;
+                    if (row > maxRow) maxRow = row;
+                    if (col < minCol) minCol = col;
+                    if (col > maxCol) maxCol = col;
+                }
+            }
+            if (maxRow >= 0) {
+                ctx.putImageData(previous.image, 0, 0,
+                    minCol, minRow, maxCol - minCol + 1, maxRow - minRow + 1);
+            }
+            state = previous;
+        } else {
+            ctx.clearRect(0, 0, cols, rows);
+            const image = ctx.createImageData(cols, rows);
+            const pixels = new Uint32Array(image.data.buffer);
+            for (let i = 0; i < codes.length; i++) {
+                pixels[i] = lut[codes[i]];
+            }
+            ctx.putImageData(image, 0, 0);
+            state = {codes: codes, lut: lut, image: image, surface: surface};
+        }
+
+        if (scaleTo) {
+            const target = canvas.getContext("2d");
+            target.imageSmoothingEnabled = false;
+            target.clearRect(0, 0, scaleTo[0], scaleTo[1]);
+            target.drawImage(surface, 0, 0, scaleTo[0], scaleTo[1]);
+        }
+        return state;
+    }
+
+    // Worker entry point for heatmaps: receives the transferred
+    // OffscreenCanvas once, then paints every message's codes into it
+    function heatmapWorker() {
+        let canvas = null;
+        let state = null;
+
+        self.onmessage = function(event) {
+            const msg = event.data;
+            if (msg.canvas) {
+                canvas = msg.canvas;
+            } else {
+                state = paintHeatmapCells(canvas, state, msg.codes, msg.lut, msg.cols, msg.rows, msg.scaleTo);
+            }
+        };
+    }
+
+    // Start a heatmap worker and hand it control of canvas. Returns null
+    // (leaving the canvas untouched) when the worker cannot be created.
+    function createHeatmapWorker(canvas) {
+        try {
+            const source = paintHeatmapCells.toString() + "\n(" + heatmapWorker.toString() + ")();";
+            const url = URL.createObjectURL(new Blob([source], {type: "application/javascript"}));
+            const worker = new Worker(url);
+            URL.revokeObjectURL(url);
+            const offscreen = canvas.transferControlToOffscreen();
+            worker.postMessage({canvas: offscreen}, [offscreen]);
+            return worker;
+        } catch (e) {
+            return null;
+        }
+    }
+
+    // Shaders for the WebGL heatmap renderer: one instanced unit quad per
+    // cell, placed at the cell's origin in plot pixels and scaled to the
+    // cell size, with the cell color as a normalized 8-bit attribute.
+    const HEATMAP_VS = `
+        attribute vec2 a_corner;
+        attribute vec2 a_offset;
+        attribute vec3 a_color;
+        uniform vec2 u_resolution;
+        uniform vec2 u_size;
+        varying vec3 v_color;
+        void main() {
+            vec2 p = (a_offset + a_corner * u_size) / u_resolution * 2.0 - 1.0;
+            gl_Position = vec4(p.x, -p.y, 0.0, 1.0);
+            v_color = a_color;
+        }`;
+    const HEATMAP_FS = `
+        precision mediump float;
+        varying vec3 v_color;
+        void main() {
+            gl_FragColor = vec4(v_color, 1.0);
+        }`;
+
+    // Create (or reuse) a WebGL renderer for heatmap cells on a canvas.
+    // Cell origins and colors are uploaded once per render as packed typed
+    // arrays and drawn with a single instanced call. Returns null when
+    // WebGL or instancing (ANGLE_instanced_arrays) is not available.
+    function createHeatmapGL(canvas) {
+        if (canvas.__llamavis_gl__) return canvas.__llamavis_gl__;
+
+        const gl = canvas.getContext("webgl", {antialias: false});
+        if (!gl) return null;
+        const instancing = gl.getExtension("ANGLE_instanced_arrays");
+        if (!instancing) return null;
+
+        const program = compileProgram(gl, HEATMAP_VS, HEATMAP_FS);
+        const buffers = {
+            corner: gl.createBuffer(),
+            offset: gl.createBuffer(),
+            color: gl.createBuffer()
+        };
+        gl.bindBuffer(gl.ARRAY_BUFFER, buffers.corner);
+        gl.bufferData(gl.ARRAY_BUFFER, new Float32Array([0, 0, 1, 0, 0, 1, 1, 1]), gl.STATIC_DRAW);
+
+        function attribute(location, buffer, size, type, normalized, divisor) {
+            gl.bindBuffer(gl.ARRAY_BUFFER, buffer);
+            gl.enableVertexAttribArray(location);
+            gl.vertexAttribPointer(location, size, type, normalized, 0, 0);
+            instancing.vertexAttribDivisorANGLE(location, divisor);
+        }
+
+        const renderer = {
+            // Draw count cells from offsets ([x0, y0, x1, y1, ...] in plot
+            // pixels) and colors ([r0, g0, b0, ...] as bytes); the canvas
+            // is width x height CSS pixels at its current backing size
+            draw(offsets, colors, count, cellWidth, cellHeight, width, height) {
+                gl.viewport(0, 0, canvas.width, canvas.height);
+                gl.clearColor(0, 0, 0, 0);
+                gl.clear(gl.COLOR_BUFFER_BIT);
+
+                gl.useProgram(program.program);
+                gl.uniform2f(program.u_resolution, width, height);
+                gl.uniform2f(program.u_size, cellWidth, cellHeight);
+
+                gl.bindBuffer(gl.ARRAY_BUFFER, buffers.offset);
+                gl.bufferData(gl.ARRAY_BUFFER, offsets, gl.STATIC_DRAW);
+                gl.bindBuffer(gl.ARRAY_BUFFER, buffers.color);
+                gl.bufferData(gl.ARRAY_BUFFER, colors, gl.STATIC_DRAW);
+
+                attribute(program.a_corner, buffers.corner, 2, gl.FLOAT, false, 0);
+                attribute(program.a_offset, buffers.offset, 2, gl.FLOAT, false, 1);
+                attribute(program.a_color, buffers.color, 3, gl.UNSIGNED_BYTE, true, 1);
+                instancing.drawArraysInstancedANGLE(gl.TRIANGLE_STRIP, 0, 4, count);
+            }
+        };
+
+        canvas.__llamavis_gl__ = renderer;
+        return renderer;
+    }
+
+    // Create the title and svg of a container, or reuse them from a previous
+    // render so repeated renders do not rebuild the whole subtree
+    function setupContainer(container, config, options) {
+        container.selectChildren("h3.vis-title")
+            .data(options.title ? [options.title] : [])
+            .join(enter => enter.insert("h3", ":first-child")
+                .attr("class", "vis-title")
+                .style("text-align", "center")
+                .style("margin-bottom", "20px"))
+            .style("font-family", config.font_family)
+            .style("font-size", config.title_font_size + "px")
+            .text(d => d);
+
+        return container.selectChildren("svg")
+            .data([0])
+            .join("svg")
+            .attr("width", options.width)
+            .attr("height", options.height)
+            .attr("viewBox", [0, 0, options.width, options.height])
+            .attr("style", "max-width: 100%; height: auto;");
+    }
+
+    // Select the <g class="name"> child of parent, creating it on first use
+    function layer(parent, name) {
+        return parent.selectChildren("g." + name)
+            .data([0])
+            .join("g")
+            .attr("class", name);
+    }
+
+    // Create a force-directed network graph. Re-rendering into the same
+    // container updates the existing elements and simulation in place.
+    // Graphs with more than options.webgl_threshold nodes are drawn with
+    // WebGL (without labels, tooltips or dragging) instead of SVG elements.
+    LlamaVis.renderNetwork = function(containerId, data, config, options) {
+        const width = options.width;
+        const height = options.height;
+        const container = d3.select(document.getElementById(containerId));
+        const svg = setupContainer(container, config, options);
+
+        // Simulation and positions of the previous render, if any
+        const previous = container.node().__llamavis_network__ || null;
+
+        // Extract nodes and links from data
+        const nodes = data.nodes;
+        const links = data.links;
+
+        // Define color scale for nodes
+        const colorScale = d3.scaleOrdinal()
+            .domain(nodes.map(d => d.group || "default"))
+            .range(config.color_palette);
+
+        // Resolve link endpoints to node objects once, so drawing does not
+        // depend on d3.forceLink having run on this thread
+        const nodeById = new Map(nodes.map(d => [d.id, d]));
+        links.forEach(l => {
+            if (typeof l.source !== "object") l.source = nodeById.get(l.source);
+            if (typeof l.target !== "object") l.target = nodeById.get(l.target);
+        });
+
+        // Node positions live in one interleaved Float32Array [x0, y0, x1, y1,
+        // ...] seeded from Python; the simulation writes it and drawing reads
+        // it by index instead of dereferencing node objects. Nodes that were
+        // already on screen keep their current position.
+        const pos = new Float32Array(decodeBase64(data.positions).buffer);
+        nodes.forEach((d, i) => {
+            const j = previous ? previous.index.get(d.id) : undefined;
+            if (j !== undefined) {
+                pos[2 * i] = previous.pos[2 * j];
+                pos[2 * i + 1] = previous.pos[2 * j + 1];
+            }
+            d.x = pos[2 * i];
+            d.y = pos[2 * i + 1];
+        });
+        const nodeIndex = new Map(nodes.map((d, i) => [d, i]));
+        const linkSource = Int32Array.from(links, l => nodeIndex.get(l.source));
+        const linkTarget = Int32Array.from(links, l => nodeIndex.get(l.target));
+
+        // Very large graphs go to a WebGL canvas below the SVG layers; the
+        // SVG joins below are then empty
+        const glCanvas = svg.selectChildren("foreignObject.gl-layer")
+            .data(nodes.length > options.webgl_threshold ? [0] : [])
+            .join(enter => {
+                const fo = enter.insert("foreignObject", ":first-child")
+                    .attr("class", "gl-layer");
+                fo.append("xhtml:canvas").style("display", "block");
+                return fo;
+            })
+            .attr("width", width)
+            .attr("height", height)
+            .select("canvas")
+            .node();
+        const gl = glCanvas ? createNetworkGL(glCanvas, width, height) : null;
+        const svgNodes = gl ? [] : nodes;
+        const svgLinks = gl ? [] : links;
+        if (gl) {
+            const colors = new Float32Array(nodes.length * 3);
+            const radii = new Float32Array(nodes.length);
+            nodes.forEach((d, i) => {
+                const c = d3.rgb(colorScale(d.group || "default"));
+                colors[3 * i] = c.r / 255;
+                colors[3 * i + 1] = c.g / 255;
+                colors[3 * i + 2] = c.b / 255;
+                radii[i] = d.radius || 5;
+            });
+            gl.setNodes(colors, radii);
+        }
+        let transform = d3.zoomIdentity;
+
+        // Layers are created on the first render and reused afterwards
+        const viewport = layer(svg, "viewport");
+        const linkLayer = layer(viewport, "links")
+            .attr("stroke", "#999")
+            .attr("stroke-opacity", 0.6);
+        const nodeLayer = layer(viewport, "nodes")
+            .attr("stroke", "#fff")
+            .attr("stroke-width", 1.5);
+        const labelLayer = layer(viewport, "labels")
+            .attr("font-family", config.font_family)
+            .attr("font-size", config.font_size);
+
+        // Create links
+        const link = linkLayer.selectAll("line")
+            .data(svgLinks, d => d.source.id + "\u0000" + d.target.id)
+            .join("line")
+            .attr("stroke-width", d => Math.sqrt(d.value || 1));
+
+        // Create nodes, keyed by id so existing circles are reused
+        const node = nodeLayer.selectAll("circle")
+            .data(svgNodes, d => d.id)
+            .join("circle")
+            .attr("r", d => d.radius || 5)
+            .attr("fill", d => colorScale(d.group || "default"));
+
+        // Add tooltip for nodes
+        node.selectAll("title")
+            .data(d => config.interactive ? [d.id] : [])
+            .join("title")
+            .text(d => d);
+
+        // Add labels if configured
+        const labels = labelLayer.selectAll("text")
+            .data(config.show_labels ? svgNodes : [], d => d.id)
+            .join("text")
+            .attr("dx", 12)
+            .attr("dy", ".35em")
+            .text(d => d.label || d.id);
+
+        function ticked() {
+            if (gl) {
+                gl.draw(pos, linkSource, linkTarget, transform);
+                return;
+            }
+
+            link
+                .attr("x1", (d, i) => pos[2 * linkSource[i]])
+                .attr("y1", (d, i) => pos[2 * linkSource[i] + 1])
+                .attr("x2", (d, i) => pos[2 * linkTarget[i]])
+                .attr("y2", (d, i) => pos[2 * linkTarget[i] + 1]);
+
+            node
+                .attr("cx", (d, i) => pos[2 * i])
+                .attr("cy", (d, i) => pos[2 * i + 1]);
+
+            labels
+                .attr("x", (d, i) => pos[2 * i])
+                .attr("y", (d, i) => pos[2 * i + 1]);
+        }
+
+        // Simulation ticks can arrive faster than the display refreshes, so
+        // they only mark the drawing dirty and at most one redraw runs per
+        // animation frame
+        let frameRequested = false;
+        function scheduleDraw() {
+            if (frameRequested) return;
+            frameRequested = true;
+            requestAnimationFrame(() => {
+                frameRequested = false;
+                ticked();
+            });
+        }
+
+        // Run the simulation (off the main thread where possible); this
+        // thread only applies positions and draws
+        const simulation = previous ? previous.simulation : createNetworkSimulation(width, height);
+        simulation.update(nodes, links, pos, scheduleDraw);
+        container.node().__llamavis_network__ = {
+            simulation: simulation,
+            pos: pos,
+            index: new Map(nodes.map((d, i) => [d.id, i]))
+        };
+        ticked();
+        node.call(drag(simulation));
+
+        // Let users freeze the layout explicitly
+        container.selectChildren("button.vis-pause")
+            .data(config.interactive ? [0] : [])
+            .join(enter => enter.append("button")
+                .attr("class", "vis-pause")
+                .style("position", "absolute")
+                .style("top", "0")
+                .style("right", "0"))
+            .text("Pause")
+            .on("click", function() {
+                const pausing = this.textContent === "Pause";
+                if (pausing) {
+                    simulation.stop();
+                } else {
+                    simulation.restart();
+                }
+                d3.select(this).text(pausing ? "Resume" : "Pause");
+            });
+
+        // Implement drag functionality
+        function drag(simulation) {
+            // The drag subject reads the node's current position from pos,
+            // which is kept current even when node objects are not
+            function dragsubject(event, d) {
+                const i = nodeIndex.get(d);
+                return {index: i, x: pos[2 * i], y: pos[2 * i + 1]};
+            }
+
+            function dragstarted(event) {
+                if (!event.active) simulation.reheat(0.3);
+                simulation.fix(event.subject.index, event.subject.x, event.subject.y);
+            }
+
+            function dragged(event) {
+                simulation.fix(event.subject.index, event.x, event.y);
+            }
+
+            function dragended(event) {
+                if (!event.active) simulation.reheat(0);
+                simulation.fix(event.subject.index, null, null);
+            }
+
+            return d3.drag()
+                .subject(dragsubject)
+                .on("start", dragstarted)
+                .on("drag", dragged)
+                .on("end", dragended);
+        }
+
+        // Implement zoom functionality if enabled
+        if (config.interactions.includes("zoom")) {
+            const zoom = d3.zoom()
+                .scaleExtent([0.1, 10])
+                .on("zoom", (event) => {
+                    transform = event.transform;
+                    if (gl) {
+                        scheduleDraw();
+                    } else {
+                        viewport.attr("transform", transform);
+                    }
+                });
+
+            svg.call(zoom);
+        }
+    };
+
+    // Marks appended per chunk when a large selection is rendered
+    // incrementally
+    const CHUNK_SIZE = 500;
+
+    // Call render(chunk) for successive CHUNK_SIZE slices of items: the
+    // first right away, the rest when the browser is idle, so building a
+    // large chart does not block interaction. A new call on the same
+    // container cancels any chunks still pending from the previous render.
+    function renderInChunks(container, items, render) {
+        const node = container.node();
+        if (node.__llamavis_chunks__) node.__llamavis_chunks__();
+
+        const schedule = typeof requestIdleCallback === "function"
+            ? requestIdleCallback : (f) => setTimeout(f, 0);
+        const cancel = typeof cancelIdleCallback === "function"
+            ? cancelIdleCallback : clearTimeout;
+        let handle = null;
+
+        function step(start) {
+            const end = Math.min(start + CHUNK_SIZE, items.length);
+            render(items.slice(start, end));
+            handle = end < items.length ? schedule(() => step(end)) : null;
+        }
+
+        node.__llamavis_chunks__ = () => {
+            if (handle !== null) cancel(handle);
+            handle = null;
+        };
+        step(0);
+    }
+
+    // Create a hierarchical tree visualization
+    LlamaVis.renderTree = function(containerId, data, config, options) {
+        const width = options.width;
+        const height = options.height;
+        const container = d3.select(document.getElementById(containerId));
+
+        // Reuse the title and svg of a previous render, redrawing its content
+        const svg = setupContainer(container, config, options);
+        svg.selectChildren().remove();
+
+        // Create a group for the tree
+        const g = svg.append("g")
+            .attr("transform", `translate(40, 0)`);
+
+        // Create a hierarchical data structure
+        const root = d3.hierarchy(data);
+
+        // Set the size of the tree layout
+        const treeLayout = d3.tree()
+            .size([height - 100, width - 160]);
+
+        // Compute the tree layout
+        treeLayout(root);
+
+        // Define color scale for nodes
+        const colorScale = d3.scaleOrdinal()
+            .domain(root.descendants().map(d => d.depth))
+            .range(config.color_palette);
+
+        // Links are drawn below nodes, each in its own layer, so chunks
+        // can append to both without reordering
+        const linkLayer = g.append("g");
+        const nodeLayer = g.append("g");
+        const linkPath = d3.linkHorizontal()
+            .x(d => d.y)
+            .y(d => d.x);
+
+        // Create nodes, and the link from each node to its parent, in chunks
+        renderInChunks(container, root.descendants(), chunk => {
+            linkLayer.selectAll(null)
+                .data(chunk.filter(d => d.parent).map(d => ({source: d.parent, target: d})))
+                .enter()
+                .append("path")
+                .attr("class", "link")
+                .attr("d", linkPath)
+                .attr("fill", "none")
+                .attr("stroke", "#999")
+                .attr("stroke-opacity", 0.6)
+                .attr("stroke-width", 1.5);
+
+            const node = nodeLayer.selectAll(null)
+                .data(chunk)
+                .enter()
+                .append("g")
+                .attr("class", "node")
+                .attr("transform", d => `translate(${d.y},${d.x})`);
+
+            // Add circles for nodes
+            node.append("circle")
+                .attr("r", 5)
+                .attr("fill", d => colorScale(d.depth))
+                .attr("stroke", "#fff")
+                .attr("stroke-width", 1.5);
+
+            // Add labels for nodes
+            node.append("text")
+                .attr("dy", "0.31em")
+                .attr("x", d => d.children ? -8 : 8)
+                .attr("text-anchor", d => d.children ? "end" : "start")
+                .text(d => d.data.name)
+                .attr("font-family", config.font_family)
+                .attr("font-size", config.font_size + "px")
+                .clone(true).lower()
+                .attr("stroke", "white")
+                .attr("stroke-width", 3);
+        });
+
+        // Implement zoom functionality if enabled
+        if (config.interactions.includes("zoom")) {
+            const zoom = d3.zoom()
+                .scaleExtent([0.1, 3])
+                .on("zoom", (event) => {
+                    g.attr("transform", event.transform);
+                });
+
+            svg.call(zoom);
+        }
+    };
+
+    // Create a treemap visualization
+    LlamaVis.renderTreemap = function(containerId, data, config, options) {
+        const width = options.width;
+        const height = options.height;
+        const container = d3.select(document.getElementById(containerId));
+
+        // Reuse the title and svg of a previous render, redrawing its content
+        const svg = setupContainer(container, config, options);
+        svg.selectChildren().remove();
+
+        // Create a group for the treemap
+        const g = svg.append("g");
+
+        // Create a hierarchical data structure; values are summed and
+        // children sorted in Python, so only copy the precomputed totals
+        const hierarchy = d3.hierarchy(data)
+            .each(d => { d.value = d.data._value; });
+
+        // Create a treemap layout
+        const treemap = d3.treemap()
+            .size([width, height - 50])
+            .paddingOuter(3)
+            .paddingTop(19)
+            .paddingInner(1)
+            .round(true);
+
+        // Compute the treemap layout
+        const root = treemap(hierarchy);
+
+        // Define color scale
+        const colorScale = d3.scaleOrdinal()
+            .domain(root.children.map(d => d.data.name))
+            .range(config.color_palette);
+
+        // Resolve each leaf's top-level category color and tile size once,
+        // rather than walking ancestors and reading attributes per callback
+        const leafColor = new Map();
+        root.leaves().forEach(d => {
+            let p = d;
+            while (p.depth > 1) p = p.parent;
+            leafColor.set(d, colorScale(p.data.name));
+            d._w = d.x1 - d.x0;
+            d._h = d.y1 - d.y0;
+        });
+
+        // Leaves go in their own layer below the category titles, so
+        // chunks can keep appending to it
+        const leafLayer = g.append("g");
+
+        // Create leaf nodes in chunks
+        renderInChunks(container, root.leaves(), chunk => {
+            const leaf = leafLayer.selectAll(null)
+                .data(chunk)
+                .enter()
+                .append("g")
+                .attr("transform", d => `translate(${d.x0},${d.y0})`);
+
+            // Create rectangles for leaf nodes
+            leaf.append("rect")
+                .attr("width", d => d._w)
+                .attr("height", d => d._h)
+                .attr("fill", d => leafColor.get(d))
+                .attr("fill-opacity", 0.8)
+                .attr("stroke", "#fff");
+
+            // Add labels for leaf nodes if there's enough space
+            const labels = leaf.append("text")
+                .attr("x", 3)
+                .attr("y", "1.1em")
+                .text(d => d.data.name)
+                .attr("font-family", config.font_family)
+                .attr("font-size", config.font_size + "px")
+                .attr("fill", "white");
+
+            // Hide labels that don't fit in their rectangle. Measure every
+            // label of the chunk first and only then remove, so DOM reads
+            // are not interleaved with writes and the browser lays out once.
+            const overflowing = [];
+            labels.each(function(d) {
+                if (this.getComputedTextLength() > d._w || d._h < config.font_size * 1.5) {
+                    overflowing.push(this);
+                }
+            });
+            overflowing.forEach(n => n.remove());
+
+            // Add tooltips for all nodes
+            if (config.interactive) {
+                leaf.append("title")
+                    .text(d => `${d.ancestors().reverse().map(d => d.data.name).join("/")}\nValue: ${d.value}`);
+            }
+        });
+
+        // Add titles (categories) for parent nodes
+        g.selectAll(".parent-label")
+            .data(root.descendants().filter(d => d.depth === 1))
+            .join("text")
+            .attr("class", "parent-label")
+            .attr("x", d => d.x0 + 3)
+            .attr("y", d => d.y0 + 14)
+            .attr("font-family", config.font_family)
+            .attr("font-size", (config.font_size + 2) + "px")
+            .attr("font-weight", "bold")
+            .text(d => d.data.name)
+            .attr("fill", "#000");
+    };
+
+    // Create a heatmap visualization
+    LlamaVis.renderHeatmap = function(containerId, data, config, options) {
+        const width = options.width;
+        const height = options.height;
+        const container = d3.select(document.getElementById(containerId));
+
+        // Extract data (values and codes are flattened row-major, base64
+        // float32 and uint8; exact values are only sent when tooltips need
+        // them)
+        const x_labels = data.x_labels;
+        const y_labels = data.y_labels;
+        const rows = data.rows;
+        const cols = data.cols;
+        const flat = data.values ? new Float32Array(decodeBase64(data.values).buffer) : null;
+
+        // Margins are set in Python, which also lays out the legend
+        const margin = options.margin;
+        const innerWidth = width - margin.left - margin.right;
+        const innerHeight = height - margin.top - margin.bottom;
+
+        // Reuse the title and svg of a previous render, redrawing its content
+        // except for the cell canvas, which is kept and repainted
+        const svg = setupContainer(container, config, options);
+        svg.selectChildren(":not(.heatmap-cells)").remove();
+        container.selectChildren("div.tooltip").remove();
+
+        // Label font, set once in a stylesheet scoped to this container
+        // instead of as attributes on every label. The static legend group
+        // is hinted with will-change so browsers that composite SVG groups
+        // can keep it on its own layer.
+        svg.append("style")
+            .text(`#${CSS.escape(containerId)} .llamavis-chart text.label {
+                font-family: ${config.font_family};
+                font-size: ${config.font_size}px;
+            }
+            #${CSS.escape(containerId)} .llamavis-chart .legend {
+                will-change: transform;
+            }`);
+
+        // Create a group for the heatmap
+        const g = svg.append("g")
+            .attr("class", "llamavis-chart")
+            .attr("transform", `translate(${margin.left},${margin.top})`);
+
+        // Calculate cell size
+        const cellWidth = innerWidth / cols;
+        const cellHeight = innerHeight / rows;
+
+        // Value range for the color scale (computed in Python)
+        const minValue = data.min;
+        const maxValue = data.max;
+        const middle = data.median;
+
+        // Create x scale
+        const xScale = d3.scaleBand()
+            .domain(x_labels)
+            .range([0, innerWidth])
+            .padding(0.05);
+
+        // Create y scale
+        const yScale = d3.scaleBand()
+            .domain(y_labels)
+            .range([0, innerHeight])
+            .padding(0.05);
+
+        // Create x axis
+        const xAxis = g.append("g")
+            .attr("transform", `translate(0,${innerHeight})`)
+            .call(d3.axisBottom(xScale))
+            .call(g => g.select(".domain").remove());
+
+        // Rotate x axis labels if needed
+        if (x_labels.length > 10) {
+            xAxis.selectAll("text")
+                .attr("transform", "rotate(-45)")
+                .attr("text-anchor", "end")
+                .attr("dx", "-.8em")
+                .attr("dy", ".15em");
+        }
+
+        // Create y axis
+        g.append("g")
+            .call(d3.axisLeft(yScale))
+            .call(g => g.select(".domain").remove());
+
+        // Cells arrive as 8-bit codes over [min, max] indexing a 256-entry
+        // RGBA table (packed for the little-endian byte order of ImageData on
+        // all current platforms), shared by the cells and the legend. Codes
+        // 0-254 span the values and code 255 marks missing cells, which stay
+        // transparent. Python computes the table for plain color lists; for
+        // d3's named schemes the color scale is evaluated here once per code.
+        const MISSING_CODE = 255;
+        const codes = decodeBase64(data.codes);
+        const lut = new Uint32Array(256);
+        if (data.lut) {
+            const rgb = decodeBase64(data.lut);
+            for (let i = 0; i < 256; i++) {
+                lut[i] = ((255 << 24) | (rgb[3 * i + 2] << 16) | (rgb[3 * i + 1] << 8) | rgb[3 * i]) >>> 0;
+            }
+        } else {
+            // Define color scale
+            let colorScale;
+            if (config.color_palette === "sequential") {
+                colorScale = d3.scaleSequential()
+                    .domain([minValue, maxValue])
+                    .interpolator(d3.interpolateBlues);
+            } else if (config.color_palette === "diverging") {
+                colorScale = d3.scaleDiverging()
+                    .domain([minValue, middle, maxValue])
+                    .interpolator(d3.interpolateRdBu);
+            } else {
+                // Default to custom color palette
+                colorScale = d3.scaleSequential()
+                    .domain([minValue, maxValue])
+                    .interpolator(d3.interpolateRgb(
+                        config.color_palette[0] || "#f7fbff", 
+                        config.color_palette[config.color_palette.length - 1] || "#08306b"
+                    ));
+            }
+
+            for (let i = 0; i < MISSING_CODE; i++) {
+                const c = d3.rgb(colorScale(minValue + (maxValue - minValue) * i / (MISSING_CODE - 1)));
+                lut[i] = ((255 << 24) | (c.b << 16) | (c.g << 8) | c.r) >>> 0;
+            }
+        }
+        lut[MISSING_CODE] = 0;
+
+        // All cells go into a single canvas under the SVG axes, legend and
+        // tooltip overlay, at the plot origin, instead of rows * cols SVG
+        // rect nodes. A canvas holds either a 2D or a WebGL context, or is
+        // handed to a worker (options.offscreen), so it is keyed by mode and
+        // replaced if the mode changes.
+        const ratio = window.devicePixelRatio || 1;
+        const useGL = options.renderer === "webgl";
+        const useWorker = !useGL && options.offscreen && typeof Worker !== "undefined"
+            && typeof HTMLCanvasElement.prototype.transferControlToOffscreen === "function";
+        const canvas = svg.selectChildren("foreignObject.heatmap-cells")
+            .data([useGL ? "webgl" : useWorker ? "offscreen" : "canvas"], d => d)
+            .join(
+                enter => {
+                    const fo = enter.insert("foreignObject", ":first-child")
+                        .attr("class", "heatmap-cells");
+                    fo.append("xhtml:canvas")
+                        .style("display", "block")
+                        .style("image-rendering", "pixelated");
+                    return fo;
+                },
+                update => update,
+                exit => exit
+                    .each(function() {
+                        const worker = this.querySelector("canvas").__llamavis_worker__;
+                        if (worker) worker.terminate();
+                    })
+                    .remove()
+            )
+            .attr("x", margin.left)
+            .attr("y", margin.top)
+            .attr("width", innerWidth)
+            .attr("height", innerHeight)
+            .select("canvas")
+            .style("width", innerWidth + "px")
+            .style("height", innerHeight + "px")
+            .node();
+
+        if (useGL) {
+            const backingWidth = Math.round(innerWidth * ratio);
+            const backingHeight = Math.round(innerHeight * ratio);
+            if (canvas.width !== backingWidth) canvas.width = backingWidth;
+            if (canvas.height !== backingHeight) canvas.height = backingHeight;
+        }
+        const gl = useGL ? createHeatmapGL(canvas) : null;
+        if (useWorker && !canvas.__llamavis_worker__) {
+            canvas.__llamavis_worker__ = createHeatmapWorker(canvas);
+        }
+        const worker = useWorker ? canvas.__llamavis_worker__ : null;
+
+        // Without CSS support for unsmoothed scaling, the 2D paths scale the
+        // cells up themselves to the canvas's device-pixel size
+        const scaleTo = typeof CSS !== "undefined" && CSS.supports("image-rendering", "pixelated")
+            ? null
+            : [Math.round(innerWidth * ratio), Math.round(innerHeight * ratio)];
+
+        if (gl) {
+            // Pack cell origins into one Float32Array and colors into one
+            // Uint8Array, then draw every cell in one instanced call;
+            // missing cells are left out
+            const offsets = new Float32Array(2 * rows * cols);
+            const colors = new Uint8Array(3 * rows * cols);
+            let count = 0;
+            for (let i = 0; i < rows * cols; i++) {
+                if (codes[i] === MISSING_CODE) continue;
+                const c = lut[codes[i]];
+                offsets[2 * count] = (i % cols) * cellWidth;
+                offsets[2 * count + 1] = ((i / cols) | 0) * cellHeight;
+                colors[3 * count] = c & 255;
+                colors[3 * count + 1] = (c >>> 8) & 255;
+                colors[3 * count + 2] = (c >>> 16) & 255;
+                count++;
+            }
+            gl.draw(offsets, colors, count, cellWidth, cellHeight, innerWidth, innerHeight);
+        } else if (worker) {
+            // The worker owns the canvas and does the painting; the codes
+            // are transferred rather than copied
+            worker.postMessage({codes: codes, lut: lut, cols: cols, rows: rows, scaleTo: scaleTo}, [codes.buffer]);
+        } else {
+            // Paint one pixel per cell and let CSS scale it up to the plot
+            // area (this is also the fallback when WebGL is not available)
+            canvas.__llamavis_heatmap__ = paintHeatmapCells(
+                canvas, canvas.__llamavis_heatmap__, codes, lut, cols, rows, scaleTo);
+        }
+
+        // Add tooltips
+        if (config.interactive) {
+            const tooltip = container.append("div")
+                .attr("class", "tooltip")
+                .style("position", "absolute")
+                .style("visibility", "hidden")
+                .style("background-color", "white")
+                .style("border", "1px solid #ddd")
+                .style("padding", "5px")
+                .style("border-radius", "5px")
+                .style("pointer-events", "none");
+
+            // One delegated listener on a transparent overlay covers every
+            // cell: the pointer position (in plot coordinates, so it stays
+            // correct when the svg is scaled down) maps to a flat index.
+            // The tooltip text is only rebuilt when the hovered cell
+            // changes; other pointer moves just reposition it.
+            let hovered = -1;
+            g.append("rect")
+                .attr("class", "overlay")
+                .attr("width", innerWidth)
+                .attr("height", innerHeight)
+                .attr("fill", "none")
+                .attr("pointer-events", "all")
+                .on("mousemove", (event) => {
+                    const [mx, my] = d3.pointer(event);
+                    const col = Math.floor(mx / cellWidth);
+                    const row = Math.floor(my / cellHeight);
+                    if (row < 0 || row >= rows || col < 0 || col >= cols) {
+                        tooltip.style("visibility", "hidden");
+                        hovered = -1;
+                        return;
+                    }
+                    const index = row * cols + col;
+                    if (index !== hovered) {
+                        hovered = index;
+                        // Labels are user data: set them as text, never as markup.
+                        tooltip.style("visibility", "visible").text("");
+                        tooltip.append("strong").text(`${y_labels[row]}, ${x_labels[col]}`);
+                        tooltip.append("br");
+                        tooltip.node().append(`Value: ${Number.isNaN(flat[index]) ? "missing" : flat[index].toFixed(2)}`);
+                    }
+                    tooltip
+                        .style("top", (event.pageY - 10) + "px")
+                        .style("left", (event.pageX + 10) + "px");
+                })
+                .on("mouseout", () => {
+                    tooltip.style("visibility", "hidden");
+                    hovered = -1;
+                });
+        }
+
+        // The legend, its axis and the axis labels arrive as static SVG
+        // markup rendered in Python; insert it in one step
+        g.node().insertAdjacentHTML("beforeend", data.legend_svg);
+
+        // Python bakes the legend ramp image for plain color lists; for
+        // other palettes draw it here as a 255 x 1 image of the same color
+        // table used for the cells
+        const rampNode = g.select("image.legend-ramp");
+        if (!rampNode.attr("href")) {
+            const ramp = document.createElement("canvas");
+            ramp.width = MISSING_CODE;
+            ramp.height = 1;
+            const rampContext = ramp.getContext("2d");
+            const rampImage = rampContext.createImageData(MISSING_CODE, 1);
+            new Uint32Array(rampImage.data.buffer).set(lut.subarray(0, MISSING_CODE));
+            rampContext.putImageData(rampImage, 0, 0);
+            rampNode.attr("href", ramp.toDataURL());
+        }
+    };
+
+    global.LlamaVis = LlamaVis;
+})(window);
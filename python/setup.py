@@ -16,6 +16,14 @@ setup(
         "pandas>=1.2.0",
         "matplotlib>=3.4.0",
     ],
+    extras_require={
+        "jit": [
+            "numba>=0.56",
+        ],
+        "json": [
+            "orjson>=3.6",
+        ],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
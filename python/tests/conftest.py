@@ -0,0 +1,10 @@
+"""
+Test configuration for the llamavis visualization package.
+
+Puts the package directory (python/) first on the import path so the tests
+import this llamavis rather than the client package at the repository root.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,87 @@
+"""
+Tests for the D3.js visualizations.
+"""
+import base64
+import warnings
+
+import numpy as np
+import pytest
+
+from llamavis.core.config import VisualizationConfig
+from llamavis.integrations.d3_vis import HeatmapVis, NetworkGraph, _fa2_step_numpy
+
+
+def _codes(heatmap):
+    return list(base64.b64decode(heatmap["codes"]))
+
+
+def test_heatmap_ignores_missing_values():
+    """Test that NaN cells are skipped by the range and get the reserved code."""
+    data = np.array([[1.0, np.nan], [3.0, 5.0]])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        heatmap = HeatmapVis(data).preprocess_data()
+    
+    assert (heatmap["min"], heatmap["max"], heatmap["median"]) == (1.0, 5.0, 3.0)
+    assert _codes(heatmap) == [0, HeatmapVis.MISSING_CODE, 127, 254]
+
+
+def test_heatmap_all_missing():
+    """Test that an all-NaN heatmap still renders with every cell missing."""
+    heatmap = HeatmapVis(np.full((2, 2), np.nan)).preprocess_data()
+    
+    assert heatmap["min"] == heatmap["max"] == 0.0
+    assert _codes(heatmap) == [HeatmapVis.MISSING_CODE] * 4
+    assert "legend_svg" in heatmap
+
+
+def test_heatmap_color_table_reserves_missing_entry():
+    """Test that the Python color table keeps 255 value levels plus the missing slot."""
+    vis = HeatmapVis(np.eye(2), width=400, height=300)
+    vis.config.color_palette = ["#000000", "#ffffff"]
+    lut = vis._color_table()
+    
+    assert len(lut) == 256 * 3
+    assert lut[:3] == b"\x00\x00\x00"
+    assert lut[254 * 3:255 * 3] == b"\xff\xff\xff"
+
+
+def _star_and_ring():
+    nodes = [{"id": i} for i in range(12)]
+    links = [{"source": 0, "target": i} for i in range(1, 6)]
+    links += [{"source": i, "target": i % 6 + 6} for i in range(6, 12)]
+    return {"nodes": nodes, "links": links}
+
+
+def test_network_prelayout_seed_is_reproducible():
+    """Test that prelayout_seed makes the starting positions reproducible."""
+    for options in ({"prelayout_seed": 7}, {"prelayout_seed": 7, "prelayout_iterations": 10}):
+        first = NetworkGraph(_star_and_ring(), config=VisualizationConfig(**options)).preprocess_data()
+        second = NetworkGraph(_star_and_ring(), config=VisualizationConfig(**options)).preprocess_data()
+        assert first["positions"] == second["positions"]
+
+
+def test_fa2_numba_and_numpy_steps_agree():
+    """Test that the numba ForceAtlas2 kernel matches its NumPy fallback."""
+    fa2_numba = pytest.importorskip("llamavis.integrations._fa2_numba")
+    
+    rng = np.random.default_rng(0)
+    n = 12
+    network = _star_and_ring()
+    edges_src = np.array([link["source"] for link in network["links"]], dtype=np.int32)
+    edges_dst = np.array([link["target"] for link in network["links"]], dtype=np.int32)
+    degrees = np.zeros(n, dtype=np.float32)
+    np.add.at(degrees, edges_src, 1.0)
+    np.add.at(degrees, edges_dst, 1.0)
+    start = rng.uniform(-100, 100, (2, n)).astype(np.float32)
+    
+    results = []
+    for step in (fa2_numba.fa2_step, _fa2_step_numpy):
+        xs, ys = start[0].copy(), start[1].copy()
+        vxs = np.zeros(n, dtype=np.float32)
+        vys = np.zeros(n, dtype=np.float32)
+        for i in range(5):
+            step(xs, ys, vxs, vys, degrees, edges_src, edges_dst, 10.0, 0.01, 1.0, 20.0 - i)
+        results.append(np.stack([xs, ys]))
+    
+    np.testing.assert_allclose(results[0], results[1], rtol=1e-3, atol=1e-2)
@@ -0,0 +1,62 @@
+"""
+Tests for the DataProcessor helpers.
+"""
+from llamavis.core.data import DataProcessor
+
+
+def test_hierarchical_sums_match_d3():
+    """Test that _value sums like d3's sum(d => d.value || 1)."""
+    tree = {
+        "name": "root",
+        "children": [
+            {"name": "a", "value": 4},
+            {"name": "b", "children": [{"name": "b1", "value": 2}, {"name": "b2"}]},
+            {"name": "c", "value": 5, "children": [{"name": "c1", "value": 1}]},
+        ],
+    }
+    root = DataProcessor.prepare_for_hierarchical(tree)
+    a, b, c = root["children"]
+    
+    assert a["_value"] == 4
+    # Valueless nodes count 1, internal ones included
+    assert b["children"][1]["_value"] == 1
+    assert b["_value"] == 1 + 2 + 1
+    assert c["_value"] == 5 + 1
+    assert root["_value"] == 1 + 4 + 4 + 6
+
+
+def test_hierarchical_does_not_modify_input():
+    """Test that the input tree is copied rather than annotated in place."""
+    tree = {"name": "root", "children": [{"name": "a", "value": 2}]}
+    DataProcessor.prepare_for_hierarchical(tree)
+    
+    assert "_value" not in tree
+    assert "_value" not in tree["children"][0]
+
+
+def test_hierarchical_list_root():
+    """Test that a bare list is placed under a common root."""
+    root = DataProcessor.prepare_for_hierarchical([{"name": "a", "value": 2}, {"name": "b"}])
+    
+    assert root["name"] == "root"
+    assert [child["name"] for child in root["children"]] == ["a", "b"]
+    assert root["_value"] == 1 + 2 + 1
+
+
+def test_hierarchical_sort_orders_children_by_value():
+    """Test that sort=True orders children by descending _value, keeping ties in order."""
+    tree = {
+        "name": "root",
+        "children": [
+            {"name": "small", "value": 1},
+            {"name": "big", "children": [{"name": "x", "value": 3}, {"name": "y", "value": 9}]},
+            {"name": "tie", "value": 1},
+        ],
+    }
+    root = DataProcessor.prepare_for_hierarchical(tree, sort=True)
+    
+    assert [child["name"] for child in root["children"]] == ["big", "small", "tie"]
+    assert [child["name"] for child in root["children"][0]["children"]] == ["y", "x"]
+    # Without sort the input order is kept
+    unsorted = DataProcessor.prepare_for_hierarchical(tree)
+    assert [child["name"] for child in unsorted["children"]] == ["small", "big", "tie"]
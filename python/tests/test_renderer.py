@@ -0,0 +1,78 @@
+"""
+Tests for the HTML renderer.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from llamavis.core import renderer
+from llamavis.core.renderer import Renderer
+
+
+def _strict_loads(text):
+    def reject(token):
+        raise ValueError(f"non-standard JSON token {token}")
+    
+    return json.loads(text, parse_constant=reject)
+
+
+def _embedded_payload(js):
+    prefix, suffix = "const visualizationData = JSON.parse(", ");"
+    assert js.startswith(prefix) and js.endswith(suffix)
+    return _strict_loads(json.loads(js[len(prefix):-len(suffix)]))
+
+
+def test_embed_data_without_orjson_writes_null_for_non_finite(monkeypatch):
+    """Test that the stdlib fallback embeds NaN and infinities as valid JSON."""
+    monkeypatch.setattr(renderer, "orjson", None)
+    data = {
+        "nodes": [{"id": 1, "w": float("nan")}],
+        "range": [float("-inf"), float("inf")],
+        "values": np.array([1.5, np.nan]),
+    }
+    
+    assert _embedded_payload(Renderer.embed_data(data)) == {
+        "nodes": [{"id": 1, "w": None}],
+        "range": [None, None],
+        "values": [1.5, None],
+    }
+
+
+DUMPS_CASES = [
+    ({"a": float("nan"), "b": [float("inf"), -float("inf")]}, {"a": None, "b": [None, None]}),
+    (np.array([1.5, np.nan]), [1.5, None]),
+    (np.float64("nan"), None),
+    (np.float32(0.1), 0.1),
+    (np.array([[0.1, np.inf]], dtype=np.float32), [[0.1, None]]),
+    (np.array([0.1, np.nan], dtype=np.float16), [0.1, None]),
+    (np.int64(3), 3),
+    (np.array([[1, 2]], dtype=np.int32), [[1, 2]]),
+    ({1: np.bool_(True)}, {"1": True}),
+]
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def json_backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(renderer, "orjson", None)
+    else:
+        monkeypatch.setattr(renderer, "orjson", pytest.importorskip("orjson"))
+    return request.param
+
+
+@pytest.mark.parametrize("obj, expected", DUMPS_CASES)
+def test_dumps_backends_agree(json_backend, obj, expected):
+    """Test that both serializer paths write the same values for NumPy and non-finite data."""
+    assert _strict_loads(renderer._dumps(obj)) == expected
+
+
+@pytest.mark.parametrize("obj", [case[0] for case in DUMPS_CASES])
+def test_dumps_backends_write_same_text(monkeypatch, obj):
+    """Test that the embedded text does not depend on whether orjson is installed."""
+    if renderer.orjson is None:
+        pytest.skip("orjson is not installed")
+    with_orjson = renderer._dumps(obj)
+    monkeypatch.setattr(renderer, "orjson", None)
+    
+    assert renderer._dumps(obj) == with_orjson
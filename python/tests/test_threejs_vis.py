@@ -0,0 +1,126 @@
+"""
+Tests for the Three.js visualizations.
+"""
+import numpy as np
+import pytest
+
+from llamavis.core.config import VisualizationConfig
+from llamavis.integrations.threejs_vis import (
+    Network3D,
+    Surface3D,
+    _grid_repulsion,
+    _scale_heights_numpy,
+)
+
+
+def _dense_repulsion(pos, cutoff):
+    """Reference all-pairs version of ``_grid_repulsion``."""
+    diff = pos[:, None, :] - pos[None, :, :]
+    dist = np.sqrt((diff ** 2).sum(axis=-1))
+    near = (dist > 0) & (dist < cutoff)
+    inv_cube = np.zeros_like(dist)
+    inv_cube[near] = 1.0 / dist[near] ** 3
+    return (diff * inv_cube[..., None]).sum(axis=1)
+
+
+def _ring(n):
+    return {
+        "nodes": [{"id": i} for i in range(n)],
+        "links": [{"source": i, "target": (i + 1) % n} for i in range(n)],
+    }
+
+
+def test_grid_repulsion_matches_all_pairs():
+    """Test that the grid-bucketed repulsion equals the all-pairs sum."""
+    rng = np.random.default_rng(0)
+    pos = rng.uniform(-20, 20, (300, 3)).astype(np.float32)
+    expected = _dense_repulsion(pos, 6.0)
+    
+    np.testing.assert_allclose(_grid_repulsion(pos, 6.0), expected, atol=1e-5)
+    # Tiny batches must give the same result
+    np.testing.assert_allclose(_grid_repulsion(pos, 6.0, max_pairs=7), expected, atol=1e-5)
+
+
+def test_grid_repulsion_single_node():
+    """Test that a lone node feels no repulsion."""
+    pos = np.zeros((1, 3), dtype=np.float32)
+    assert not _grid_repulsion(pos, 6.0).any()
+
+
+def test_network3d_layout_is_reproducible():
+    """Test that layout_seed makes the Python layout reproducible."""
+    config = VisualizationConfig(layout_seed=3, layout_iterations=5)
+    first = Network3D(_ring(20), config=config).preprocess_data()
+    second = Network3D(_ring(20), config=config).preprocess_data()
+    
+    assert first["laid_out"]
+    assert first["positions"] == second["positions"]
+
+
+def test_network3d_large_networks_skip_layout():
+    """Test that networks above layout_max_nodes are left to the browser."""
+    config = VisualizationConfig(layout_seed=3, layout_max_nodes=10)
+    network = Network3D(_ring(20), config=config).preprocess_data()
+    
+    assert network["laid_out"] is False
+    assert len(network["positions"]) > 0
+
+
+def test_preprocess_cache_sees_changes_inside_large_nested_arrays():
+    """Test that the data fingerprint covers arrays NumPy's repr would elide."""
+    rows = [np.zeros(2000) for _ in range(3)]
+    surface = Surface3D(rows)
+    before = surface.preprocess_data()
+    
+    rows[1][1000] = 7
+    after = surface.preprocess_data()
+    
+    assert after["heights"] != before["heights"]
+
+
+def test_preprocess_cache_reuses_unchanged_data():
+    """Test that unchanged data hits the preprocess cache."""
+    surface = Surface3D(np.arange(12, dtype=float).reshape(3, 4))
+    key = surface._data_fingerprint()
+    
+    assert surface._data_fingerprint() == key
+    assert surface.preprocess_data()["heights"] == surface.preprocess_data()["heights"]
+
+
+def test_preprocess_cache_returns_independent_results():
+    """Test that mutating a returned result does not corrupt later calls."""
+    surface = Surface3D(np.ones((3, 3)))
+    first = surface.preprocess_data()
+    first["heights"] = "corrupted"
+    
+    assert surface.preprocess_data()["heights"] != "corrupted"
+
+
+def test_surface3d_rejects_degenerate_grids():
+    """Test that grids too small for a mesh fall back to the default surface."""
+    resolution = VisualizationConfig(resolution=0)
+    for surface in (
+        Surface3D(lambda x, z: x * z, config=resolution),
+        Surface3D([[1.0, 2.0, 3.0]]),
+        Surface3D(np.zeros((0, 0))),
+    ):
+        heights = surface.preprocess_data()
+        assert (heights["rows"], heights["cols"]) == (Surface3D.RESOLUTION, Surface3D.RESOLUTION)
+
+
+def test_scale_heights_implementations_agree():
+    """Test that the numba and NumPy height scaling agree, including empty input."""
+    surface_numba = pytest.importorskip("llamavis.integrations._surface_numba")
+    rng = np.random.default_rng(1)
+    heights = rng.normal(size=500).astype(np.float32)
+    expected = np.empty_like(heights)
+    _scale_heights_numpy(heights, expected, 5.0)
+    
+    assert expected.min() == 0.0
+    assert np.isclose(expected.max(), 5.0)
+    _scale_heights_numpy(np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32), 5.0)
+    
+    actual = np.empty_like(heights)
+    surface_numba.scale_heights(heights, actual, 5.0)
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
+    surface_numba.scale_heights(np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32), 5.0)
@@ -0,0 +1,63 @@
+"""
+Tests for the core utility functions.
+"""
+import base64
+import struct
+import zlib
+
+import pytest
+
+from llamavis.core.utils import linear_ticks, png_data_url
+
+
+@pytest.mark.parametrize("start, stop, count, expected", [
+    # Values as returned by d3.ticks(start, stop, count) from d3-array
+    (-7.3, 2.1, 5, [-6, -4, -2, 0, 2]),
+    (2.1, -7.3, 5, [2, 0, -2, -4, -6]),
+    (0, 10, 5, [0, 2, 4, 6, 8, 10]),
+    (1, 9, 5, [2, 4, 6, 8]),
+    (0, 1, 10, [0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1]),
+    (0, 1e-5, 2, [0, 5e-6, 1e-5]),
+    (0.1, 0.12, 1, [0.1, 0.12]),
+    # No tick fits for count 1, so d3 retries with count 2
+    (1.1, 1.9, 1, [1.5]),
+    (1, 1, 5, [1]),
+    (0, 1, 0, []),
+    (0, 1, -1, []),
+])
+def test_linear_ticks_match_d3(start, stop, count, expected):
+    """Test that linear_ticks reproduces d3.ticks exactly."""
+    assert linear_ticks(start, stop, count) == expected
+
+
+def test_png_data_url_decodes_to_valid_png():
+    """Test that png_data_url produces a well-formed 256 x 1 RGB PNG."""
+    rgb = bytes(value for i in range(256) for value in (i, 255 - i, i // 2))
+    url = png_data_url(rgb, 256, 1)
+    
+    prefix = "data:image/png;base64,"
+    assert url.startswith(prefix)
+    png = base64.b64decode(url[len(prefix):])
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    
+    # Walk the chunks, checking every CRC
+    chunks = []
+    offset = 8
+    while offset < len(png):
+        (length,) = struct.unpack(">I", png[offset:offset + 4])
+        kind = png[offset + 4:offset + 8]
+        data = png[offset + 8:offset + 8 + length]
+        (crc,) = struct.unpack(">I", png[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(kind + data) & 0xFFFFFFFF
+        chunks.append((kind, data))
+        offset += 12 + length
+    
+    assert [kind for kind, _ in chunks] == [b"IHDR", b"IDAT", b"IEND"]
+    width, height, depth, color_type, compression, filtering, interlace = struct.unpack(
+        ">IIBBBBB", chunks[0][1]
+    )
+    assert (width, height, depth, color_type) == (256, 1, 8, 2)
+    assert (compression, filtering, interlace) == (0, 0, 0)
+    
+    # One scanline: filter type 0 followed by the raw pixels
+    assert zlib.decompress(chunks[1][1]) == b"\x00" + rgb
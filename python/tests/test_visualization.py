@@ -0,0 +1,35 @@
+"""
+Tests for the streaming HTML output of visualizations.
+"""
+import numpy as np
+import pytest
+
+from llamavis.core.config import VisualizationConfig
+from llamavis.integrations.d3_vis import HeatmapVis, NetworkGraph
+
+
+@pytest.fixture(params=["heatmap", "network"])
+def vis(request):
+    if request.param == "heatmap":
+        return HeatmapVis(np.arange(6.0).reshape(2, 3), title="Heat <map>")
+    return NetworkGraph(
+        {
+            "nodes": [{"id": "a"}, {"id": "b"}, {"id": "c"}],
+            "links": [{"source": "a", "target": "b"}, {"source": "b", "target": "c"}],
+        },
+        config=VisualizationConfig(layout_seed=1, prelayout_seed=1),
+    )
+
+
+def test_iter_html_matches_to_html(vis):
+    """Test that the streamed pieces join to exactly the to_html document."""
+    assert "".join(vis.iter_html()) == vis.to_html()
+
+
+def test_write_html_writes_same_bytes(vis, tmp_path):
+    """Test that write_html produces the same bytes as encoding to_html."""
+    path = tmp_path / "vis.html"
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        vis.write_html(fp)
+    
+    assert path.read_bytes() == vis.to_html().encode("utf-8")
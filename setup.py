@@ -30,7 +30,6 @@ setup(
         "Topic :: Software Development :: Libraries :: Python Modules",
         "Topic :: Scientific/Engineering :: Artificial Intelligence",
     ],
-    packages=find_packages(include=["llamavis", "llamavis.*"]),
     python_requires=">=3.8",
     install_requires=[
         "numpy>=1.20.0",
@@ -63,7 +62,7 @@ setup(
         ],
     },
     package_dir={"": "src"},
-    packages=find_packages(where="src"),
+    packages=find_packages(where="src", include=["llamavis", "llamavis.*"]),
 )
 
 # Updated in commit 5 - 2025-04-04 17:24:42